@@ -17,10 +17,15 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
-import json
-from typing import Union
+import functools
+import threading
+import types
+from contextlib import contextmanager
+from typing import Callable, Union
 
 import arrow
+from celery import states
+from celery.utils import uuid
 from django.db import models
 from django.http.response import HttpResponseBase
 from django.utils.translation import gettext
@@ -28,10 +33,13 @@ from rest_framework.response import Response
 
 from bk_resource.exceptions import ValidateException
 from bk_resource.settings import bk_resource_settings
-from bk_resource.tasks import run_perform_request
+from bk_resource.tasks import publish_task_progress, run_perform_request
 from bk_resource.tools import format_serializer_errors, get_processes
+from bk_resource.utils.json_backend import json_dumps
 from bk_resource.utils.logger import logger
+from bk_resource.utils.profiler import profile_scope
 from bk_resource.utils.request import get_request_username
+from bk_resource.utils.request_log import record_request_log
 from bk_resource.utils.thread_backend import ThreadPool
 
 __doc__ = """
@@ -48,7 +56,7 @@ Resource定义：
 可以通过继承Resource类来实现自定义的Resource
 
 Resource的执行流程：
-1. 新建Resource实例
+1. 新建Resource实例（开启实例复用时复用当前实例）及调用上下文
 2. 若用户未手动设置需要用到的RequestSerializer及ResponseSerializer，
    则根据命名规则自动查找可用的serializers，并进行设置
 3. 调用request方法，并传入请求参数(request_data)
@@ -72,12 +80,24 @@ class Empty:
     ...
 
 
+class ResourceCallContext:
+    """
+    单次调用的状态，Resource 实例本身不保存调用状态
+    """
+
+    __slots__ = ("request_serializer", "response_serializer", "task_manager", "field_selection")
+
+    def __init__(self, task_manager=None, field_selection=None):
+        self.request_serializer = Empty()
+        self.response_serializer = Empty()
+        self.task_manager = task_manager
+        self.field_selection = field_selection
+
+
 class Resource(metaclass=abc.ABCMeta):
     RequestSerializer = None
     ResponseSerializer = None
     serializer_class = None
-    _request_serializer = Empty()
-    _response_serializer = Empty()
 
     # 提供一个serializers模块，在实例化某个Resource时，在该模块内自动查找符合命名
     # 规则的serializers，并进行自动配置
@@ -98,6 +118,10 @@ class Resource(metaclass=abc.ABCMeta):
     name = ""
     tags = []
 
+    # 是否在多次调用、多个线程间复用实例，为 None 时使用 BK_RESOURCE["RESOURCE_REUSE_INSTANCE"]
+    # 开启后不能在 perform_request 等方法中将请求相关的数据保存到 self 上
+    reuse_instance = None
+
     def __init__(self, context=None):
         (
             self.RequestSerializer,
@@ -105,38 +129,150 @@ class Resource(metaclass=abc.ABCMeta):
         ) = self._search_serializer_class()
 
         self.context = context
-        self._task_manager = None
+        # 调用状态按线程隔离，实例可以在多个线程间共享
+        self._local = threading.local()
 
     def __call__(self, *args, **kwargs):
-        # thread safe
-        resource = self.__class__()
+        # thread safe，未开启实例复用时每次调用使用新的实例
+        resource = self if self.is_reusable() else self.__class__(context=self.context)
+        # 每次调用使用独立的调用上下文，保证线程安全及可重入
+        with resource.call_scope(), profile_scope(self.__class__):
+            return resource._call(*args, **kwargs)
+
+    @classmethod
+    def is_reusable(cls) -> bool:
+        """
+        实例是否可以在多次调用间复用
+        """
+        if cls.reuse_instance is None:
+            return bool(bk_resource_settings.RESOURCE_REUSE_INSTANCE)
+        return cls.reuse_instance
+
+    def _call(self, *args, **kwargs):
         # 如果没有配置则退出
-        if not resource.support_data_collect:
-            data = resource.request(*args, **kwargs)
+        if not self.support_data_collect:
+            data = self.request(*args, **kwargs)
             assert not isinstance(data, Response) and not isinstance(data, HttpResponseBase), (
-                gettext("[%s] 响应体为Response，只允许在ViewSet调用") % resource.__class__.__name__
+                gettext("[%s] 响应体为Response，只允许在ViewSet调用") % self.__class__.__name__
             )
             return data
 
-        resource_name = "{}.{}".format(resource.__class__.__module__, resource.__class__.__name__)
+        resource_name = "{}.{}".format(self.__class__.__module__, self.__class__.__name__)
         start_time = arrow.now().datetime
         request_data = {"args": args, "kwargs": kwargs}
         response_data = ""
+        exception = None
         try:
-            response_data = resource.request(*args, **kwargs)
+            response_data = self.request(*args, **kwargs)
             assert not isinstance(response_data, Response), (
-                gettext("[%s] 响应体为Response，只允许在ViewSet调用") % resource.__class__.__name__
+                gettext("[%s] 响应体为Response，只允许在ViewSet调用") % self.__class__.__name__
             )
             return response_data
         except Exception as err:
             logger.exception(err)
             response_data = str(err)
+            exception = err
             raise err
         finally:
             end_time = arrow.now().datetime
             # 记录请求日志
-            log_handler = bk_resource_settings.REQUEST_LOG_HANDLER
-            log_handler(resource_name, start_time, end_time, request_data, response_data).record()
+            record_request_log(resource_name, start_time, end_time, request_data, response_data, exception)
+
+    def _record_call(self, func: Callable[[], any], *args):
+        """
+        执行 func 并记录调用分析节点及请求日志，用于不经过 __call__ 直接调用 request 的场景（如分页、批量请求）
+        :param args: 请求日志中记录的请求参数
+        """
+        start_time = arrow.now().datetime
+        response_data = ""
+        exception = None
+        try:
+            with profile_scope(self.__class__):
+                response_data = func()
+            return response_data
+        except Exception as err:
+            logger.exception(err)
+            response_data = str(err)
+            exception = err
+            raise err
+        finally:
+            if self.support_data_collect:
+                record_request_log(
+                    "{}.{}".format(self.__class__.__module__, self.__class__.__name__),
+                    start_time,
+                    arrow.now().datetime,
+                    {"args": args, "kwargs": {}},
+                    response_data,
+                    exception,
+                )
+
+    @property
+    def call_context(self) -> ResourceCallContext:
+        """
+        当前线程的调用上下文
+        """
+        context = getattr(self._local, "context", None)
+        if context is None:
+            context = self._local.context = ResourceCallContext()
+        return context
+
+    @contextmanager
+    def call_scope(self, task_manager=None, field_selection=None):
+        """
+        使用新的调用上下文执行，结束后恢复之前的上下文
+        :param field_selection: 返回字段的选择，由 ViewSet 根据 fields / exclude 参数传入
+        """
+        previous = getattr(self._local, "context", None)
+        context = self._local.context = ResourceCallContext(task_manager, field_selection)
+        try:
+            yield context
+        finally:
+            self._local.context = previous
+
+    def bind_call_context(self, func):
+        """
+        在其他线程中执行时继承当前调用的上下文（字段选择、异步任务），用于提交到线程池的函数
+        """
+        context = self.call_context
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.call_scope(task_manager=context.task_manager, field_selection=context.field_selection):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    @property
+    def _request_serializer(self):
+        return self.call_context.request_serializer
+
+    @_request_serializer.setter
+    def _request_serializer(self, value):
+        self.call_context.request_serializer = value
+
+    @property
+    def _response_serializer(self):
+        return self.call_context.response_serializer
+
+    @_response_serializer.setter
+    def _response_serializer(self, value):
+        self.call_context.response_serializer = value
+
+    @property
+    def field_selection(self):
+        """
+        当前调用的返回字段选择，为 None 时返回全部字段
+        :rtype: bk_resource.utils.field_selection.FieldSelection
+        """
+        return self.call_context.field_selection
+
+    @property
+    def _task_manager(self):
+        return self.call_context.task_manager
+
+    @_task_manager.setter
+    def _task_manager(self, value):
+        self.call_context.task_manager = value
 
     def _get_data_string(self, data):
         """
@@ -144,7 +280,7 @@ class Resource(metaclass=abc.ABCMeta):
         """
         if isinstance(data, (dict, list, str, int)) or data is None:
             try:
-                data_string = json.dumps(data, ensure_ascii=False)
+                data_string = json_dumps(data)
             except Exception as e:
                 data_string = str(e)
         else:
@@ -244,15 +380,22 @@ class Resource(metaclass=abc.ABCMeta):
         """
         self._response_serializer = None
         if not self.ResponseSerializer:
+            if self.field_selection:
+                return self.field_selection.apply(response_data)
             return response_data
 
+        # 生成器类型的数据逐条校验，避免一次性加载全部数据
+        if isinstance(response_data, types.GeneratorType):
+            # 生成器在调用结束后才迭代，需提前获取字段选择
+            return self._validate_response_items(response_data, self.field_selection)
+
         # model类型的数据需要特殊处理
         if isinstance(response_data, (models.Model, models.QuerySet)):
-            response_serializer = self.ResponseSerializer(response_data, many=self.many_response_data)
+            response_serializer = self.build_response_serializer(response_data, many=self.many_response_data)
             self._response_serializer = response_serializer
             return response_serializer.data
         else:
-            response_serializer = self.ResponseSerializer(data=response_data, many=self.many_response_data)
+            response_serializer = self.build_response_serializer(data=response_data, many=self.many_response_data)
             self._response_serializer = response_serializer
             is_valid_response = response_serializer.is_valid()
             if not is_valid_response:
@@ -264,6 +407,36 @@ class Resource(metaclass=abc.ABCMeta):
                 raise ValidateException(msg)
             return response_serializer.validated_data
 
+    def build_response_serializer(self, *args, field_selection=Empty, **kwargs):
+        """
+        实例化 ResponseSerializer，只保留选择的字段
+        :param field_selection: 默认使用当前调用的字段选择
+        """
+        if field_selection is Empty:
+            field_selection = self.field_selection
+        response_serializer = self.ResponseSerializer(*args, **kwargs)
+        if field_selection:
+            field_selection.prune_serializer(response_serializer)
+        return response_serializer
+
+    def _validate_response_items(self, response_items, field_selection=None):
+        """
+        逐条校验生成器返回的数据，此时 ResponseSerializer 描述的是单条数据
+        """
+        for item in response_items:
+            if isinstance(item, models.Model):
+                yield self.build_response_serializer(item, field_selection=field_selection).data
+                continue
+            response_serializer = self.build_response_serializer(data=item, field_selection=field_selection)
+            if not response_serializer.is_valid():
+                msg = gettext("Resource[%s] 返回参数格式错误：%s") % (
+                    self.get_resource_name(),
+                    format_serializer_errors(response_serializer),
+                )
+                logger.error(msg)
+                raise ValidateException(msg)
+            yield response_serializer.validated_data
+
     def build_extra_params(self, request_data: Union[models.Model, dict], validated_request_data: dict) -> dict:
         """
         ModelResource补全参数埋点
@@ -304,10 +477,12 @@ class Resource(metaclass=abc.ABCMeta):
         futures = []
         _request = get_local_request()
 
+        request = self.bind_call_context(self.request)
+
         # 线程池
         with ThreadPool(processes=get_processes()) as pool:
             for request_data in request_data_iterable:
-                futures.append(pool.apply_async(self.request, args=(request_data,), kwds={"_request": _request}))
+                futures.append(pool.apply_async(request, args=(request_data,), kwds={"_request": _request}))
             pool.close()
             pool.join()
 
@@ -347,6 +522,9 @@ class Resource(metaclass=abc.ABCMeta):
             "data": data,
         }
         self._task_manager.update_state(state=state, meta=meta)
+        # 通知等待进度的客户端
+        task_request = getattr(self._task_manager, "request", None)
+        publish_task_progress(getattr(task_request, "id", None), state, message, data)
 
     def delay(self, request_data=None, **kwargs):
         """
@@ -359,6 +537,10 @@ class Resource(metaclass=abc.ABCMeta):
         """
         执行celery异步任务（高级）
         """
+        # 开启任务进度时，在任务发起前记录初始进度，避免覆盖任务执行中发布的进度
+        if bk_resource_settings.TASK_PROGRESS_ENABLED:
+            kwargs.setdefault("task_id", uuid())
+            publish_task_progress(kwargs["task_id"], states.PENDING)
         async_task = run_perform_request.apply_async(
             args=(f"{self.__module__}.{self.__class__.__name__}", get_request_username(), request_data), **kwargs
         )
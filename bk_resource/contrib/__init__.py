@@ -19,9 +19,19 @@ to the current version of the project delivered to anyone in the future.
 from bk_resource.contrib.api import APIResource
 from bk_resource.contrib.bk_api import BkApiResource
 from bk_resource.contrib.cache import CacheResource
+from bk_resource.contrib.paginated_api import (
+    PaginatedAPIResource,
+    PaginatedAPIResourceMixin,
+    PaginatedBkApiResource,
+    PaginationType,
+)
 
 __all__ = [
     "APIResource",
     "CacheResource",
     "BkApiResource",
+    "PaginatedAPIResource",
+    "PaginatedAPIResourceMixin",
+    "PaginatedBkApiResource",
+    "PaginationType",
 ]
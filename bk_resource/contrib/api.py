@@ -17,17 +17,43 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
-from typing import Dict
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Dict, Hashable, Iterator, List
 
 import requests
 from django.utils.encoding import force_str
 from django.utils.translation import gettext
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 
 from bk_resource.contrib.cache import CacheResource
-from bk_resource.exceptions import APIRequestError
+from bk_resource.exceptions import APIRequestError, ValidateException
 from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.batch import BatchLoader
+from bk_resource.utils.common_utils import count_md5
+from bk_resource.utils.compress import (
+    build_accept_encoding,
+    compress,
+    is_compress_supported,
+)
+from bk_resource.utils.json_backend import json_dumps, json_loads
 from bk_resource.utils.logger import logger
+from bk_resource.utils.multipart import MultipartEncoder
+from bk_resource.utils.profiler import ProfileCategory, profile_scope, tag_profile_node
+from bk_resource.utils.request import get_request_username
+from bk_resource.utils.stream import JSONStreamParser
+
+# 按线程共享的连接池，未复用 Resource 实例时，不同实例的 session 也可以复用连接
+_thread_adapters = threading.local()
+
+
+def get_thread_adapter() -> HTTPAdapter:
+    adapter = getattr(_thread_adapters, "adapter", None)
+    if adapter is None:
+        adapter = _thread_adapters.adapter = HTTPAdapter()
+    return adapter
 
 
 class ApiResourceProtocol(metaclass=abc.ABCMeta):
@@ -82,6 +108,9 @@ class ApiResourceProtocol(metaclass=abc.ABCMeta):
     def parse_response(self, result: requests.Response) -> dict:
         raise NotImplementedError
 
+    def parse_stream_response(self, result: requests.Response) -> Iterator:
+        raise NotImplementedError
+
 
 class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
     """
@@ -93,13 +122,65 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
     IS_STANDARD_FORMAT = True
     url_keys = []
 
+    # 流式读取响应，返回生成器而非完整数据，适用于大数据量的导出类接口
+    stream = False
+    # 流式读取时，需要逐条返回的数组所在路径，多层使用 "." 分隔
+    stream_items_path = "data"
+    # 流式读取时，每次读取的字节数
+    stream_chunk_size = 64 * 1024
+
+    # 上传文件时使用流式 multipart 编码，文件内容在发送时按块读取
+    stream_upload = False
+
+    # JSON 请求体压缩方式，支持 gzip / deflate / zstd（需安装 zstandard），需要上游服务支持
+    request_compress = None
+    # 请求体超过该字节数时才进行压缩
+    request_compress_min_size = 1024
+    # 可接受的响应压缩方式，如 "gzip, deflate"，为空时使用 requests 默认值
+    accept_encoding = None
+
+    # 批量接口，声明后对同一接口仅对象标识不同的多次调用可以合并为一次批量请求
+    # 批量接口的 action 及请求方法，请求方法默认与 method 一致
+    batch_action = None
+    batch_method = None
+    # 单次调用中的对象标识参数，如 username
+    batch_key = None
+    # 批量接口中对象标识列表的参数，如 usernames
+    batch_param = None
+    # 批量接口返回数据中的对象标识字段，默认与 batch_key 一致
+    batch_result_key = None
+    # 批量接口返回数据中对象列表所在路径，多层使用 "." 分隔，为空时返回数据即为对象列表或对象标识到对象的映射
+    batch_results_path = None
+    # 单次批量请求的最大对象数量
+    batch_max_size = 100
+    # 存在并发的 load 调用时，合并的时间窗口，单位：s
+    batch_window = 0.01
+
+    _batch_lock = threading.Lock()
+
     def __init__(self, **kwargs):
         super(APIResource, self).__init__(**kwargs)
         assert self.method.upper() in ["GET", "POST", "PUT", "PATCH", "DELETE"], gettext(
             "%s method 仅支持GET或POST或PUT或PATCH或DELETE，当前为%s"
         ) % (self.module_name, self.method.upper())
         self.method = self.method.upper()
-        self.session = requests.session()
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        每个线程使用独立的 session，连接池在同一线程的所有 session 间共享，cookie 等状态不共享
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.session()
+            adapter = get_thread_adapter()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        return session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self._local.session = session
 
     def request(self, request_data=None, **kwargs):
         request_data = request_data or kwargs
@@ -118,6 +199,8 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
 
         # 构造请求头
         headers = self.build_header(validated_request_data)
+        if self.accept_encoding:
+            headers["Accept-Encoding"] = build_accept_encoding(self.accept_encoding)
         kwargs = {
             "method": self.method,
             "url": request_url,
@@ -125,6 +208,8 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
             "headers": headers,
             "verify": bk_resource_settings.REQUEST_VERIFY,
         }
+        if self.stream:
+            kwargs["stream"] = True
 
         try:
             if self.method == "GET":
@@ -133,19 +218,35 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
                 request_url = kwargs.pop("url")
                 if "method" in kwargs:
                     del kwargs["method"]
-                response = self.session.get(request_url, **kwargs)
+                with profile_scope("HTTP GET {}".format(self.action), ProfileCategory.HTTP):
+                    response = self.session.get(request_url, **kwargs)
+                    tag_profile_node("status_code", response.status_code)
             else:
                 non_file_data, file_data = self.split_request_data(validated_request_data)
                 if not file_data:
                     # 不存在文件数据，则按照json方式去请求
                     kwargs["json"] = non_file_data
+                elif self.stream_upload:
+                    # 流式上传，请求体由编码器按块生成
+                    encoder = MultipartEncoder(
+                        non_file_data,
+                        file_data,
+                        chunk_size=self.stream_chunk_size,
+                        callback=self.upload_progress,
+                    )
+                    kwargs["data"] = encoder
+                    kwargs["headers"]["Content-Type"] = encoder.content_type
                 else:
                     # 若存在文件数据，则将非文件数据和文件数据分开传参
                     kwargs["files"] = file_data
                     kwargs["data"] = non_file_data
 
                 kwargs = self.before_request(kwargs)
-                response = self.session.request(**kwargs)
+                if self.request_compress and "json" in kwargs:
+                    kwargs = self.compress_request_body(kwargs)
+                with profile_scope("HTTP {} {}".format(self.method, self.action), ProfileCategory.HTTP):
+                    response = self.session.request(**kwargs)
+                    tag_profile_node("status_code", response.status_code)
         except Exception as err:
             logger.exception(f"APIRequestFailed => {err}")
             err_message = err.__doc__ or err.__class__.__name__
@@ -154,6 +255,8 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
                 url=self.action,
                 result=err_message,
             ) from err
+        if self.stream:
+            return self.parse_stream_response(response)
         return self.parse_response(response)
 
     def build_url(self, validated_request_data):
@@ -178,12 +281,45 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
     def before_request(self, kwargs):
         return kwargs
 
+    def compress_request_body(self, kwargs: dict) -> dict:
+        """
+        将 JSON 请求体编码后压缩，未达到压缩阈值或不支持时保持原样
+        """
+        if not is_compress_supported(self.request_compress):
+            logger.warning("[%s] unsupported request compress: %s, ignored", self.module_name, self.request_compress)
+            return kwargs
+        body = json_dumps(kwargs["json"]).encode()
+        if len(body) < self.request_compress_min_size:
+            return kwargs
+        kwargs.pop("json")
+        kwargs["data"] = compress(body, self.request_compress)
+        kwargs["headers"] = dict(kwargs.get("headers") or {})
+        kwargs["headers"]["Content-Type"] = "application/json"
+        kwargs["headers"]["Content-Encoding"] = self.request_compress
+        return kwargs
+
+    def upload_progress(self, bytes_read: int, total_length: int = None) -> None:
+        """
+        流式上传进度回调，total_length 未知时为 None，子类可重写
+        """
+
+    @staticmethod
+    def load_response_json(response: requests.Response) -> any:
+        """
+        使用配置的 JSON 后端解析响应体，结果缓存在 response 上，避免重复解析
+        """
+        if not hasattr(response, "_bk_resource_json"):
+            encoding = (response.encoding or "utf-8").lower().replace("_", "-")
+            content = response.content if encoding in ("utf-8", "utf8") else response.text
+            response._bk_resource_json = json_loads(content)
+        return response._bk_resource_json
+
     def parse_response(self, response: requests.Response):
         """
         在提供数据给response_serializer之前，对数据作最后的处理，子类可进行重写
         """
         try:
-            result_json = response.json()
+            result_json = self.load_response_json(response)
         except Exception as err:
             logger.exception("{} => {}".format(gettext("Response Parse Error"), err))
             result_json = response.content
@@ -230,6 +366,226 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
             )
         return result_json.get("data")
 
+    def parse_stream_response(self, response: requests.Response) -> Iterator:
+        """
+        流式解析响应，返回生成器
+        标准格式逐条返回 stream_items_path 下的数组元素，非标准格式直接返回原始数据块
+        """
+        if not response.ok:
+            # 错误响应数据量较小，直接按常规方式解析并抛出异常
+            try:
+                return self.parse_response(response)
+            finally:
+                response.close()
+
+        if not self.IS_STANDARD_FORMAT:
+            return self._iter_stream_content(response)
+        return self._iter_stream_items(response)
+
+    def _iter_stream_content(self, response: requests.Response) -> Iterator[bytes]:
+        try:
+            yield from response.iter_content(chunk_size=self.stream_chunk_size)
+        finally:
+            response.close()
+
+    def _iter_stream_items(self, response: requests.Response) -> Iterator:
+        parser = JSONStreamParser(
+            response.iter_content(chunk_size=self.stream_chunk_size),
+            path=self.stream_items_path,
+        )
+        try:
+            for item in parser:
+                # 错误信息位于数据之前时，在返回数据前即可发现
+                self._check_stream_envelope(response, parser.envelope)
+                yield item
+        except ValueError as err:
+            logger.exception("{} => {}".format(gettext("Response Parse Error"), err))
+            raise APIRequestError(
+                module_name=self.module_name,
+                url=self.action,
+                result=gettext("返回格式有误 => %s") % err,
+            ) from err
+        finally:
+            response.close()
+        self._check_stream_envelope(response, parser.envelope)
+
+    def _check_stream_envelope(self, response: requests.Response, envelope: dict) -> None:
+        if envelope.get("result", True) or envelope.get("code") == 0:
+            return
+        request_id = envelope.get("request_id", "") or response.headers.get("x-bkapi-request-id", "")
+        logger.error(
+            "【Module: %s】【Action: %s】(%s) get error：%s",
+            self.module_name,
+            self.action,
+            request_id,
+            envelope.get("message", ""),
+            extra=dict(module_name=self.module_name, url=response.request.url),
+        )
+        raise APIRequestError(module_name=self.module_name, url=self.action, result=dict(envelope))
+
+    def _need_cache_wrap(self):
+        # 流式数据无法缓存
+        if self.stream:
+            return False
+        return super(APIResource, self)._need_cache_wrap()
+
+    @classmethod
+    def _get_batch_resource(cls) -> "APIResource":
+        """
+        批量接口对应的 Resource，复用当前接口的请求构造逻辑，不做参数校验和缓存
+        """
+        if "_batch_resource" not in cls.__dict__:
+            with cls._batch_lock:
+                if "_batch_resource" not in cls.__dict__:
+                    batch_resource_class = type(
+                        "{}Batch".format(cls.__name__),
+                        (cls,),
+                        {
+                            "__module__": cls.__module__,
+                            "action": cls.batch_action,
+                            "method": cls.batch_method or cls.method,
+                            "batch_action": None,
+                            "RequestSerializer": None,
+                            "ResponseSerializer": None,
+                            "cache_type": None,
+                            "backend_cache_type": None,
+                        },
+                    )
+                    cls._batch_resource = batch_resource_class()
+        return cls.__dict__["_batch_resource"]
+
+    @classmethod
+    def _get_batch_loader(cls) -> BatchLoader:
+        if "_batch_loader" not in cls.__dict__:
+            with cls._batch_lock:
+                if "_batch_loader" not in cls.__dict__:
+                    cls._batch_loader = BatchLoader(
+                        cls._perform_batch_request, max_batch_size=cls.batch_max_size, window=cls.batch_window
+                    )
+        return cls.__dict__["_batch_loader"]
+
+    @classmethod
+    def _perform_batch_request(cls, group_params: dict, keys: List[Hashable]) -> Dict[Hashable, any]:
+        request_data = dict(group_params)
+        request_data[cls.batch_param] = keys
+        batch_resource = cls._get_batch_resource()
+        # 合并后的批量请求单独记录调用分析节点及请求日志
+        request = functools.partial(batch_resource.request, request_data, _request=request_data.pop("_request", None))
+        response_data = batch_resource._record_call(request, request_data)
+        return cls.split_batch_response(keys, response_data)
+
+    @classmethod
+    def split_batch_response(cls, keys: List[Hashable], response_data: any) -> Dict[Hashable, any]:
+        """
+        将批量接口的返回数据拆分为对象标识到单个结果的映射，子类可重写
+        """
+        if cls.batch_results_path:
+            for path in cls.batch_results_path.split("."):
+                response_data = (response_data or {}).get(path)
+        if isinstance(response_data, dict):
+            # 对象标识到对象的映射，JSON 中的 key 均为字符串
+            return {key: response_data.get(key, response_data.get(str(key))) for key in keys}
+        result_key = cls.batch_result_key or cls.batch_key
+        return {item.get(result_key): item for item in response_data or [] if isinstance(item, dict)}
+
+    def _split_batch_request_data(self, request_data: dict) -> (Hashable, dict):
+        if not (self.batch_action and self.batch_key and self.batch_param):
+            raise NotImplementedError(gettext("%s 未声明批量接口") % self.__class__.__name__)
+        validated_request_data = dict(self.validate_request_data(request_data))
+        return validated_request_data.pop(self.batch_key), validated_request_data
+
+    def _build_batch_call(self, request_data: dict) -> (Hashable, Hashable, dict):
+        """
+        拆分为对象标识、分组及分组公共参数
+        """
+
+        # 模块引入，放在文件头可能导致 django 未完全初始化异常
+        from blueapps.utils.request_provider import get_local_request
+
+        key, group_params = self._split_batch_request_data(request_data)
+        # 仅合并相同用户、相同公共参数的调用，避免鉴权信息混用
+        group = (get_request_username(), count_md5(group_params))
+        group_params["_request"] = get_local_request()
+        return key, group, group_params
+
+    def _merge_batch_request_data(self, request_data_iterable) -> (List[Hashable], dict):
+        """
+        合并多次调用的参数，公共参数不一致时抛出 ValueError
+        """
+
+        # 模块引入，放在文件头可能导致 django 未完全初始化异常
+        from blueapps.utils.request_provider import get_local_request
+
+        keys, group_params = [], None
+        for request_data in request_data_iterable:
+            key, params = self._split_batch_request_data(request_data)
+            if group_params is not None and count_md5(params) != count_md5(group_params):
+                raise ValueError(gettext("批量请求的公共参数必须一致"))
+            keys.append(key)
+            group_params = params
+        if group_params is not None:
+            group_params["_request"] = get_local_request()
+        return keys, group_params
+
+    def load(self, request_data=None, **kwargs):
+        """
+        通过批量接口请求单个对象，存在并发调用时，时间窗口内相同参数的调用会合并为一次请求
+        """
+        key, group, group_params = self._build_batch_call(request_data or kwargs)
+        response_data = self._get_batch_loader().load(key, group=group, group_params=group_params)
+        return self.validate_response_data(response_data)
+
+    def collect(self) -> "APIBatchCollector":
+        """
+        显式收集多次调用，退出上下文时按公共参数合并为批量请求
+
+        >>> with api.usermanage.retrieve_user.collect() as collector:
+        ...     futures = {username: collector.load(username=username) for username in usernames}
+        >>> users = {username: future.result() for username, future in futures.items()}
+        """
+        return APIBatchCollector(self)
+
+    def load_many(self, request_data_iterable) -> list:
+        """
+        通过批量接口请求多个对象，公共参数需要一致，结果与请求顺序一致
+        """
+        keys, group_params = self._merge_batch_request_data(request_data_iterable)
+        if not keys:
+            return []
+        results = self._get_batch_loader().load_many(keys, group_params=group_params)
+        return [self.validate_response_data(result) for result in results]
+
+    def bulk_request(self, request_data_iterable=None, ignore_exceptions=False):
+        """
+        声明了批量接口且公共参数一致时，合并为批量请求，否则使用多线程并发请求
+        """
+        if not self.batch_action or not isinstance(request_data_iterable, (list, tuple)) or not request_data_iterable:
+            return super(APIResource, self).bulk_request(request_data_iterable, ignore_exceptions)
+        try:
+            keys, group_params = self._merge_batch_request_data(request_data_iterable)
+        except (ValidateException, ValueError):
+            # 参数无法合并时逐个请求，由 bulk_request 处理单个请求的异常
+            return super(APIResource, self).bulk_request(request_data_iterable, ignore_exceptions)
+
+        load_many = functools.partial(self._get_batch_loader().load_many, keys, group_params=group_params)
+        response_data = self._record_call(load_many, request_data_iterable)
+
+        results = []
+        exceptions = []
+        for item in response_data:
+            try:
+                results.append(self.validate_response_data(item))
+            except Exception as err:
+                if not ignore_exceptions:
+                    raise err
+                exceptions.append(err)
+                results.append(None)
+
+        # 如果全部报错，则必须抛出错误
+        if exceptions and len(exceptions) == len(results):
+            raise exceptions[0]
+        return results
+
     @staticmethod
     def split_request_data(data):
         """
@@ -244,3 +600,41 @@ class APIResource(ApiResourceProtocol, CacheResource, metaclass=abc.ABCMeta):
             else:
                 non_file_data[request_param] = param_value
         return non_file_data, file_data
+
+
+class APIBatchCollector:
+    """
+    APIResource.collect 返回的收集器，load 返回 Future，退出上下文时合并为批量请求并校验返回数据
+    """
+
+    def __init__(self, resource: APIResource):
+        self.resource = resource
+        self._collector = resource._get_batch_loader().collect()
+        self._futures = []
+
+    def load(self, request_data=None, **kwargs) -> Future:
+        key, group, group_params = self.resource._build_batch_call(request_data or kwargs)
+        future = Future()
+        self._futures.append((self._collector.load(key, group=group, group_params=group_params), future))
+        return future
+
+    def flush(self) -> None:
+        self._collector.flush()
+        futures, self._futures = self._futures, []
+        for batch_future, future in futures:
+            try:
+                future.set_result(self.resource.validate_response_data(batch_future.result()))
+            except Exception as err:
+                future.set_exception(err)
+
+    def __enter__(self) -> "APIBatchCollector":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+        self._collector.cancel()
+        for _, future in self._futures:
+            future.cancel()
+        self._futures = []
@@ -17,17 +17,31 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
-import json
 from typing import Dict
 
 import requests
 from django.conf import settings
 from django.core.handlers.wsgi import WSGIRequest
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 from bk_resource.contrib.api import APIResource
 from bk_resource.exceptions import IAMNoPermission, PlatformAuthParamsNotExist
 from bk_resource.settings import bk_resource_settings
 from bk_resource.utils.common_utils import is_backend
+from bk_resource.utils.json_backend import json_dumps
+
+# 后台及平台鉴权请求头，{Resource 类: x-bkapi-authorization}
+_BACKEND_AUTHORIZATION_HEADERS: Dict[type, str] = {}
+
+# 影响鉴权请求头的配置
+AUTHORIZATION_SETTINGS = ("BK_RESOURCE", "APP_CODE", "SECRET_KEY", "OAUTH_COOKIES_PARAMS")
+
+
+@receiver(setting_changed)
+def reload_authorization_header(setting: str, **kwargs) -> None:
+    if setting in AUTHORIZATION_SETTINGS:
+        _BACKEND_AUTHORIZATION_HEADERS.clear()
 
 
 class BkApiResource(APIResource, abc.ABC):
@@ -35,6 +49,8 @@ class BkApiResource(APIResource, abc.ABC):
     bkapi_header_authorization = True
     bkapi_data_authorization = False
     platform_authorization = False
+    # 缓存 x-bkapi-authorization 请求头，鉴权信息依赖配置以外的动态数据时需要关闭
+    cache_authorization_header = True
 
     def add_platform_auth_params(self, params: dict, force_platform_auth: bool = False) -> dict:
         """
@@ -132,38 +148,103 @@ class BkApiResource(APIResource, abc.ABC):
         # 初始化
         headers = {bk_resource_settings.REQUEST_LANGUGAE_HEADER_KEY: settings.LANGUAGE_CODE}
 
-        # 透传 Cookie
+        # 透传 Cookie 及语言
         request = get_local_request()
         if request is not None:
-            headers["cookie"] = "; ".join(
-                [
-                    f"{key}={val}"
-                    for key, val in request.COOKIES.items()
-                    if key in bk_resource_settings.REQUEST_BKAPI_COOKIE_FIELDS
-                ]
-            )
-            # 根据用户的Cookie指定语言
-            headers[bk_resource_settings.REQUEST_LANGUGAE_HEADER_KEY] = request.COOKIES.get(
-                settings.LANGUAGE_COOKIE_NAME, settings.LANGUAGE_CODE
-            )
+            headers.update(self.build_cookie_header(request))
 
         # 鉴权参数
         if self.bkapi_header_authorization:
-            params = {
-                "_request": validated_request_data.pop("_request", None),
-                "_is_backend": validated_request_data.pop("_is_backend", False),
-            }
-            headers["x-bkapi-authorization"] = json.dumps(self.add_esb_info_before_request(params))
+            _request = validated_request_data.pop("_request", None)
+            _is_backend = validated_request_data.pop("_is_backend", False)
+            headers["x-bkapi-authorization"] = self.build_authorization_header(_request or request, _is_backend)
 
         return headers
 
+    def build_cookie_header(self, request: WSGIRequest) -> Dict[str, str]:
+        """
+        根据用户的 Cookie 构造请求头，同一请求内缓存
+        """
+
+        request_cache = self._get_request_header_cache(request)
+        if "cookie" not in request_cache:
+            request_cache["cookie"] = {
+                "cookie": "; ".join(
+                    [
+                        f"{key}={val}"
+                        for key, val in request.COOKIES.items()
+                        if key in bk_resource_settings.REQUEST_BKAPI_COOKIE_FIELDS
+                    ]
+                ),
+                # 根据用户的Cookie指定语言
+                bk_resource_settings.REQUEST_LANGUGAE_HEADER_KEY: request.COOKIES.get(
+                    settings.LANGUAGE_COOKIE_NAME, settings.LANGUAGE_CODE
+                ),
+            }
+        return request_cache["cookie"]
+
+    def build_authorization_header(self, request: WSGIRequest = None, _is_backend: bool = False) -> str:
+        """
+        构造 x-bkapi-authorization
+        后台及平台鉴权只与配置相关，按类缓存，配置变更时失效；用户鉴权按请求缓存
+        """
+
+        if not self.cache_authorization_header:
+            return self._dumps_authorization({"_request": request, "_is_backend": _is_backend})
+
+        # 后台程序
+        if _is_backend or is_backend():
+            header = _BACKEND_AUTHORIZATION_HEADERS.get(self.__class__)
+            if header is None:
+                header = self._dumps_authorization({"_is_backend": True})
+                _BACKEND_AUTHORIZATION_HEADERS[self.__class__] = header
+            return header
+
+        # 非 request 请求
+        if request is None:
+            return self._dumps_authorization({})
+
+        request_cache = self._get_request_header_cache(request)
+        cache_key = ("authorization", self.__class__)
+        if cache_key not in request_cache:
+            request_cache[cache_key] = self._dumps_authorization({"_request": request})
+        return request_cache[cache_key]
+
+    def _dumps_authorization(self, params: dict) -> str:
+        auth_params = self.add_esb_info_before_request(params)
+        # 请求头仅支持 ASCII 字符
+        return json_dumps(auth_params, ensure_ascii=True)
+
+    @staticmethod
+    def _get_request_header_cache(request: WSGIRequest) -> dict:
+        """
+        绑定在 request 对象上的请求头缓存，无法绑定时不缓存
+        """
+
+        request_cache = getattr(request, "_bk_resource_header_cache", None)
+        if request_cache is None:
+            request_cache = {}
+            try:
+                request._bk_resource_header_cache = request_cache
+            except AttributeError:
+                pass
+        return request_cache
+
+    @classmethod
+    def clear_authorization_header_cache(cls) -> None:
+        """
+        清理后台及平台鉴权请求头缓存
+        """
+
+        _BACKEND_AUTHORIZATION_HEADERS.clear()
+
     def parse_response(self, response: requests.Response) -> any:
         """
         兼容IAM无权限处理
         """
 
         try:
-            result_json = response.json()
+            result_json = self.load_response_json(response)
         except Exception:
             result_json = []
 
@@ -171,6 +252,6 @@ class BkApiResource(APIResource, abc.ABC):
             data = result_json.get("data", {})
             if result_json.get("permission"):
                 data["permission"] = result_json["permission"]
-            raise IAMNoPermission(data=json.dumps(data))
+            raise IAMNoPermission(data=json_dumps(data))
 
         return super().parse_response(response)
@@ -73,9 +73,14 @@ class ViewMixin(GenericAPIView):
         if request is None:
             assert method is not None, gettext("request and method cannot be empty at the same time")
             request = self.build_request(method=method, params=params)
+        # 查询时只获取选择的字段
+        queryset = self.queryset
+        field_selection = getattr(self, "field_selection", None)
+        if field_selection and request.method == "GET":
+            queryset = field_selection.apply_queryset(queryset)
         # 构造 ViewSet, ModelResource分页配置与ResourceViewSet冲突
         model_params = {
-            "queryset": self.queryset,
+            "queryset": queryset,
             "filter_backends": self.filter_backends,
             "serializer_class": self.serializer_class,
             "pagination_class": None,
@@ -88,6 +93,11 @@ class ViewMixin(GenericAPIView):
             **self.view_set_attrs,
         }
         view_set = ModelViewSet(**model_params)
+        if field_selection:
+            get_serializer = view_set.get_serializer
+            view_set.get_serializer = lambda *args, **kwargs: field_selection.prune_serializer(
+                get_serializer(*args, **kwargs)
+            )
         return view_set
 
     def build_request_and_view_set(self, *, method: str, params: dict) -> (WSGIRequest, ModelViewSet):
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import abc
+import functools
+import math
+from collections import deque
+from typing import Iterator, List, Tuple, Union
+
+from bk_resource.contrib.api import APIResource
+from bk_resource.contrib.bk_api import BkApiResource
+from bk_resource.tools import get_processes
+from bk_resource.utils.thread_backend import ThreadPool
+
+
+class PaginationType:
+    # page / page_size
+    PAGE = "page"
+    # start / limit
+    OFFSET = "offset"
+
+
+class PaginatedAPIResourceMixin:
+    """
+    分页接口，声明分页方式后即可遍历全部数据
+
+    >>> class SearchHostResource(PaginatedAPIResourceMixin, BkApiResource):
+    ...     pagination_type = PaginationType.OFFSET
+    ...     page_params_key = "page"
+    ...     results_key = "info"
+
+    >>> for host in api.cmdb.search_host.iter_records(bk_biz_id=2):
+    ...     ...
+    """
+
+    # 分页方式
+    pagination_type = PaginationType.PAGE
+    # PAGE 模式参数
+    page_param = "page"
+    page_size_param = "page_size"
+    first_page = 1
+    # OFFSET 模式参数
+    offset_param = "start"
+    limit_param = "limit"
+    # 分页参数嵌套的 key，如 CMDB 接口为 {"page": {"start": 0, "limit": 500}}，为空时与其他参数同级
+    page_params_key = None
+    # 每页数量
+    page_size = 500
+    # 返回数据中总数与数据列表的 key，results_key 为空时返回数据即为列表
+    total_key = "count"
+    results_key = "results"
+    # 并发请求的最大线程数，为空时与 bulk_request 一致
+    max_workers = None
+
+    # 分页参数在请求参数中的 key，校验请求参数后再合并，避免被 RequestSerializer 过滤
+    PAGE_PARAMS_FIELD = "_page_params"
+
+    def build_page_params(self, page_index: int, page_size: int) -> dict:
+        """
+        构造分页参数，page_index 从 0 开始
+        """
+        if self.pagination_type == PaginationType.OFFSET:
+            params = {self.offset_param: page_index * page_size, self.limit_param: page_size}
+        else:
+            params = {self.page_param: self.first_page + page_index, self.page_size_param: page_size}
+        if self.page_params_key:
+            return {self.page_params_key: params}
+        return params
+
+    def parse_page(self, response_data: Union[dict, list]) -> Tuple[Union[int, None], list]:
+        """
+        解析单页返回数据，返回 (总数, 数据列表)，总数未知时为 None
+        """
+        if not self.results_key:
+            return None, list(response_data or [])
+        response_data = response_data or {}
+        return response_data.get(self.total_key), list(response_data.get(self.results_key) or [])
+
+    def validate_request_data(self, request_data):
+        page_params = None
+        if isinstance(request_data, dict) and self.PAGE_PARAMS_FIELD in request_data:
+            request_data = dict(request_data)
+            page_params = request_data.pop(self.PAGE_PARAMS_FIELD)
+        validated_request_data = super().validate_request_data(request_data)
+        if page_params:
+            validated_request_data = dict(validated_request_data)
+            validated_request_data.update(page_params)
+        return validated_request_data
+
+    def _request_page(self, request_data: dict, page_index: int, _request=None) -> Tuple[Union[int, None], list]:
+        page_request_data = dict(request_data)
+        page_request_data[self.PAGE_PARAMS_FIELD] = self.build_page_params(page_index, self.page_size)
+        # 每页单独记录调用分析节点及请求日志
+        request = functools.partial(self.request, page_request_data, _request=_request)
+        return self.parse_page(self._record_call(request, page_request_data))
+
+    def iter_pages(self, request_data: dict = None, concurrent: bool = False, **kwargs) -> Iterator[list]:
+        """
+        逐页返回数据，首页获取总数后，可并发请求剩余页面
+        :param request_data: 请求参数，无需包含分页参数
+        :param concurrent: 是否并发请求，总数未知时仅支持顺序请求
+        """
+        request_data = request_data or kwargs
+
+        # 模块引入，放在文件头可能导致 django 未完全初始化异常
+        from blueapps.utils.request_provider import get_local_request
+
+        _request = get_local_request()
+
+        total, items = self._request_page(request_data, 0, _request)
+        yield items
+
+        # 总数未知时，顺序请求直到数据不足一页
+        if total is None:
+            page_index = 1
+            while len(items) >= self.page_size:
+                total, items = self._request_page(request_data, page_index, _request)
+                page_index += 1
+                if not items:
+                    return
+                yield items
+            return
+
+        page_count = math.ceil(total / self.page_size)
+        if not concurrent:
+            for page_index in range(1, page_count):
+                yield self._request_page(request_data, page_index, _request)[1]
+            return
+
+        # 并发请求，同时进行中的请求数不超过线程数，按页码顺序返回
+        page_indexes = iter(range(1, page_count))
+        processes = min(self.max_workers or get_processes(), max(page_count - 1, 1))
+        request_page = self.bind_call_context(self._request_page)
+        with ThreadPool(processes=processes) as pool:
+            futures = deque()
+
+            def submit():
+                page_index = next(page_indexes, None)
+                if page_index is not None:
+                    future = pool.apply_async(
+                        request_page, args=(request_data, page_index), kwds={"_request": _request}
+                    )
+                    futures.append(future)
+
+            for _ in range(processes):
+                submit()
+            while futures:
+                future = futures.popleft()
+                submit()
+                yield future.get()[1]
+
+    def iter_records(self, request_data: dict = None, concurrent: bool = False, **kwargs) -> Iterator:
+        """
+        逐条返回全部数据
+        """
+        for items in self.iter_pages(request_data, concurrent=concurrent, **kwargs):
+            yield from items
+
+    def request_all(self, request_data: dict = None, concurrent: bool = True, **kwargs) -> List:
+        """
+        获取全部数据，默认并发请求
+        """
+        return list(self.iter_records(request_data, concurrent=concurrent, **kwargs))
+
+
+class PaginatedAPIResource(PaginatedAPIResourceMixin, APIResource, metaclass=abc.ABCMeta):
+    """
+    分页的 APIResource
+    """
+
+
+class PaginatedBkApiResource(PaginatedAPIResourceMixin, BkApiResource, metaclass=abc.ABCMeta):
+    """
+    分页的 BkApiResource
+    """
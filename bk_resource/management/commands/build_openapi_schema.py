@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.openapi_schema import build_schema_files
+
+
+class Command(BaseCommand):
+    help = "预生成 OpenAPI 文档（JSON 及 YAML），文件名包含内容哈希，由 ResourceRouter.register_openapi_schema 注册的接口返回"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", default=None, help="输出目录，默认为 BK_RESOURCE['OPENAPI_SCHEMA_DIR']")
+        parser.add_argument("--url", default=None, help="接口地址，默认为 BK_RESOURCE['OPENAPI_SCHEMA_URL']")
+
+    def handle(self, output, url, **kwargs):
+        directory = output or bk_resource_settings.OPENAPI_SCHEMA_DIR
+        if not directory:
+            raise CommandError("output directory is required, use --output or set BK_RESOURCE['OPENAPI_SCHEMA_DIR']")
+        manifest = build_schema_files(directory, url=url)
+        self.stdout.write("hash: {}".format(manifest["hash"]))
+        for filename in manifest["files"].values():
+            self.stdout.write(filename)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from bk_resource.base import Resource
+from bk_resource.management.root import adapter, api, resource
+from bk_resource.utils.load_test import LoadTestMode, LoadTestRunner, bind_base_url
+from bk_resource.utils.stub_gateway import StubGateway
+
+ROOTS = {"api": api, "resource": resource, "adapter": adapter}
+
+
+def get_resource_class(path: str) -> type:
+    """
+    支持 api.cmdb.search_host 形式的快捷路径或 Resource 类的导入路径
+    """
+    root, _, attrs = path.partition(".")
+    try:
+        if root in ROOTS:
+            obj = ROOTS[root]
+            for attr in attrs.split("."):
+                obj = getattr(obj, attr)
+        else:
+            obj = import_string(path)
+    except Exception as err:
+        raise CommandError("resource {} not found: {}".format(path, err))
+    resource_class = obj if isinstance(obj, type) else obj.__class__
+    if not issubclass(resource_class, Resource):
+        raise CommandError("{} is not a Resource".format(path))
+    return resource_class
+
+
+class Command(BaseCommand):
+    help = "压测 APIResource，默认请求本地模拟网关，输出吞吐量、耗时分布（ms）及连接复用情况"
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", help="Resource 路径，如 api.cmdb.search_host 或 Resource 类的导入路径")
+        parser.add_argument("--data", default="{}", help="请求参数，JSON 格式")
+        parser.add_argument("--mode", default=LoadTestMode.SYNC, choices=LoadTestMode.CHOICES, help="调用方式")
+        parser.add_argument("--concurrency", type=int, default=10, help="并发线程数")
+        parser.add_argument("--requests", type=int, default=1000, help="请求总数")
+        parser.add_argument("--duration", type=float, default=None, help="压测时长（s），设置后忽略请求总数")
+        parser.add_argument("--bulk-size", type=int, default=10, help="bulk 模式下每次批量请求的数量")
+        parser.add_argument("--base-url", default=None, help="请求的地址，为空时启动本地模拟网关")
+        parser.add_argument("--latency", default=None, help="模拟网关延迟（ms），如 20、uniform:10,50、normal:30,5")
+        parser.add_argument("--error-rate", type=float, default=0, help="模拟网关返回 HTTP 500 的比例")
+        parser.add_argument("--failure-rate", type=float, default=0, help="模拟网关返回 result 为 false 的比例")
+
+    def handle(self, *args, **options):
+        try:
+            request_data = json.loads(options["data"])
+        except ValueError as err:
+            raise CommandError("invalid --data: {}".format(err))
+        resource_class = get_resource_class(options["resource"])
+
+        gateway = None
+        base_url = options["base_url"]
+        if base_url is None:
+            gateway = StubGateway(
+                latency=options["latency"],
+                error_rate=options["error_rate"],
+                failure_rate=options["failure_rate"],
+            ).start()
+            base_url = gateway.url
+
+        try:
+            runner = LoadTestRunner(
+                bind_base_url(resource_class, base_url)(),
+                request_data,
+                mode=options["mode"],
+                concurrency=options["concurrency"],
+                total=options["requests"],
+                duration=options["duration"],
+                bulk_size=options["bulk_size"],
+                gateway=gateway,
+            )
+            result = runner.run()
+        finally:
+            if gateway is not None:
+                gateway.stop()
+
+        self.stdout.write(json.dumps(result, indent=2))
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.core.management.base import BaseCommand
+
+from bk_resource.utils.log_spool import iter_spool_records, summarize_request_logs
+
+COLUMNS = ("count", "failed", "avg", "p50", "p95", "p99", "max")
+
+
+class Command(BaseCommand):
+    help = "统计结构化请求日志中各 Resource 的调用次数及耗时（ms）"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="日志文件路径，支持通配符，默认包含轮转的历史文件")
+        parser.add_argument("--sort", default="p95", choices=COLUMNS, help="排序字段")
+        parser.add_argument("--top", type=int, default=20, help="输出数量，为 0 时输出全部")
+        parser.add_argument("--resource", default="", help="只统计名称包含该字符串的 Resource")
+
+    def handle(self, path, sort, top, resource, **kwargs):
+        records = (record for record in iter_spool_records(path) if resource in record.get("resource", ""))
+        summary = sorted(summarize_request_logs(records).items(), key=lambda item: item[1][sort], reverse=True)
+        if top:
+            summary = summary[:top]
+
+        self.stdout.write("\t".join(("resource",) + COLUMNS))
+        for resource_name, stats in summary:
+            self.stdout.write("\t".join([resource_name] + [str(stats[column]) for column in COLUMNS]))
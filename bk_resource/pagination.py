@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import abc
+import base64
+import binascii
+import datetime
+import math
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils.translation import gettext
+from drf_yasg import openapi
+
+from bk_resource.base import Resource
+from bk_resource.exceptions import ValidateException
+from bk_resource.utils.json_backend import json_default, json_dumps, json_loads
+
+
+class PaginationMode:
+    # page / page_size，返回 page、num_pages、total
+    PAGE = "page"
+    # cursor / page_size，返回 next_cursor、has_next、total
+    CURSOR = "cursor"
+
+
+# 游标中日期时间类型的标记，值为 isoformat，保留微秒及时区以精确还原
+CURSOR_DATETIME_KEY = "__dt__"
+CURSOR_DATE_KEY = "__date__"
+
+
+def _cursor_default(obj: any) -> any:
+    """
+    日期时间按类型编码，默认的序列化方法会丢失微秒，导致同一秒内的数据被跳过
+    """
+    if isinstance(obj, datetime.datetime):
+        return {CURSOR_DATETIME_KEY: obj.isoformat()}
+    if isinstance(obj, datetime.date):
+        return {CURSOR_DATE_KEY: obj.isoformat()}
+    return json_default(obj)
+
+
+def _decode_cursor_value(value: any) -> any:
+    if isinstance(value, dict) and len(value) == 1:
+        if CURSOR_DATETIME_KEY in value:
+            return datetime.datetime.fromisoformat(value[CURSOR_DATETIME_KEY])
+        if CURSOR_DATE_KEY in value:
+            return datetime.date.fromisoformat(value[CURSOR_DATE_KEY])
+    return value
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    将最后一条数据的排序字段编码为游标
+    """
+    return base64.urlsafe_b64encode(json_dumps(values, default=_cursor_default).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        values = json_loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if isinstance(values, dict):
+            values = {field: _decode_cursor_value(value) for field, value in values.items()}
+    except (ValueError, TypeError, binascii.Error):
+        values = None
+    if not isinstance(values, dict):
+        raise ValidateException(gettext("无效的分页游标: %s") % cursor)
+    return values
+
+
+class PageRequest:
+    """
+    分页参数，由 PaginatedResourceMixin 解析后以 _page 传入 perform_request
+    """
+
+    __slots__ = ("mode", "page", "page_size", "cursor", "with_total")
+
+    def __init__(
+        self,
+        mode: str = PaginationMode.CURSOR,
+        page: int = 1,
+        page_size: int = 100,
+        cursor: str = None,
+        with_total: bool = False,
+    ):
+        self.mode = mode
+        self.page = page
+        self.page_size = page_size
+        self.cursor = cursor
+        self.with_total = with_total
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.page_size
+
+    @property
+    def limit(self) -> int:
+        return self.page_size
+
+    @property
+    def cursor_values(self) -> Optional[dict]:
+        """
+        游标中的排序字段值，首页为 None
+        """
+        if not self.cursor:
+            return None
+        return decode_cursor(self.cursor)
+
+
+class Page:
+    """
+    单页数据，PaginatedResourceMixin 的 perform_request 需要返回该对象
+    """
+
+    def __init__(
+        self,
+        results: Iterable,
+        page_request: PageRequest,
+        total: int = None,
+        total_is_estimated: bool = False,
+        next_cursor: str = None,
+        has_next: bool = None,
+    ):
+        """
+        :param total: 总数，未知或未请求时为 None
+        :param total_is_estimated: total 是否为估算值
+        :param next_cursor: 下一页游标，CURSOR 模式有效
+        :param has_next: 是否有下一页，为 None 时根据 next_cursor 或 total 判断
+        """
+        self.results = results
+        self.page_request = page_request
+        self.total = total
+        self.total_is_estimated = total_is_estimated
+        self.next_cursor = next_cursor
+        if has_next is None:
+            if page_request.mode == PaginationMode.CURSOR:
+                has_next = next_cursor is not None
+            elif total is not None:
+                has_next = page_request.page * page_request.page_size < total
+        self.has_next = has_next
+
+    def to_dict(self) -> dict:
+        page_request = self.page_request
+        if page_request.mode == PaginationMode.PAGE:
+            num_pages = math.ceil(self.total / page_request.page_size) if self.total is not None else None
+            return OrderedDict(
+                [
+                    ("page", page_request.page),
+                    ("num_pages", num_pages),
+                    ("total", self.total),
+                    ("results", self.results),
+                ]
+            )
+        return OrderedDict(
+            [
+                ("next_cursor", self.next_cursor),
+                ("has_next", self.has_next),
+                ("total", self.total),
+                ("total_is_estimated", self.total_is_estimated),
+                ("results", self.results),
+            ]
+        )
+
+
+class PaginatedResourceMixin:
+    """
+    由 Resource 自身分页，分页参数以 PageRequest 对象通过 validated_request_data["_page"] 传入，
+    perform_request 可以将 LIMIT / 游标条件下推到数据库或接口，返回 Page 对象
+
+    >>> class ListHostResource(PaginatedResource):
+    ...     pagination_mode = PaginationMode.CURSOR
+    ...     cursor_ordering = ("-created_at", "id")
+    ...
+    ...     def perform_request(self, validated_request_data):
+    ...         queryset = Host.objects.filter(bk_biz_id=validated_request_data["bk_biz_id"])
+    ...         return self.paginate_queryset(queryset, validated_request_data["_page"])
+    """
+
+    # 分页方式
+    pagination_mode = PaginationMode.CURSOR
+    # 请求参数名
+    page_param = "page"
+    page_size_param = "page_size"
+    cursor_param = "cursor"
+    with_total_param = "with_total"
+    # 默认及最大每页数量
+    page_size = 100
+    max_page_size = 1000
+    # CURSOR 模式的排序字段，"-" 开头表示倒序，需包含唯一字段以保证顺序稳定
+    # 排序字段不能为空值（null=True），NULL 无法通过比较条件定位游标
+    cursor_ordering: Sequence[str] = ("pk",)
+    # CURSOR 模式计算总数时最多统计的数量，超过后返回该值并标记为估算值，为 None 时精确计数
+    max_count = 10000
+    # CURSOR 模式默认不计算总数，PAGE 模式始终计算
+    with_total_default = False
+
+    @staticmethod
+    def _parse_int(value: any, default: int, minimum: int = 1) -> int:
+        try:
+            return max(int(value), minimum)
+        except (TypeError, ValueError):
+            return default
+
+    def build_page_request(self, request_data: Union[models.Model, dict]) -> PageRequest:
+        """
+        从原始请求参数中解析分页参数
+        """
+        if not hasattr(request_data, "get"):
+            request_data = {}
+        page_size = min(self._parse_int(request_data.get(self.page_size_param), self.page_size), self.max_page_size)
+        with_total = request_data.get(self.with_total_param)
+        if with_total is None:
+            with_total = self.with_total_default
+        elif isinstance(with_total, str):
+            with_total = with_total.lower() in ("1", "true", "yes")
+        return PageRequest(
+            mode=self.pagination_mode,
+            page=self._parse_int(request_data.get(self.page_param), 1),
+            page_size=page_size,
+            cursor=request_data.get(self.cursor_param) or None,
+            with_total=self.pagination_mode == PaginationMode.PAGE or bool(with_total),
+        )
+
+    def build_extra_params(self, request_data: Union[models.Model, dict], validated_request_data: dict) -> dict:
+        validated_request_data = super().build_extra_params(request_data, validated_request_data)
+        validated_request_data["_page"] = self.build_page_request(request_data)
+        return validated_request_data
+
+    def validate_response_data(self, response_data):
+        """
+        仅校验当前页的数据
+        """
+        if not isinstance(response_data, Page):
+            return super().validate_response_data(response_data)
+        results = list(response_data.results)
+        # paginate_queryset 返回的 Model 列表与 QuerySet 一样直接序列化
+        if self.ResponseSerializer and results and isinstance(results[0], models.Model):
+            response_data.results = self.build_response_serializer(results, many=True).data
+        else:
+            response_data.results = super().validate_response_data(results)
+        return response_data
+
+    def count_queryset(self, queryset: models.QuerySet) -> Tuple[int, bool]:
+        """
+        统计总数，返回 (总数, 是否为估算值)，超过 max_count 时只统计到 max_count
+        """
+        queryset = queryset.order_by()
+        if self.max_count is None:
+            return queryset.count(), False
+        total = queryset[: self.max_count + 1].count()
+        if total > self.max_count:
+            return self.max_count, True
+        return total, False
+
+    @staticmethod
+    def _get_value(obj: any, field: str) -> any:
+        if isinstance(obj, dict):
+            return obj[field]
+        return getattr(obj, field)
+
+    def get_cursor_ordering(self, queryset: models.QuerySet) -> List[str]:
+        """
+        获取 CURSOR 模式的排序字段，pk 转换为主键字段名，以便从 values() 返回的字典中取值
+        """
+        opts = queryset.model._meta
+        ordering = []
+        for field in self.cursor_ordering:
+            desc = "-" if field.startswith("-") else ""
+            name = field.lstrip("-")
+            if name == "pk":
+                name = opts.pk.attname
+            try:
+                model_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                # 关联字段、注解字段等在生成游标时检查
+                model_field = None
+            if getattr(model_field, "null", False):
+                raise ValueError(gettext("游标分页的排序字段不能为空值: %s") % name)
+            ordering.append(desc + name)
+        return ordering
+
+    def _build_cursor_filter(self, ordering: Sequence[str], values: dict) -> models.Q:
+        """
+        构造游标条件，如排序为 (a, b) 时为 a > x OR (a = x AND b > y)
+        """
+        condition = models.Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            if name not in values:
+                raise ValidateException(gettext("无效的分页游标，缺少字段: %s") % name)
+            lookup = "{}__{}".format(name, "lt" if field.startswith("-") else "gt")
+            item = models.Q(**{lookup: values[name]})
+            for previous in ordering[:index]:
+                previous = previous.lstrip("-")
+                item &= models.Q(**{previous: values[previous]})
+            condition |= item
+        return condition
+
+    def paginate_queryset(self, queryset: models.QuerySet, page_request: PageRequest) -> Page:
+        """
+        QuerySet 分页，PAGE 模式使用 LIMIT / OFFSET 并精确计数，CURSOR 模式按 cursor_ordering 使用 keyset 条件，
+        每页多查询一条数据用于判断是否有下一页
+        """
+        if page_request.mode == PaginationMode.PAGE:
+            # 总页数及是否有下一页依赖总数，PAGE 模式始终精确计数
+            total = queryset.order_by().count()
+            results = list(queryset[page_request.offset : page_request.offset + page_request.limit])
+            return Page(results, page_request, total=total)
+
+        total = None
+        total_is_estimated = False
+        if page_request.with_total:
+            total, total_is_estimated = self.count_queryset(queryset)
+
+        ordering = self.get_cursor_ordering(queryset)
+        queryset = queryset.order_by(*ordering)
+        cursor_values = page_request.cursor_values
+        if cursor_values is not None:
+            queryset = queryset.filter(self._build_cursor_filter(ordering, cursor_values))
+        results: List = list(queryset[: page_request.limit + 1])
+
+        next_cursor = None
+        if len(results) > page_request.limit:
+            results = results[: page_request.limit]
+            cursor_values = {field.lstrip("-"): self._get_value(results[-1], field.lstrip("-")) for field in ordering}
+            null_fields = [field for field, value in cursor_values.items() if value is None]
+            if null_fields:
+                raise ValueError(gettext("游标分页的排序字段不能为空值: %s") % ", ".join(null_fields))
+            next_cursor = encode_cursor(cursor_values)
+        return Page(
+            results, page_request, total=total, total_is_estimated=total_is_estimated, next_cursor=next_cursor
+        )
+
+    @classmethod
+    def get_page_parameters(cls) -> List[openapi.Parameter]:
+        """
+        swagger 中的分页参数
+        """
+        parameters = [
+            openapi.Parameter(
+                cls.page_size_param, openapi.IN_QUERY, description=gettext("每页数量"), type=openapi.TYPE_INTEGER
+            )
+        ]
+        if cls.pagination_mode == PaginationMode.PAGE:
+            parameters.append(
+                openapi.Parameter(
+                    cls.page_param, openapi.IN_QUERY, description=gettext("页码"), type=openapi.TYPE_INTEGER
+                )
+            )
+        else:
+            parameters.extend(
+                [
+                    openapi.Parameter(
+                        cls.cursor_param, openapi.IN_QUERY, description=gettext("分页游标"), type=openapi.TYPE_STRING
+                    ),
+                    openapi.Parameter(
+                        cls.with_total_param,
+                        openapi.IN_QUERY,
+                        description=gettext("是否返回总数"),
+                        type=openapi.TYPE_BOOLEAN,
+                    ),
+                ]
+            )
+        return parameters
+
+
+class PaginatedResource(PaginatedResourceMixin, Resource, metaclass=abc.ABCMeta):
+    """
+    由 Resource 自身分页的 Resource
+    """
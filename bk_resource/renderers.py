@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from blueapps.contrib.drf.renderers import APIRenderer
+from rest_framework.renderers import JSONRenderer
+
+from bk_resource.utils.json_backend import json_dumps
+
+
+class BkResourceJSONRenderer(JSONRenderer):
+    """
+    使用 BK_RESOURCE["JSON_BACKEND"] 序列化的 JSONRenderer，输出紧凑格式，ensure_ascii 遵循 DRF 的 UNICODE_JSON 配置
+    需要格式化输出（indent）或关闭 COMPACT_JSON 时仍使用 DRF 默认实现
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if not self.compact or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # 与 DRF 保持一致，转义 JavaScript 中不合法的字符
+        ret = json_dumps(data, default=self.encoder_class().default, ensure_ascii=self.ensure_ascii)
+        return ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+class BkResourceAPIRenderer(APIRenderer, BkResourceJSONRenderer):
+    """
+    使用 BK_RESOURCE["JSON_BACKEND"] 序列化的 blueapps APIRenderer
+    """
@@ -16,14 +16,20 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+from django.urls import re_path
 from rest_framework.routers import DefaultRouter
 from rest_framework.viewsets import GenericViewSet
 
 from bk_resource.tools import get_underscore_viewset_name
-from bk_resource.viewsets import ResourceViewSet
+from bk_resource.viewsets import OpenAPISchemaView, ResourceBatchView, ResourceViewSet, TaskProgressView
 
 
 class ResourceRouter(DefaultRouter):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 注册的非 ViewSet 视图，(prefix, view_class, name)
+        self.view_routes = []
+
     @staticmethod
     def _init_resource_viewset(viewset):
         """
@@ -57,5 +63,33 @@ class ResourceRouter(DefaultRouter):
                     module_prefix = f"{prefix}/{module_prefix}" if module_prefix else prefix
                 self.register(module_prefix, viewset)
 
+    def register_batch(self, prefix: str = "batch", view_class=ResourceBatchView):
+        """
+        注册批量接口，仅允许调用当前 router 中注册的 ResourceViewSet
+        """
+        self.register_view(prefix, view_class.as_view(router=self), "{}-batch".format(prefix))
+
+    def register_task_progress(self, prefix: str = "task_progress", view_class=TaskProgressView):
+        """
+        注册异步任务进度接口，支持长轮询及 SSE
+        """
+        self.register_view(prefix, view_class.as_view(), "{}-progress".format(prefix))
+
+    def register_openapi_schema(self, prefix: str = "openapi", view_class=OpenAPISchemaView):
+        """
+        注册 OpenAPI 文档接口，返回 build_openapi_schema 命令预生成的文件
+        """
+        self.register_view(prefix, view_class.as_view(), "{}-schema".format(prefix))
+
+    def register_view(self, prefix: str, view, name: str = None):
+        self.view_routes.append((prefix, view, name))
+        if hasattr(self, "_urls"):
+            del self._urls
+
+    def get_urls(self):
+        # 注册的视图优先匹配，避免被空前缀 ViewSet 的 detail route 覆盖，如 batch/ 匹配为 {pk}/
+        urls = [re_path(r"^{}/$".format(prefix), view, name=name) for prefix, view, name in self.view_routes]
+        return urls + super().get_urls()
+
     def get_default_basename(self, viewset):
         return get_underscore_viewset_name(viewset)
@@ -26,6 +26,23 @@ class ErrorResponseSerializer(serializers.Serializer):
     data = serializers.JSONField()
 
 
+class BatchItemSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, allow_blank=True, label="请求标识，原样返回")
+    route = serializers.CharField(label="路由路径，不以 / 开头时为相对批量接口所在目录的路径")
+    method = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"], default="GET", label="请求方法")
+    params = serializers.JSONField(default=dict, label="请求参数，GET 请求为查询参数，其他为请求体")
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+
+
+class TaskProgressRequestSerializer(serializers.Serializer):
+    task_id = serializers.CharField(label="任务ID")
+    version = serializers.IntegerField(default=0, min_value=0, label="已获取的进度版本号")
+    timeout = serializers.FloatField(required=False, min_value=0, label="最长等待时间（s）")
+
+
 class ResponseBuilder:
     serializer = None
 
@@ -52,6 +69,21 @@ class PaginatorResponseBuilder(ResponseBuilder):
         return PaginatorSerializer()
 
 
+class CursorPaginatorResponseBuilder(ResponseBuilder):
+    def build_serializer(self, *, resource_class=None, data_serializer=None, name=None, **kwargs):
+        class CursorPaginatorSerializer(serializers.Serializer):
+            next_cursor = serializers.CharField(allow_null=True)
+            has_next = serializers.BooleanField()
+            total = serializers.IntegerField(allow_null=True)
+            total_is_estimated = serializers.BooleanField()
+            results = data_serializer
+
+            class Meta:
+                ref_name = "[{}]".format(name or resource_class.__name__)
+
+        return CursorPaginatorSerializer()
+
+
 class StandardResponseBuilder(ResponseBuilder):
     def build_serializer(self, *, resource_class=None, data_serializer=None, name=None, **kwargs):
         class ResponseSerializer(serializers.Serializer):
@@ -20,6 +20,7 @@ from collections import defaultdict
 from typing import Union
 
 from django.conf import settings
+from django.core.signals import setting_changed
 from django.utils.module_loading import import_string
 
 
@@ -39,10 +40,26 @@ class BkResourceSettings:
         },
         DEFAULT_ERROR_RESPONSE_SERIALIZER="bk_resource.serializers.ErrorResponseSerializer",
         DEFAULT_PAGINATOR_RESPONSE_BUILDER="bk_resource.serializers.PaginatorResponseBuilder",
+        DEFAULT_CURSOR_PAGINATOR_RESPONSE_BUILDER="bk_resource.serializers.CursorPaginatorResponseBuilder",
         DEFAULT_STANDARD_RESPONSE_BUILDER="bk_resource.serializers.StandardResponseBuilder",
         DEFAULT_SWAGGER_SCHEMA_CLASS="bk_resource.utils.inspectors.BkResourceSwaggerAutoSchema",
         REQUEST_LOG_HANDLER="bk_resource.utils.request_log.RequestLogHandler",
         REQUEST_LOG_SPLIT_LENGTH=0,
+        REQUEST_LOG_MAX_ITEMS=100,
+        REQUEST_LOG_SAMPLE_RATE=1,
+        REQUEST_LOG_RESOURCE_SAMPLE_RATES={},
+        REQUEST_LOG_SLOW_THRESHOLD=None,
+        REQUEST_LOG_ONLY_SLOW_OR_FAILED=False,
+        REQUEST_LOG_STRUCTURED_INCLUDE_DATA=True,
+        REQUEST_LOG_SPOOL_PATH=None,
+        REQUEST_LOG_SPOOL_MAX_BYTES=100 * 1024 * 1024,
+        REQUEST_LOG_SPOOL_BACKUP_COUNT=5,
+        REQUEST_LOG_SPOOL_FSYNC_INTERVAL=None,
+        REQUEST_LOG_QUEUE_SIZE=10000,
+        REQUEST_LOG_BATCH_SIZE=100,
+        REQUEST_LOG_FLUSH_INTERVAL=0.5,
+        REQUEST_LOG_OVERFLOW_POLICY="drop",
+        REQUEST_LOG_OVERFLOW_SAMPLE_RATE=0.1,
         REQUEST_VERIFY=True,
         PLATFORM_AUTH_ENABLED=False,
         PLATFORM_AUTH_ACCESS_TOKEN=None,
@@ -50,14 +67,42 @@ class BkResourceSettings:
         REQUEST_BKAPI_COOKIE_FIELDS=["blueking_language", "django_language"],
         REQUEST_LANGUGAE_HEADER_KEY="blueking-language",
         RESOURCE_BULK_REQUEST_PROCESSES=None,
+        RESOURCE_REUSE_INSTANCE=False,
+        JSON_BACKEND="bk_resource.utils.json_backend.StdlibJSONBackend",
+        PROCESS_ROLE=None,
+        RESOURCE_PROFILE_SAMPLE_RATE=0,
+        RESOURCE_PROFILE_HEADER="X-Bk-Resource-Profile",
+        RESOURCE_PROFILE_DIR=None,
+        RESOURCE_PROFILE_MIN_DURATION=0,
+        AUTO_ETAG=False,
+        STREAMING_CHUNK_SIZE=100,
+        FIELDS_PARAM="fields",
+        EXCLUDE_PARAM="exclude",
+        BATCH_MAX_REQUESTS=50,
+        BATCH_MAX_WORKERS=None,
+        TASK_PROGRESS_ENABLED=False,
+        TASK_PROGRESS_CACHE_ALIAS="default",
+        TASK_PROGRESS_EXPIRE=24 * 60 * 60,
+        TASK_PROGRESS_POLL_INTERVAL=0.2,
+        TASK_PROGRESS_WAIT_TIMEOUT=30,
+        TASK_PROGRESS_SSE_TIMEOUT=5 * 60,
+        OPENAPI_SCHEMA_GENERATOR_CLASS="bk_resource.utils.generators.BKResourceOpenAPISchemaGenerator",
+        OPENAPI_SCHEMA_INFO=None,
+        OPENAPI_SCHEMA_URL=None,
+        OPENAPI_SCHEMA_DIR=None,
+        OPENAPI_SCHEMA_MAX_AGE=60 * 60,
     )
 
     LAZY_IMPORT_SETTINGS = (
         "DEFAULT_ERROR_RESPONSE_SERIALIZER",
         "DEFAULT_PAGINATOR_RESPONSE_BUILDER",
+        "DEFAULT_CURSOR_PAGINATOR_RESPONSE_BUILDER",
         "DEFAULT_STANDARD_RESPONSE_BUILDER",
         "DEFAULT_SWAGGER_SCHEMA_CLASS",
         "REQUEST_LOG_HANDLER",
+        "JSON_BACKEND",
+        "OPENAPI_SCHEMA_GENERATOR_CLASS",
+        "OPENAPI_SCHEMA_INFO",
     )
 
     LOADED_SETTINGS = {}
@@ -112,3 +157,14 @@ class BkResourceSettings:
 
 
 bk_resource_settings = BkResourceSettings()
+
+
+def reload_bk_resource_settings(setting: str, **kwargs) -> None:
+    """
+    配置变更时（如 override_settings）清理已加载的配置
+    """
+    if setting == "BK_RESOURCE":
+        bk_resource_settings.LOADED_SETTINGS.clear()
+
+
+setting_changed.connect(reload_bk_resource_settings)
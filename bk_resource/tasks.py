@@ -16,16 +16,28 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import time
+from contextlib import nullcontext
 from functools import wraps
+from typing import Iterator, Optional
 
 from blueapps.core.celery import celery_app
+from celery import states
 from celery.result import AsyncResult
+from django.core.cache import caches
 from django.utils.module_loading import import_string
 
 from bk_resource.exceptions import CustomError
+from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.json_backend import json_dumps
 from bk_resource.utils.logger import logger
 from bk_resource.utils.request import set_local_username
 
+TASK_PROGRESS_CACHE_KEY = "bk_resource:task_progress:{}"
+TASK_PROGRESS_VERSION_CACHE_KEY = "bk_resource:task_progress_version:{}"
+# 等待进度时查询 celery 结果后端的最小间隔（s），进度缓存不在进程间共享时以结果后端判断任务是否完成
+TASK_RESULT_CHECK_INTERVAL = 1
+
 
 @celery_app.task(bind=True)
 def run_perform_request(self, resource_obj, username, request_data):
@@ -40,10 +52,21 @@ def run_perform_request(self, resource_obj, username, request_data):
     if isinstance(resource_obj, str):
         resource_obj = import_string(resource_obj)()
     set_local_username(username)
-    resource_obj._task_manager = self
-    validated_request_data = resource_obj.validate_request_data(request_data)
-    response_data = resource_obj.perform_request(validated_request_data)
-    validated_response_data = resource_obj.validate_response_data(response_data)
+    if hasattr(resource_obj, "call_scope"):
+        scope = resource_obj.call_scope(task_manager=self)
+    else:
+        resource_obj._task_manager = self
+        scope = nullcontext()
+    try:
+        with scope:
+            validated_request_data = resource_obj.validate_request_data(request_data)
+            response_data = resource_obj.perform_request(validated_request_data)
+            validated_response_data = resource_obj.validate_response_data(response_data)
+    except Exception as err:
+        publish_task_progress(self.request.id, states.FAILURE, message=str(err), is_completed=True)
+        raise
+    # 结果由 query_task_result 从结果后端获取，此处只通知任务已完成
+    publish_task_progress(self.request.id, states.SUCCESS, is_completed=True)
     return validated_response_data
 
 
@@ -97,6 +120,130 @@ def query_task_result(task_id):
     }
 
 
+def _get_progress_cache():
+    return caches[bk_resource_settings.TASK_PROGRESS_CACHE_ALIAS]
+
+
+def publish_task_progress(
+    task_id: Optional[str], state: str, message: str = None, data: any = None, is_completed: bool = False
+) -> None:
+    """
+    发布任务进度，每次发布递增版本号，等待方通过版本号判断状态是否变化
+    使用缓存保存最新的进度，多个进程间共享时需使用 redis 等缓存，TASK_PROGRESS_ENABLED 关闭时不发布
+    """
+    if not task_id or not bk_resource_settings.TASK_PROGRESS_ENABLED:
+        return
+    cache = _get_progress_cache()
+    key = TASK_PROGRESS_CACHE_KEY.format(task_id)
+    try:
+        progress = {
+            "task_id": task_id,
+            "version": _next_progress_version(cache, task_id),
+            "state": state,
+            "message": message,
+            "data": data,
+            "is_completed": is_completed,
+        }
+        cache.set(key, progress, bk_resource_settings.TASK_PROGRESS_EXPIRE)
+    except Exception as err:  # pylint: disable=broad-except
+        # 进度仅用于展示，失败时不影响任务执行
+        logger.exception("[TaskProgress] publish progress of task %s failed: %s", task_id, err)
+
+
+def _next_progress_version(cache, task_id: str) -> int:
+    """
+    原子递增进度版本号，多个进程同时发布时版本号不重复
+    """
+    key = TASK_PROGRESS_VERSION_CACHE_KEY.format(task_id)
+    cache.add(key, 0, bk_resource_settings.TASK_PROGRESS_EXPIRE)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # add 与 incr 之间缓存过期
+        cache.set(key, 1, bk_resource_settings.TASK_PROGRESS_EXPIRE)
+        return 1
+
+
+def _is_task_ready(task_id: str) -> bool:
+    try:
+        return AsyncResult(task_id).state in states.READY_STATES
+    except Exception as err:  # pylint: disable=broad-except
+        logger.exception("[TaskProgress] query state of task %s failed: %s", task_id, err)
+        return False
+
+
+def get_task_progress(task_id: str) -> Optional[dict]:
+    """
+    获取任务的最新进度，未发布过进度时返回 None
+    """
+    return _get_progress_cache().get(TASK_PROGRESS_CACHE_KEY.format(task_id))
+
+
+def wait_task_progress(task_id: str, version: int = 0, timeout: float = None) -> dict:
+    """
+    等待任务进度变化，版本号大于 version 或任务已完成时返回，超时后返回当前进度
+    没有进度记录时（如任务不是通过 Resource 发起）直接返回 query_task_result 的结果
+    任务完成时返回 query_task_result 的结果，包含任务返回数据
+    进度未完成时每隔 TASK_RESULT_CHECK_INTERVAL 查询一次结果后端，缓存不在进程间共享（如 locmem）时也能结束等待
+    :param version: 客户端已获取的版本号
+    :param timeout: 最长等待时间（s），不超过 TASK_PROGRESS_WAIT_TIMEOUT
+    """
+    max_timeout = bk_resource_settings.TASK_PROGRESS_WAIT_TIMEOUT
+    timeout = max_timeout if timeout is None else min(max(timeout, 0), max_timeout)
+    interval = bk_resource_settings.TASK_PROGRESS_POLL_INTERVAL
+    deadline = time.monotonic() + timeout
+    next_result_check = time.monotonic()
+
+    progress = get_task_progress(task_id)
+    while progress is not None and not progress["is_completed"] and progress["version"] <= version:
+        if time.monotonic() >= next_result_check:
+            if _is_task_ready(task_id):
+                # 结果后端已完成而进度未更新，版本号加一通知等待方
+                return dict(query_task_result(task_id), version=max(progress["version"], version) + 1)
+            next_result_check = time.monotonic() + TASK_RESULT_CHECK_INTERVAL
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # 查询缓存的代价远小于客户端轮询，逐步增加间隔，最长 1s
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, 1)
+        progress = get_task_progress(task_id)
+
+    if progress is None:
+        return dict(query_task_result(task_id), version=0)
+    if progress["is_completed"]:
+        return dict(query_task_result(task_id), version=progress["version"])
+    return progress
+
+
+def iter_task_progress_events(task_id: str, version: int = 0, timeout: float = None) -> Iterator[str]:
+    """
+    以 Server-Sent Events 格式返回任务进度，任务完成或超过 timeout 后结束，客户端可以通过 Last-Event-ID 继续
+    :param timeout: 连接最长保持时间（s），为 None 时使用 TASK_PROGRESS_SSE_TIMEOUT
+    """
+    timeout = bk_resource_settings.TASK_PROGRESS_SSE_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    # 连接断开后客户端的重连间隔（ms）
+    yield "retry: 1000\n\n"
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        progress = wait_task_progress(task_id, version, min(remaining, bk_resource_settings.TASK_PROGRESS_WAIT_TIMEOUT))
+        if progress["version"] <= version and not progress["is_completed"]:
+            # 没有进度记录时 wait_task_progress 不会等待，降低查询结果后端的频率
+            if not progress["version"]:
+                time.sleep(min(remaining, 1))
+            # 心跳，避免代理因空闲断开连接
+            yield ": keep-alive\n\n"
+            continue
+        version = progress["version"]
+        event = "complete" if progress["is_completed"] else "progress"
+        yield "id: {}\nevent: {}\ndata: {}\n\n".format(version, event, json_dumps(progress))
+        if progress["is_completed"]:
+            return
+
+
 def step(state=None, message=None, data=None):
     """
     步骤装饰器
@@ -29,6 +29,7 @@ from rest_framework.fields import empty
 from bk_resource.settings import bk_resource_settings
 from bk_resource.utils.common_utils import ignored
 from bk_resource.utils.logger import logger
+from bk_resource.utils.process import get_process_role
 from bk_resource.utils.text import camel_to_underscore
 
 
@@ -210,8 +211,10 @@ def get_processes() -> int:
     获取CPU数量或者容器内限制数量
     """
 
-    # 环境变量
+    # 环境变量，支持按进程角色配置，如 {"web": 4, "celery": 16}
     processes = bk_resource_settings.RESOURCE_BULK_REQUEST_PROCESSES
+    if isinstance(processes, dict):
+        processes = processes.get(get_process_role())
     if processes and isinstance(processes, int):
         return processes
 
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List
+
+
+class _PendingBatch:
+    def __init__(self, group_params: dict):
+        self.group_params = group_params
+        self.futures: Dict[Hashable, Future] = {}
+        self.full = threading.Event()
+
+
+class BatchLoader:
+    """
+    批量加载器
+    存在其他并发调用时，时间窗口内对同一分组的多次 load 调用会被合并，由首个调用者所在线程执行一次批量请求，其余调用者等待结果
+    没有其他并发调用时立即执行，单线程中的多次调用可以通过 collect 显式收集后合并
+    """
+
+    def __init__(
+        self,
+        batch_func: Callable[[dict, List[Hashable]], Dict[Hashable, any]],
+        max_batch_size: int = 100,
+        window: float = 0.01,
+    ):
+        """
+        :param batch_func: 批量函数，参数为分组公共参数与 key 列表，返回 key 到结果的映射
+        :param max_batch_size: 单次批量请求的最大 key 数量，达到后立即执行
+        :param window: 合并时间窗口，单位：s
+        """
+        self.batch_func = batch_func
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+        # 正在执行 load 的调用数
+        self._active = 0
+
+    def load(self, key: Hashable, group: Hashable = None, group_params: dict = None) -> any:
+        """
+        加载单个 key，阻塞直到所在批次执行完成
+        :param key: 对象标识
+        :param group: 分组，仅同一分组的调用会被合并
+        :param group_params: 分组的公共参数
+        """
+        is_leader = False
+        with self._lock:
+            self._active += 1
+            has_concurrent_calls = self._active > 1
+            batch = self._pending.get(group)
+            if batch is None:
+                batch = _PendingBatch(group_params or {})
+                self._pending[group] = batch
+                is_leader = True
+            future = batch.futures.get(key)
+            if future is None:
+                future = batch.futures[key] = Future()
+            if len(batch.futures) >= self.max_batch_size:
+                # 批次已满，后续调用使用新批次
+                self._pending.pop(group, None)
+                batch.full.set()
+
+        try:
+            if is_leader:
+                # 没有其他并发调用时无需等待
+                if has_concurrent_calls:
+                    batch.full.wait(self.window)
+                with self._lock:
+                    if self._pending.get(group) is batch:
+                        self._pending.pop(group)
+                self._dispatch(batch)
+            return future.result()
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def collect(self) -> "BatchCollector":
+        """
+        显式收集多次调用，退出上下文时按分组合并执行
+
+        >>> with loader.collect() as collector:
+        ...     futures = [collector.load(key) for key in keys]
+        >>> results = [future.result() for future in futures]
+        """
+        return BatchCollector(self)
+
+    def load_many(self, keys: List[Hashable], group_params: dict = None) -> List[any]:
+        """
+        直接批量加载，按 max_batch_size 分批请求，结果与 keys 顺序一致
+        """
+        results = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for index in range(0, len(unique_keys), self.max_batch_size):
+            chunk = unique_keys[index : index + self.max_batch_size]
+            results.update(self.batch_func(group_params or {}, chunk))
+        return [results.get(key) for key in keys]
+
+    def _dispatch(self, batch: _PendingBatch) -> None:
+        keys = list(batch.futures.keys())
+        try:
+            results = self.batch_func(batch.group_params, keys)
+        except Exception as err:
+            for future in batch.futures.values():
+                future.set_exception(err)
+            return
+        for key, future in batch.futures.items():
+            future.set_result(results.get(key))
+
+
+class BatchCollector:
+    """
+    批量收集器，load 返回 Future，在 flush 或退出上下文时按分组执行批量请求
+    同一分组达到 max_batch_size 时立即执行，仅在创建的线程中使用
+    """
+
+    def __init__(self, loader: BatchLoader):
+        self.loader = loader
+        self._pending: Dict[Hashable, _PendingBatch] = {}
+
+    def load(self, key: Hashable, group: Hashable = None, group_params: dict = None) -> Future:
+        batch = self._pending.get(group)
+        if batch is None:
+            batch = self._pending[group] = _PendingBatch(group_params or {})
+        future = batch.futures.get(key)
+        if future is None:
+            future = batch.futures[key] = Future()
+        if len(batch.futures) >= self.loader.max_batch_size:
+            self._pending.pop(group)
+            self.loader._dispatch(batch)
+        return future
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for batch in pending.values():
+            self.loader._dispatch(batch)
+
+    def cancel(self) -> None:
+        pending, self._pending = self._pending, {}
+        for batch in pending.values():
+            for future in batch.futures.values():
+                future.cancel()
+
+    def __enter__(self) -> "BatchCollector":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # 出现异常时不再发起请求
+        if exc_type is None:
+            self.flush()
+        else:
+            self.cancel()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+from typing import Callable, Iterator, Tuple
+
+from bk_resource.utils.json_backend import json_default
+
+
+class BoundedJSONEncoder:
+    """
+    限长 JSON 编码器
+    边序列化边计算长度，超过 max_length 后立即停止，不会完整序列化大对象；
+    元素数量超过 max_items 的列表及字典只保留前 max_items 个元素，并追加摘要，如 "... list[10000]"
+    """
+
+    def __init__(self, max_length: int, max_items: int = 100, max_depth: int = 32, default: Callable = json_default):
+        """
+        :param max_length: 最大长度
+        :param max_items: 列表及字典最多保留的元素数量
+        :param max_depth: 最大嵌套层数，超过后使用摘要代替
+        :param default: 无法直接序列化的对象的处理方法，抛出 TypeError 时使用 str(obj)
+        """
+        self.max_length = max_length
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self.default = default
+
+    def encode(self, data: any) -> Tuple[str, bool]:
+        """
+        返回 (JSON 字符串, 是否被截断)
+        """
+        chunks = []
+        length = 0
+        for chunk in self._iter_encode(data, 0):
+            chunks.append(chunk)
+            length += len(chunk)
+            if length > self.max_length:
+                return "".join(chunks)[: self.max_length], True
+        return "".join(chunks), False
+
+    def _encode_str(self, data: str) -> str:
+        # 超长字符串只序列化需要的部分
+        if len(data) > self.max_length:
+            data = data[: self.max_length]
+        return json.dumps(data, ensure_ascii=False)
+
+    def _iter_encode(self, data: any, depth: int) -> Iterator[str]:
+        if isinstance(data, str):
+            yield self._encode_str(data)
+        elif data is None or isinstance(data, (bool, int, float)):
+            yield json.dumps(data)
+        elif isinstance(data, dict):
+            if depth >= self.max_depth:
+                yield '"dict[%d]"' % len(data)
+                return
+            yield "{"
+            for index, (key, value) in enumerate(data.items()):
+                if index:
+                    yield ", "
+                if index >= self.max_items:
+                    yield '"...": "dict[%d]"' % len(data)
+                    break
+                yield self._encode_str(key if isinstance(key, str) else str(key))
+                yield ": "
+                yield from self._iter_encode(value, depth + 1)
+            yield "}"
+        elif isinstance(data, (list, tuple)):
+            if depth >= self.max_depth:
+                yield '"list[%d]"' % len(data)
+                return
+            yield "["
+            for index, value in enumerate(data):
+                if index:
+                    yield ", "
+                if index >= self.max_items:
+                    yield '"... list[%d]"' % len(data)
+                    break
+                yield from self._iter_encode(value, depth + 1)
+            yield "]"
+        else:
+            try:
+                if depth >= self.max_depth:
+                    raise TypeError
+                value = self.default(data)
+            except TypeError:
+                yield self._encode_str(str(data))
+                return
+            yield from self._iter_encode(value, depth + 1)
+
+
+def bounded_json_dumps(data: any, max_length: int, max_items: int = 100) -> Tuple[str, bool]:
+    """
+    限长序列化，返回 (JSON 字符串, 是否被截断)
+    """
+    return BoundedJSONEncoder(max_length, max_items=max_items).encode(data)
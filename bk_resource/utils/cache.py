@@ -30,7 +30,9 @@ from bk_resource.settings import bk_resource_settings
 from bk_resource.utils.common_utils import count_md5
 from bk_resource.utils.local import local
 from bk_resource.utils.logger import logger
-from bk_resource.utils.request import get_request_username
+from bk_resource.utils.process import ProcessRole, get_process_role
+from bk_resource.utils.profiler import tag_profile_node
+from bk_resource.utils.request import get_local_username, get_request_username
 
 try:
     mem_cache = caches["locmem"]
@@ -74,21 +76,32 @@ class UsingCache(object):
         else:
             self.user_related = True
 
-        self.using_cache_type = self._get_using_cache_type()
+        # 校验缓存类型，实际使用的缓存类型与调用时的用户相关，在每次调用时获取
+        self._get_using_cache_type()
         self.local_cache_enable = bool(bk_resource_settings.LOCAL_CACHE_ENABLE)
 
     def _get_username(self):
         username = "backend"
         if self.user_related:
             try:
-                username = get_request_username()
+                # 非 web 进程中不存在 request，直接从 local 获取
+                if get_process_role() in (ProcessRole.CELERY, ProcessRole.MANAGEMENT):
+                    username = get_local_username() or ""
+                else:
+                    username = get_request_username()
             except Exception:
                 username = "backend"
         return username
 
-    def _get_using_cache_type(self):
+    @property
+    def using_cache_type(self):
+        return self._get_using_cache_type()
+
+    def _get_using_cache_type(self, username=None):
+        if username is None:
+            username = self._get_username()
         using_cache_type = self.cache_type
-        if self._get_username() == "backend":
+        if username == "backend":
             using_cache_type = self.backend_cache_type or self.cache_type
         if using_cache_type:
             if not isinstance(using_cache_type, CacheTypeItem):
@@ -97,14 +110,16 @@ class UsingCache(object):
 
     def _cache_key(self, task_definition, args, kwargs):
         # 新增根据用户openid设置缓存key
-        if self.using_cache_type:
+        username = self._get_username()
+        using_cache_type = self._get_using_cache_type(username)
+        if using_cache_type:
             return "{}:{}:{}:{},{}[{}]".format(
                 self.key_prefix,
-                self.using_cache_type.key,
+                using_cache_type.key,
                 self.func_key_generator(task_definition),
                 count_md5(args),
                 count_md5(kwargs),
-                self._get_username(),
+                username,
             )
         return None
 
@@ -179,6 +194,7 @@ class UsingCache(object):
         cache_key = self._cache_key(task_definition, args, kwargs)
         if cache_key:
             return_value = self.get_value(cache_key)
+            tag_profile_node("cache", "miss" if return_value is None else "hit")
 
             if return_value is None:
                 return_value = self._refresh(task_definition, args, kwargs)
@@ -21,11 +21,11 @@ import datetime
 import decimal
 import hashlib
 import json
+import math
 import os
 import pkgutil
 import re
 import socket
-import sys
 import traceback
 import uuid
 from collections import OrderedDict, defaultdict
@@ -40,6 +40,7 @@ from django.utils.timezone import is_aware
 
 from bk_resource.utils import time_tools
 from bk_resource.utils.logger import logger
+from bk_resource.utils.process import ProcessRole, get_process_role
 
 IDS_REGEX = re.compile(r"^\d+(,\d+)*$")
 
@@ -307,6 +308,14 @@ def get_local_ip():
         return "127.0.0.1"
 
 
+def percentile(values, percent):
+    """
+    最近秩法计算百分位数，values 需已升序排列
+    """
+    index = max(math.ceil(len(values) * percent / 100) - 1, 0)
+    return values[index]
+
+
 def number_format(v):
     try:
         # 字符型转为数值型 其他保持不变
@@ -477,20 +486,8 @@ def replce_special_val(s, replace_dict):
     return s
 
 
-def is_backend():
-    basename = os.path.basename(sys.argv[0])
-
-    # 非web请求
-    if any(
-        [
-            "manage.py" == basename and "runserver" not in sys.argv and "runsslserver" not in sys.argv,
-            "celery" in sys.argv,
-            "test" in sys.argv,
-            "migrate" in sys.argv,
-            basename in ["django_test_manage.py", "pydevconsole.py"],
-            basename.find("pytest") != -1,
-        ]
-    ):
-        return True
-
-    return False
+def is_backend() -> bool:
+    """
+    是否为非 web 进程（celery、管理命令、测试）
+    """
+    return get_process_role() != ProcessRole.WEB
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import gzip
+import zlib
+
+from urllib3.response import HTTPResponse
+
+from bk_resource.utils.logger import logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class ContentEncoding:
+    GZIP = "gzip"
+    DEFLATE = "deflate"
+    ZSTD = "zstd"
+
+
+def is_compress_supported(encoding: str) -> bool:
+    """
+    是否支持该方式压缩请求体
+    """
+    if encoding == ContentEncoding.ZSTD:
+        return zstandard is not None
+    return encoding in (ContentEncoding.GZIP, ContentEncoding.DEFLATE)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """
+    压缩数据
+    """
+    if encoding == ContentEncoding.GZIP:
+        return gzip.compress(data)
+    if encoding == ContentEncoding.DEFLATE:
+        return zlib.compress(data)
+    if encoding == ContentEncoding.ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor().compress(data)
+    raise ValueError("unsupported content encoding: %s" % encoding)
+
+
+def build_accept_encoding(encodings: str) -> str:
+    """
+    构造 Accept-Encoding，移除当前环境无法解压的编码
+    """
+    accepted = []
+    for encoding in encodings.split(","):
+        encoding = encoding.strip()
+        if not encoding:
+            continue
+        if encoding.split(";")[0].strip() not in HTTPResponse.CONTENT_DECODERS + ["identity", "*"]:
+            logger.warning("[Compress] unsupported response encoding: %s, ignored", encoding)
+            continue
+        accepted.append(encoding)
+    return ", ".join(accepted) or "identity"
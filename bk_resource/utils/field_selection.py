@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Union
+
+from django.db import models
+from rest_framework import serializers
+
+from bk_resource.settings import bk_resource_settings
+
+
+def parse_field_names(value: Union[str, Iterable[str], None]) -> List[str]:
+    """
+    解析字段列表，支持逗号分隔的字符串及列表，如 "id,name" 或 ["id", "name"]
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    names = []
+    for item in value:
+        names.extend(name.strip() for name in str(item).split(",") if name.strip())
+    return names
+
+
+class FieldSelection:
+    """
+    返回字段的选择，仅作用于顶层字段
+    fields 为空时返回全部字段，exclude 中的字段始终不返回
+    """
+
+    __slots__ = ("fields", "exclude")
+
+    def __init__(self, fields: Iterable[str] = None, exclude: Iterable[str] = None):
+        self.fields = frozenset(parse_field_names(fields)) or None
+        self.exclude = frozenset(parse_field_names(exclude))
+
+    @classmethod
+    def from_request(cls, request, reserved: Iterable[str] = ()) -> Optional["FieldSelection"]:
+        """
+        从查询参数中解析，参数名通过 FIELDS_PARAM / EXCLUDE_PARAM 配置，未选择时返回 None
+        :param reserved: Resource 自身使用的参数名，与之同名的参数不作为字段选择
+        """
+        query_params = getattr(request, "query_params", request.GET)
+        params = []
+        for param in (bk_resource_settings.FIELDS_PARAM, bk_resource_settings.EXCLUDE_PARAM):
+            params.append(query_params.getlist(param) if param and param not in reserved else None)
+        selection = cls(*params)
+        return selection or None
+
+    def __bool__(self) -> bool:
+        return self.fields is not None or bool(self.exclude)
+
+    def __repr__(self) -> str:
+        return "FieldSelection(fields={}, exclude={})".format(
+            sorted(self.fields) if self.fields is not None else None, sorted(self.exclude)
+        )
+
+    def includes(self, name: str) -> bool:
+        if name in self.exclude:
+            return False
+        return self.fields is None or name in self.fields
+
+    def filter_names(self, names: Iterable[str]) -> List[str]:
+        return [name for name in names if self.includes(name)]
+
+    def prune_serializer(self, serializer: serializers.BaseSerializer) -> serializers.BaseSerializer:
+        """
+        移除序列化器实例中未选择的字段，字段在实例中独立维护，不影响序列化器类
+        """
+        target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+        if not isinstance(target, serializers.Serializer):
+            return serializer
+        fields = target.fields
+        for name in list(fields.keys()):
+            if not self.includes(name):
+                fields.pop(name)
+        return serializer
+
+    def apply(self, data: any) -> any:
+        """
+        过滤字典或字典列表中未选择的字段，生成器逐条处理
+        """
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if self.includes(key)}
+        if isinstance(data, (list, tuple)):
+            return [self.apply(item) for item in data]
+        if isinstance(data, Iterator):
+            return (self.apply(item) for item in data)
+        return data
+
+    def apply_queryset(self, queryset: models.QuerySet) -> models.QuerySet:
+        """
+        只查询选择的模型字段，主键始终查询；选择了非模型字段（如关联或计算字段）时仍会按需查询
+        """
+        opts = queryset.model._meta
+        if self.fields is not None:
+            names = {field.attname for field in opts.concrete_fields if self._matches(field, self.fields)}
+            names.add(opts.pk.attname)
+            return queryset.only(*names)
+        deferred = [
+            field.attname
+            for field in opts.concrete_fields
+            if not field.primary_key and self._matches(field, self.exclude)
+        ]
+        return queryset.defer(*deferred) if deferred else queryset
+
+    @staticmethod
+    def _matches(field: models.Field, names: Iterable[str]) -> bool:
+        return field.name in names or field.attname in names
@@ -16,6 +16,10 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import copy
+from collections.abc import Mapping
+from typing import Callable
+
 from drf_yasg.inspectors import SwaggerAutoSchema
 
 
@@ -24,3 +28,37 @@ class BkResourceSwaggerAutoSchema(SwaggerAutoSchema):
         if "enable_paginator" not in self.overrides.keys():
             return super().should_page()
         return self.overrides["enable_paginator"]
+
+
+class LazySwaggerOverrides(Mapping):
+    """
+    延迟生成的 swagger_auto_schema 参数，作为视图方法的 _swagger_auto_schema 属性
+    首次生成文档时才实例化序列化器，避免加载 URLConf 时的开销
+    """
+
+    def __init__(self, factory: Callable[[], dict]):
+        self._factory = factory
+        self._data = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = self._factory()
+        return self._data
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __deepcopy__(self, memo):
+        # drf_yasg 获取参数时会深拷贝，返回普通的 dict
+        return copy.deepcopy(self.data, memo)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+from typing import Callable, Union
+
+from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.common_utils import DatetimeEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+_datetime_encoder = DatetimeEncoder()
+
+
+def json_default(obj: any) -> any:
+    """
+    与 DatetimeEncoder 一致的默认序列化方法，无法序列化时抛出 TypeError
+    """
+    return _datetime_encoder.default(obj)
+
+
+class BaseJSONBackend:
+    """
+    JSON 序列化后端
+    通过 BK_RESOURCE["JSON_BACKEND"] 配置，dumps 统一返回紧凑格式（无多余空格）的 str，默认不转义非 ASCII 字符
+    """
+
+    @classmethod
+    def dumps(cls, data: any, default: Callable = json_default, ensure_ascii: bool = False) -> str:
+        raise NotImplementedError
+
+    @classmethod
+    def loads(cls, data: Union[str, bytes, bytearray]) -> any:
+        raise NotImplementedError
+
+
+class StdlibJSONBackend(BaseJSONBackend):
+    # 与 DRF 的 COMPACT_JSON 一致，不输出多余空格
+    SEPARATORS = (",", ":")
+
+    @classmethod
+    def dumps(cls, data: any, default: Callable = json_default, ensure_ascii: bool = False) -> str:
+        return json.dumps(data, ensure_ascii=ensure_ascii, default=default, separators=cls.SEPARATORS)
+
+    @classmethod
+    def loads(cls, data: Union[str, bytes, bytearray]) -> any:
+        return json.loads(data)
+
+
+class OrjsonJSONBackend(BaseJSONBackend):
+    """
+    orjson 不支持的数据（如超过 64 位的整数）及 ensure_ascii 回退到标准库
+    datetime 等类型交由 default 处理，与标准库后端结果保持一致
+    """
+
+    @classmethod
+    def dumps(cls, data: any, default: Callable = json_default, ensure_ascii: bool = False) -> str:
+        if ensure_ascii:
+            return StdlibJSONBackend.dumps(data, default=default, ensure_ascii=ensure_ascii)
+        try:
+            return orjson.dumps(
+                data,
+                default=default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            ).decode()
+        except TypeError:
+            return StdlibJSONBackend.dumps(data, default=default, ensure_ascii=ensure_ascii)
+
+    @classmethod
+    def loads(cls, data: Union[str, bytes, bytearray]) -> any:
+        return orjson.loads(data)
+
+
+class UjsonJSONBackend(BaseJSONBackend):
+    """
+    ujson 原生支持 Decimal，会序列化为数字而不是字符串
+    """
+
+    @classmethod
+    def dumps(cls, data: any, default: Callable = json_default, ensure_ascii: bool = False) -> str:
+        try:
+            return ujson.dumps(data, ensure_ascii=ensure_ascii, escape_forward_slashes=False, default=default)
+        except (TypeError, OverflowError):
+            return StdlibJSONBackend.dumps(data, default=default, ensure_ascii=ensure_ascii)
+
+    @classmethod
+    def loads(cls, data: Union[str, bytes, bytearray]) -> any:
+        return ujson.loads(data)
+
+
+def get_json_backend() -> BaseJSONBackend:
+    """
+    获取当前配置的 JSON 后端，依赖未安装时回退到标准库
+    """
+    backend = bk_resource_settings.JSON_BACKEND
+    if (backend is OrjsonJSONBackend and orjson is None) or (backend is UjsonJSONBackend and ujson is None):
+        return StdlibJSONBackend
+    return backend
+
+
+def json_dumps(data: any, default: Callable = json_default, ensure_ascii: bool = False) -> str:
+    return get_json_backend().dumps(data, default=default, ensure_ascii=ensure_ascii)
+
+
+def json_loads(data: Union[str, bytes, bytearray]) -> any:
+    return get_json_backend().loads(data)
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+from bk_resource.utils.common_utils import percentile
+from bk_resource.utils.stub_gateway import StubGateway
+from bk_resource.utils.thread_backend import ThreadPool
+
+
+class LoadTestMode:
+    # 每个线程循环调用 resource(**request_data)
+    SYNC = "sync"
+    # 每个线程循环调用 resource.bulk_request，每次 bulk_size 个请求
+    BULK = "bulk"
+
+    CHOICES = (SYNC, BULK)
+
+
+def bind_base_url(resource_class: type, base_url: str) -> type:
+    """
+    生成请求指定地址的子类，用于将 APIResource 指向本地模拟网关
+    """
+    return type(
+        resource_class.__name__,
+        (resource_class,),
+        {"base_url": base_url, "__module__": resource_class.__module__},
+    )
+
+
+class LoadTestRunner:
+    """
+    并发压测 APIResource，统计吞吐量、耗时分布及连接复用情况
+
+    >>> with StubGateway(latency="normal:20,5") as gateway:
+    ...     resource = bind_base_url(SearchHostResource, gateway.url)()
+    ...     LoadTestRunner(resource, {"bk_biz_id": 2}, concurrency=20, total=2000, gateway=gateway).run()
+    """
+
+    def __init__(
+        self,
+        resource,
+        request_data: dict = None,
+        mode: str = LoadTestMode.SYNC,
+        concurrency: int = 10,
+        total: int = 1000,
+        duration: float = None,
+        bulk_size: int = 10,
+        gateway: StubGateway = None,
+    ):
+        """
+        :param resource: Resource 实例，在各线程间共享
+        :param concurrency: 并发线程数
+        :param total: 请求总数，BULK 模式下按 bulk_size 计算
+        :param duration: 压测时长（s），设置后忽略 total
+        :param gateway: 模拟网关，用于统计连接复用情况
+        """
+        if mode not in LoadTestMode.CHOICES:
+            raise ValueError("unsupported load test mode: %s" % mode)
+        self.resource = resource
+        self.request_data = request_data or {}
+        self.mode = mode
+        self.concurrency = concurrency
+        self.total = total
+        self.duration = duration
+        self.bulk_size = bulk_size if mode == LoadTestMode.BULK else 1
+        self.gateway = gateway
+
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._deadline = None
+        self._latencies: List[float] = []
+        self._requests = 0
+        self._errors = 0
+
+    def _acquire(self) -> bool:
+        """
+        获取一次调用的配额
+        """
+        if self._deadline is not None:
+            return time.perf_counter() < self._deadline
+        with self._lock:
+            if self._issued >= self.total:
+                return False
+            self._issued += self.bulk_size
+            return True
+
+    def _call(self) -> int:
+        """
+        执行一次调用，返回失败的请求数
+        """
+        if self.mode == LoadTestMode.BULK:
+            results = self.resource.bulk_request([self.request_data] * self.bulk_size, ignore_exceptions=True)
+            return sum(1 for result in results if result is None)
+        self.resource(**self.request_data)
+        return 0
+
+    def _worker(self) -> None:
+        latencies = []
+        requests = errors = 0
+        while self._acquire():
+            start = time.perf_counter()
+            try:
+                errors += self._call()
+            except Exception:
+                errors += self.bulk_size
+            latencies.append((time.perf_counter() - start) * 1000)
+            requests += self.bulk_size
+        with self._lock:
+            self._latencies.extend(latencies)
+            self._requests += requests
+            self._errors += errors
+
+    def run(self) -> dict:
+        if self.gateway is not None:
+            self.gateway.reset_stats()
+        start = time.perf_counter()
+        if self.duration:
+            self._deadline = start + self.duration
+        with ThreadPool(processes=self.concurrency) as pool:
+            futures = [pool.apply_async(self._worker) for _ in range(self.concurrency)]
+            for future in futures:
+                future.get()
+        return self.summary(time.perf_counter() - start)
+
+    def summary(self, elapsed: float) -> dict:
+        """
+        :return: 请求数、失败数、吞吐量（请求/s）、单次调用耗时分布（ms）及连接复用情况
+        """
+        latencies = sorted(self._latencies)
+        result = {
+            "mode": self.mode,
+            "concurrency": self.concurrency,
+            "requests": self._requests,
+            "errors": self._errors,
+            "duration": round(elapsed, 3),
+            "throughput": round(self._requests / elapsed, 1) if elapsed else 0,
+            "latency": {
+                "avg": round(sum(latencies) / len(latencies), 3) if latencies else 0,
+                "p50": round(percentile(latencies, 50), 3) if latencies else 0,
+                "p90": round(percentile(latencies, 90), 3) if latencies else 0,
+                "p99": round(percentile(latencies, 99), 3) if latencies else 0,
+                "max": round(latencies[-1], 3) if latencies else 0,
+            },
+        }
+        result["connections"] = self._connection_stats()
+        return result
+
+    def _connection_stats(self) -> Optional[dict]:
+        if self.gateway is None:
+            return None
+        stats = self.gateway.stats()
+        reuse_rate = 1 - stats["connections"] / stats["requests"] if stats["requests"] else 0
+        return {
+            "connections": stats["connections"],
+            "gateway_requests": stats["requests"],
+            "reuse_rate": round(max(reuse_rate, 0), 3),
+        }
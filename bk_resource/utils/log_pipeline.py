@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.logger import logger
+
+_STOP = object()
+
+
+class OverflowPolicy:
+    # 队列已满时丢弃新记录
+    DROP = "drop"
+    # 队列积压超过阈值后按比例采样，已满时丢弃
+    SAMPLE = "sample"
+
+
+class RequestLogPipeline:
+    """
+    异步请求日志管道
+    日志记录放入有界队列后立即返回，由后台线程按批次处理，处理方式由记录所属的 Handler 的 emit_batch 决定，
+    emit_batch 返回处理失败的记录数，抛出异常时整批视为失败
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        overflow_policy: str = OverflowPolicy.DROP,
+        sample_rate: float = 0.1,
+        sample_threshold: float = 0.8,
+    ):
+        """
+        :param max_size: 队列最大长度
+        :param batch_size: 单批次最大记录数
+        :param flush_interval: 凑满批次的最长等待时间，单位：s
+        :param overflow_policy: 积压处理策略
+        :param sample_rate: SAMPLE 策略下积压时的保留比例
+        :param sample_threshold: SAMPLE 策略下开始采样的队列占用比例
+        """
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.sample_threshold = sample_threshold
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_size)
+        self._thread = None
+        self._pid = None
+        self._metrics = defaultdict(int)
+
+    def put(self, record: any) -> bool:
+        """
+        放入一条记录，被丢弃时返回 False
+        """
+        self._ensure_started()
+        if (
+            self.overflow_policy == OverflowPolicy.SAMPLE
+            and self._queue.qsize() >= self.max_size * self.sample_threshold
+            and random.random() >= self.sample_rate
+        ):
+            self._incr("sampled_out")
+            return False
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._incr("dropped")
+            return False
+        self._incr("enqueued")
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        等待队列中的记录处理完成，超时返回 False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        处理完剩余记录后停止后台线程
+        """
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP, timeout=timeout)
+        thread.join(timeout)
+
+    def metrics(self) -> Dict[str, int]:
+        """
+        运行指标：enqueued 入队数、dropped 丢弃数、sampled_out 采样丢弃数、processed 处理数、failed 处理失败数、
+        batches 批次数、queue_size 当前积压数
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["queue_size"] = self._queue.qsize()
+        return metrics
+
+    def _incr(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self._metrics[key] += value
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 后父进程的队列及线程不可用，重新初始化
+                self._queue = queue.Queue(maxsize=self.max_size)
+                self._metrics = defaultdict(int)
+                self._pid = os.getpid()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="bk-resource-request-log", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self) -> List[any]:
+        batch = [self._queue.get()]
+        if batch[0] is _STOP:
+            return batch
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                record = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(record)
+            if record is _STOP:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            stopped = batch[-1] is _STOP
+            records = batch[:-1] if stopped else batch
+            try:
+                self._process(records)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stopped:
+                return
+
+    def _process(self, records: List[any]) -> None:
+        if not records:
+            return
+        # 按 Handler 分组批量处理
+        groups = defaultdict(list)
+        for record in records:
+            groups[type(record)].append(record)
+        for handler_class, handler_records in groups.items():
+            try:
+                # emit_batch 逐条处理异常，返回失败的数量
+                failed = handler_class.emit_batch(handler_records) or 0
+                self._incr("processed", len(handler_records) - failed)
+                self._incr("failed", failed)
+            except Exception as err:
+                logger.exception("[RequestLogPipeline] emit failed: %s", err)
+                self._incr("failed", len(handler_records))
+        self._incr("batches")
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_request_log_pipeline() -> RequestLogPipeline:
+    """
+    获取进程内的请求日志管道
+    """
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = RequestLogPipeline(
+                    max_size=bk_resource_settings.REQUEST_LOG_QUEUE_SIZE,
+                    batch_size=bk_resource_settings.REQUEST_LOG_BATCH_SIZE,
+                    flush_interval=bk_resource_settings.REQUEST_LOG_FLUSH_INTERVAL,
+                    overflow_policy=bk_resource_settings.REQUEST_LOG_OVERFLOW_POLICY,
+                    sample_rate=bk_resource_settings.REQUEST_LOG_OVERFLOW_SAMPLE_RATE,
+                )
+                atexit.register(_pipeline.flush, timeout=5)
+    return _pipeline
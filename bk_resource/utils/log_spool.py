@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+
+from bk_resource.utils.common_utils import percentile
+from bk_resource.utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class RotatingSpoolWriter:
+    """
+    按大小轮转的本地日志文件，每行一条记录，供采集程序读取
+    写入时只 flush 到系统缓冲区，配置 fsync_interval 后距离上次 fsync 超过该间隔时才执行 fsync
+    多个进程写入同一路径时，写入及轮转通过 {path}.lock 文件锁互斥，轮转后其他进程会重新打开文件
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int = 100 * 1024 * 1024, backup_count: int = 5, fsync_interval: float = None
+    ):
+        """
+        :param path: 文件路径
+        :param max_bytes: 单个文件最大字节数，超过后轮转
+        :param backup_count: 保留的历史文件数量，历史文件命名为 {path}.1 ~ {path}.{backup_count}
+        :param fsync_interval: fsync 的最小间隔，单位：s，为 None 时不主动 fsync，为 0 时每次写入均 fsync
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._lock_file = None
+        self._last_fsync = 0
+
+    def write_lines(self, lines: List[str]) -> None:
+        """
+        写入多行，一次写入、一次 flush
+        """
+        if not lines:
+            return
+        data = "".join(line + "\n" for line in lines).encode()
+        with self._lock, self._process_lock():
+            self._open()
+            # 文件可能被其他进程写入或轮转，以文件的实际大小为准
+            size = os.fstat(self._file.fileno()).st_size
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync_interval is not None:
+                now = time.monotonic()
+                if now - self._last_fsync >= self.fsync_interval:
+                    os.fsync(self._file.fileno())
+                    self._last_fsync = now
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                if self.fsync_interval is not None:
+                    os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    @contextmanager
+    def _process_lock(self):
+        """
+        进程间互斥，不支持 fcntl 的平台上只保证进程内互斥
+        """
+        if fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self._makedirs()
+            self._lock_file = open(self.path + ".lock", "ab")
+        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _makedirs(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _open(self) -> None:
+        if self._file is not None:
+            # 文件已被其他进程轮转时重新打开
+            try:
+                rotated = not os.path.samestat(os.fstat(self._file.fileno()), os.stat(self.path))
+            except FileNotFoundError:
+                rotated = True
+            if not rotated:
+                return
+            self._file.close()
+            self._file = None
+        self._makedirs()
+        self._file = open(self.path, "ab")
+
+    def _rotate(self) -> None:
+        self._file.flush()
+        if self.fsync_interval is not None:
+            os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = "{}.{}".format(self.path, index)
+                if os.path.exists(source):
+                    os.replace(source, "{}.{}".format(self.path, index + 1))
+            os.replace(self.path, "{}.1".format(self.path))
+        else:
+            os.remove(self.path)
+        self._open()
+
+
+_writers: Dict[tuple, RotatingSpoolWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_spool_writer(
+    path: str, max_bytes: int = 100 * 1024 * 1024, backup_count: int = 5, fsync_interval: float = None
+) -> RotatingSpoolWriter:
+    """
+    获取当前进程的文件写入器，路径中的 {pid} 会被替换为进程号
+    """
+    pid = os.getpid()
+    key = (path, pid)
+    writer = _writers.get(key)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None:
+                writer = RotatingSpoolWriter(
+                    path.format(pid=pid), max_bytes=max_bytes, backup_count=backup_count, fsync_interval=fsync_interval
+                )
+                _writers[key] = writer
+    return writer
+
+
+def list_spool_files(path: str) -> List[str]:
+    """
+    列出日志文件及其历史文件，按时间从旧到新排列，path 支持通配符
+    """
+    files = []
+    for current in sorted(glob.glob(path)) if glob.has_magic(path) else [path]:
+        backups = []
+        for backup in glob.glob(glob.escape(current) + ".*"):
+            suffix = backup[len(current) + 1 :]
+            if suffix.isdigit():
+                backups.append((int(suffix), backup))
+        files.extend(backup for _, backup in sorted(backups, reverse=True))
+        if os.path.exists(current):
+            files.append(current)
+    return files
+
+
+def iter_spool_records(path: str, include_rotated: bool = True) -> Iterator[dict]:
+    """
+    逐条读取日志记录，跳过不完整或格式错误的行
+    :param path: 文件路径，支持通配符
+    :param include_rotated: 是否包含轮转的历史文件
+    """
+    files = list_spool_files(path) if include_rotated else sorted(glob.glob(path))
+    for file_path in files:
+        with open(file_path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning("[LogSpool] invalid line in %s: %s", file_path, line[:100])
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+
+def summarize_request_logs(records: Iterable[dict]) -> Dict[str, dict]:
+    """
+    按 Resource 统计调用次数、失败次数及耗时分布（ms）
+    """
+    durations = defaultdict(list)
+    failed = defaultdict(int)
+    for record in records:
+        resource_name = record.get("resource", "")
+        durations[resource_name].append(float(record.get("duration_ms") or 0))
+        if record.get("status") == "failed":
+            failed[resource_name] += 1
+
+    summary = {}
+    for resource_name, values in durations.items():
+        values.sort()
+        summary[resource_name] = {
+            "count": len(values),
+            "failed": failed[resource_name],
+            "avg": round(sum(values) / len(values), 3),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": values[-1],
+        }
+    return summary
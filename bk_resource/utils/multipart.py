@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import mimetypes
+import os
+import uuid
+from typing import Callable, Iterator, Optional
+
+from requests.utils import super_len
+
+CRLF = b"\r\n"
+
+# 参数名及文件名中需要转义的字符，与浏览器提交表单时的处理一致
+HEADER_PARAM_ESCAPES = {ord('"'): "%22", ord("\r"): "%0D", ord("\n"): "%0A"}
+
+
+class MultipartEncoder:
+    """
+    流式 multipart/form-data 编码器
+    实现 read 接口，由 requests 按块读取请求体，文件内容在发送时才读取，不会整体加载到内存中
+    文件大小均可获取时设置 Content-Length，否则使用 chunked 传输
+    """
+
+    def __init__(
+        self,
+        fields: dict,
+        files: dict,
+        boundary: str = None,
+        chunk_size: int = 64 * 1024,
+        callback: Callable[[int, Optional[int]], None] = None,
+    ):
+        """
+        :param fields: 非文件参数
+        :param files: 文件参数，值为含有 read 方法的对象
+        :param boundary: 分隔符，默认随机生成
+        :param chunk_size: 读取文件时每次读取的字节数
+        :param callback: 进度回调，参数为已读取字节数及总字节数（未知时为 None）
+        """
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.bytes_read = 0
+        self._parts = self._build_parts(fields, files)
+        self._length = self._compute_length()
+        self._iterator = self._iter_parts()
+        self._buffer = bytearray()
+
+    @property
+    def content_type(self) -> str:
+        return "multipart/form-data; boundary={}".format(self.boundary)
+
+    @property
+    def len(self) -> Optional[int]:
+        """
+        请求体总长度，由 requests.utils.super_len 读取，为 None 时使用 chunked 传输
+        """
+        return self._length
+
+    def _build_parts(self, fields: dict, files: dict) -> list:
+        """
+        构造 (头部, 内容) 列表，内容为 bytes 或文件对象
+        """
+        parts = []
+        for name, values in fields.items():
+            if not isinstance(values, (list, tuple)):
+                values = [values]
+            for value in values:
+                if value is None:
+                    continue
+                if not isinstance(value, bytes):
+                    value = str(value).encode()
+                header = 'Content-Disposition: form-data; name="{}"'.format(self._escape(name))
+                parts.append((self._build_header(header), value))
+        for name, file in files.items():
+            filename = os.path.basename(getattr(file, "name", None) or name)
+            content_type = (
+                getattr(file, "content_type", None) or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            )
+            header = 'Content-Disposition: form-data; name="{}"; filename="{}"\r\nContent-Type: {}'.format(
+                self._escape(name), self._escape(filename), content_type.replace("\r", "").replace("\n", "")
+            )
+            parts.append((self._build_header(header), file))
+        return parts
+
+    @staticmethod
+    def _escape(value) -> str:
+        """
+        转义头部参数中的引号及换行，避免注入额外的头部或参数
+        """
+        return str(value).translate(HEADER_PARAM_ESCAPES)
+
+    def _build_header(self, header: str) -> bytes:
+        return b"--" + self.boundary.encode() + CRLF + header.encode() + CRLF + CRLF
+
+    @property
+    def _closing(self) -> bytes:
+        return b"--" + self.boundary.encode() + b"--" + CRLF
+
+    @staticmethod
+    def _file_length(file) -> Optional[int]:
+        """
+        获取文件剩余长度，无法获取时返回 None
+        """
+        if not any(hasattr(file, attr) for attr in ("__len__", "len", "fileno", "tell")):
+            return None
+        try:
+            return super_len(file)
+        except Exception:
+            return None
+
+    def _compute_length(self) -> Optional[int]:
+        length = len(self._closing)
+        for header, content in self._parts:
+            content_length = len(content) if isinstance(content, bytes) else self._file_length(content)
+            if content_length is None:
+                return None
+            length += len(header) + content_length + len(CRLF)
+        return length
+
+    def _iter_parts(self) -> Iterator[bytes]:
+        for header, content in self._parts:
+            yield header
+            if isinstance(content, bytes):
+                yield content
+            else:
+                while True:
+                    chunk = content.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk.encode() if isinstance(chunk, str) else chunk
+            yield CRLF
+        yield self._closing
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._iterator, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self.bytes_read += len(data)
+        if self.callback is not None and data:
+            self.callback(self.bytes_read, self._length)
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            data = self.read(self.chunk_size)
+            if not data:
+                return
+            yield data
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import hashlib
+import json
+import os
+from typing import Optional, Tuple
+
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+from bk_resource.settings import bk_resource_settings
+
+MANIFEST_FILENAME = "openapi.manifest.json"
+SCHEMA_FILENAME = "openapi.{hash}.{format}"
+
+# 预生成文件的缓存，{目录: (清单修改时间, {格式: (内容, 哈希)})}
+_prebuilt_schemas = {}
+
+
+class OpenAPISchemaFormat:
+    JSON = "json"
+    YAML = "yaml"
+
+    CHOICES = (JSON, YAML)
+    CONTENT_TYPES = {
+        JSON: "application/json",
+        YAML: "application/yaml",
+    }
+    CODECS = {
+        JSON: OpenAPICodecJson,
+        YAML: OpenAPICodecYaml,
+    }
+
+
+def get_schema_info() -> openapi.Info:
+    """
+    文档信息，优先使用 BK_RESOURCE["OPENAPI_SCHEMA_INFO"]，其次为 SWAGGER_SETTINGS["DEFAULT_INFO"]
+    """
+    info = bk_resource_settings.OPENAPI_SCHEMA_INFO or swagger_settings.DEFAULT_INFO
+    if info is None:
+        info = openapi.Info(title=settings.APP_CODE, default_version="v1")
+    return info
+
+
+def generate_schema(request=None, url: str = None) -> openapi.Swagger:
+    """
+    实时生成文档，包含所有接口，与请求用户的权限无关
+    """
+    generator_class = bk_resource_settings.OPENAPI_SCHEMA_GENERATOR_CLASS
+    generator = generator_class(get_schema_info(), url=url or bk_resource_settings.OPENAPI_SCHEMA_URL)
+    return generator.get_schema(request=request, public=True)
+
+
+def encode_schema(schema: openapi.Swagger, schema_format: str = OpenAPISchemaFormat.JSON) -> bytes:
+    codec = OpenAPISchemaFormat.CODECS[schema_format](validators=[])
+    return codec.encode(schema)
+
+
+def _write_file(path: str, content: bytes) -> None:
+    """
+    先写入临时文件再替换，避免读取到未写完的文件
+    """
+    temp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(temp_path, "wb") as file:
+        file.write(content)
+    os.replace(temp_path, path)
+
+
+def build_schema_files(directory: str, url: str = None) -> dict:
+    """
+    生成 JSON 及 YAML 格式的文档文件，文件名包含内容哈希，最后写入清单文件
+    :return: 清单内容，{"hash": "...", "files": {"json": "openapi.xxx.json", "yaml": "openapi.xxx.yaml"}}
+    """
+    schema = generate_schema(url=url)
+    contents = {schema_format: encode_schema(schema, schema_format) for schema_format in OpenAPISchemaFormat.CHOICES}
+    schema_hash = hashlib.sha256(contents[OpenAPISchemaFormat.JSON]).hexdigest()[:16]
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"hash": schema_hash, "files": {}}
+    for schema_format, content in contents.items():
+        filename = SCHEMA_FILENAME.format(hash=schema_hash, format=schema_format)
+        _write_file(os.path.join(directory, filename), content)
+        manifest["files"][schema_format] = filename
+    _write_file(os.path.join(directory, MANIFEST_FILENAME), json.dumps(manifest, indent=2).encode())
+    return manifest
+
+
+def load_prebuilt_schema(
+    schema_format: str = OpenAPISchemaFormat.JSON, directory: str = None
+) -> Optional[Tuple[bytes, str]]:
+    """
+    读取预生成的文档，返回 (内容, 哈希)，未生成时返回 None
+    文件内容缓存在内存中，清单文件更新后重新读取
+    """
+    directory = directory or bk_resource_settings.OPENAPI_SCHEMA_DIR
+    if not directory:
+        return None
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    try:
+        mtime = os.stat(manifest_path).st_mtime
+    except OSError:
+        return None
+
+    cached_mtime, schemas = _prebuilt_schemas.get(directory, (None, {}))
+    if cached_mtime != mtime:
+        schemas = {}
+        _prebuilt_schemas[directory] = (mtime, schemas)
+    if schema_format in schemas:
+        return schemas[schema_format]
+
+    try:
+        with open(manifest_path, encoding="utf-8") as file:
+            manifest = json.load(file)
+        with open(os.path.join(directory, manifest["files"][schema_format]), "rb") as file:
+            content = file.read()
+    except (OSError, ValueError, KeyError):
+        return None
+    schemas[schema_format] = (content, manifest["hash"])
+    return schemas[schema_format]
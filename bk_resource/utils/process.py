@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import os
+import sys
+from typing import List
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from bk_resource.settings import bk_resource_settings
+
+# 指定进程角色的环境变量，优先级高于 BK_RESOURCE["PROCESS_ROLE"]
+PROCESS_ROLE_ENV = "BK_RESOURCE_PROCESS_ROLE"
+
+
+class ProcessRole:
+    WEB = "web"
+    CELERY = "celery"
+    MANAGEMENT = "management"
+    TEST = "test"
+
+    CHOICES = (WEB, CELERY, MANAGEMENT, TEST)
+
+
+def detect_process_role(argv: List[str] = None) -> str:
+    """
+    根据启动命令判断进程角色
+    """
+
+    argv = sys.argv if argv is None else argv
+    basename = os.path.basename(argv[0]) if argv else ""
+
+    if "celery" in argv or basename == "celery":
+        return ProcessRole.CELERY
+    if "test" in argv or basename == "django_test_manage.py" or basename.find("pytest") != -1:
+        return ProcessRole.TEST
+    if any(
+        [
+            "manage.py" == basename and "runserver" not in argv and "runsslserver" not in argv,
+            "migrate" in argv,
+            basename == "pydevconsole.py",
+        ]
+    ):
+        return ProcessRole.MANAGEMENT
+    return ProcessRole.WEB
+
+
+_process_role = None
+
+
+def get_process_role() -> str:
+    """
+    获取当前进程角色，首次调用时计算并缓存
+    优先级：环境变量 BK_RESOURCE_PROCESS_ROLE > BK_RESOURCE["PROCESS_ROLE"] > 启动命令
+    """
+
+    global _process_role
+    if _process_role is None:
+        role = os.environ.get(PROCESS_ROLE_ENV) or bk_resource_settings.PROCESS_ROLE or detect_process_role()
+        if role not in ProcessRole.CHOICES:
+            raise ValueError("[%s] is not a valid process role, choices: %s" % (role, ", ".join(ProcessRole.CHOICES)))
+        _process_role = role
+    return _process_role
+
+
+def clear_process_role_cache() -> None:
+    global _process_role
+    _process_role = None
+
+
+@receiver(setting_changed)
+def reload_process_role(setting: str, **kwargs) -> None:
+    if setting == "BK_RESOURCE":
+        clear_process_role_cache()
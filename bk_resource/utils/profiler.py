@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+import functools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+
+from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.local import local
+from bk_resource.utils.logger import logger
+
+# 分析数据保存在 local 中，使用 ThreadPool 并发请求时会同步到子线程
+_PROFILE_KEY = "bk_resource_profile"
+_PROFILE_NODE_KEY = "bk_resource_profile_node"
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class ProfileCategory:
+    VIEW = "view"
+    RESOURCE = "resource"
+    HTTP = "http"
+
+
+class ProfileMode:
+    """
+    请求的分析模式，SPEEDSCOPE / COLLAPSED / JSON 会使用分析结果替换响应内容
+    """
+
+    # 仅记录
+    RECORD = "record"
+    # 通过 Server-Timing 响应头返回
+    TIMING = "timing"
+    SPEEDSCOPE = "speedscope"
+    COLLAPSED = "collapsed"
+    JSON = "json"
+
+    EXPORT_MODES = (SPEEDSCOPE, COLLAPSED, JSON)
+
+
+class ProfileNode:
+    """
+    调用树节点
+    """
+
+    __slots__ = ("name", "category", "start", "end", "tags", "children")
+
+    def __init__(self, name: str, category: str):
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.end = None
+        self.tags = {}
+        self.children: List[ProfileNode] = []
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    @property
+    def self_ms(self) -> float:
+        """
+        除子节点外的耗时，子节点并发执行时可能为 0
+        """
+        return max(self.duration_ms - sum(child.duration_ms for child in self.children), 0)
+
+    @property
+    def frame_name(self) -> str:
+        """
+        火焰图中的帧名称，缓存命中与未命中作为不同的帧
+        """
+        name = self.name.replace(";", ",")
+        if "cache" in self.tags:
+            return "{} [cache {}]".format(name, self.tags["cache"])
+        return name
+
+    def to_dict(self, base: float) -> dict:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "start_ms": round((self.start - base) * 1000, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "tags": self.tags,
+            "children": [child.to_dict(base) for child in self.children],
+        }
+
+
+class ResourceProfile:
+    """
+    一次分析的调用树，根节点为视图或 profile_resources 的调用范围
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.created_at = datetime.datetime.now()
+        self.root = ProfileNode(name, ProfileCategory.VIEW)
+        self._lock = threading.Lock()
+
+    def add_child(self, parent: ProfileNode, node: ProfileNode) -> None:
+        with self._lock:
+            parent.children.append(node)
+
+    def finish(self) -> None:
+        self.root.end = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> float:
+        return self.root.duration_ms
+
+    def iter_stacks(self) -> Iterator[Tuple[Tuple[str, ...], float]]:
+        """
+        深度优先遍历，返回 (调用栈, 自身耗时 ms)
+        """
+        stack = [((self.root.frame_name,), self.root)]
+        while stack:
+            frames, node = stack.pop()
+            yield frames, node.self_ms
+            for child in reversed(node.children):
+                stack.append((frames + (child.frame_name,), child))
+
+    def to_dict(self) -> dict:
+        return self.root.to_dict(self.root.start)
+
+    def to_collapsed(self) -> str:
+        """
+        collapsed stack 格式，每行为 "帧;帧;帧 耗时"，耗时单位为 us，可用于 flamegraph.pl 或 speedscope
+        """
+        weights: Dict[str, int] = OrderedDict()
+        for frames, self_ms in self.iter_stacks():
+            key = ";".join(frames)
+            weights[key] = weights.get(key, 0) + int(round(self_ms * 1000))
+        return "\n".join("{} {}".format(key, weight) for key, weight in weights.items() if weight)
+
+    def to_speedscope(self) -> dict:
+        """
+        speedscope 文件格式，使用 sampled 类型，每个样本为一个调用栈，权重为自身耗时
+        """
+        frames: Dict[str, int] = OrderedDict()
+        samples = []
+        weights = []
+        for stack, self_ms in self.iter_stacks():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(round(self_ms, 3))
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.name,
+            "exporter": "bk_resource",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": frame} for frame in frames]},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": self.name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def server_timing(self, limit: int = 20) -> str:
+        """
+        Server-Timing 响应头，按帧汇总耗时，取耗时最长的 limit 项
+        """
+        durations: Dict[str, float] = {}
+        stack = list(self.root.children)
+        while stack:
+            node = stack.pop()
+            durations[node.frame_name] = durations.get(node.frame_name, 0) + node.duration_ms
+            stack.extend(node.children)
+        metrics = ["total;dur={:.3f}".format(self.duration_ms)]
+        items = sorted(durations.items(), key=lambda item: item[1], reverse=True)[:limit]
+        for index, (frame, duration) in enumerate(items):
+            desc = frame.replace("\\", "\\\\").replace('"', '\\"')
+            metrics.append('r{};desc="{}";dur={:.3f}'.format(index, desc, duration))
+        return ", ".join(metrics)
+
+    def dump(self, path: str, mode: str = ProfileMode.SPEEDSCOPE) -> None:
+        """
+        导出到文件
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            if mode == ProfileMode.COLLAPSED:
+                file.write(self.to_collapsed())
+            elif mode == ProfileMode.JSON:
+                json.dump(self.to_dict(), file, ensure_ascii=False)
+            else:
+                json.dump(self.to_speedscope(), file, ensure_ascii=False)
+
+
+def get_current_profile() -> Optional[ResourceProfile]:
+    return getattr(local, _PROFILE_KEY, None)
+
+
+@contextmanager
+def profile_scope(name: Union[str, type], category: str = ProfileCategory.RESOURCE):
+    """
+    在当前调用树中记录一个节点，未开启分析时不做任何处理
+    :param name: 节点名称，为类时使用 "模块.类名"
+    """
+    parent = getattr(local, _PROFILE_NODE_KEY, None)
+    if parent is None:
+        yield None
+        return
+
+    if isinstance(name, type):
+        name = "{}.{}".format(name.__module__, name.__name__)
+    node = ProfileNode(name, category)
+    get_current_profile().add_child(parent, node)
+    setattr(local, _PROFILE_NODE_KEY, node)
+    try:
+        yield node
+    finally:
+        node.end = time.perf_counter()
+        setattr(local, _PROFILE_NODE_KEY, parent)
+
+
+def tag_profile_node(key: str, value: any) -> None:
+    """
+    为当前节点添加标记，如缓存是否命中
+    """
+    node = getattr(local, _PROFILE_NODE_KEY, None)
+    if node is not None:
+        node.tags[key] = value
+
+
+@contextmanager
+def profile_resources(name: str = "profile"):
+    """
+    开启 Resource 调用分析，已开启时在当前调用树中记录为一个节点
+
+    >>> with profile_resources("debug") as profile:
+    ...     resource.example.get_data(id=1)
+    >>> profile.dump("debug.speedscope.json")
+    """
+    profile = get_current_profile()
+    if profile is not None:
+        with profile_scope(name, ProfileCategory.VIEW):
+            yield profile
+        return
+
+    profile = ResourceProfile(name)
+    setattr(local, _PROFILE_KEY, profile)
+    setattr(local, _PROFILE_NODE_KEY, profile.root)
+    try:
+        yield profile
+    finally:
+        profile.finish()
+        delattr(local, _PROFILE_NODE_KEY)
+        delattr(local, _PROFILE_KEY)
+
+
+def get_request_profile_mode(request) -> Optional[str]:
+    """
+    获取请求的分析模式，不分析时返回 None
+    DEBUG 模式下可以通过请求头开启，值为 speedscope / collapsed / json 时直接返回分析结果，其他值通过 Server-Timing 返回
+    其他请求按 RESOURCE_PROFILE_SAMPLE_RATE 采样，仅记录不返回
+    """
+    header = bk_resource_settings.RESOURCE_PROFILE_HEADER
+    if header and settings.DEBUG:
+        value = request.META.get("HTTP_" + header.upper().replace("-", "_"))
+        if value:
+            value = value.strip().lower()
+            return value if value in ProfileMode.EXPORT_MODES else ProfileMode.TIMING
+
+    sample_rate = bk_resource_settings.RESOURCE_PROFILE_SAMPLE_RATE
+    if sample_rate and (sample_rate >= 1 or random.random() < sample_rate):
+        return ProfileMode.RECORD
+    return None
+
+
+def save_profile(profile: ResourceProfile) -> Optional[str]:
+    """
+    保存分析结果，配置 RESOURCE_PROFILE_DIR 时写入 speedscope 文件并返回路径，否则输出到日志
+    """
+    if profile.duration_ms < (bk_resource_settings.RESOURCE_PROFILE_MIN_DURATION or 0):
+        return None
+
+    directory = bk_resource_settings.RESOURCE_PROFILE_DIR
+    if not directory:
+        logger.info("[ResourceProfile] %s %.3fms\n%s", profile.name, profile.duration_ms, profile.to_collapsed())
+        return None
+
+    filename = "{}-{}-{}.speedscope.json".format(
+        profile.created_at.strftime("%Y%m%d%H%M%S"), os.getpid(), uuid.uuid4().hex[:8]
+    )
+    path = os.path.join(directory, filename)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        profile.dump(path)
+    except OSError as err:
+        logger.exception("[ResourceProfile] save profile failed: %s", err)
+        return None
+    return path
+
+
+def attach_profile(response, profile: ResourceProfile, mode: str):
+    """
+    将分析结果附加到响应中
+    """
+    if mode == ProfileMode.SPEEDSCOPE:
+        return JsonResponse(profile.to_speedscope())
+    if mode == ProfileMode.JSON:
+        return JsonResponse(profile.to_dict())
+    if mode == ProfileMode.COLLAPSED:
+        return HttpResponse(profile.to_collapsed(), content_type="text/plain; charset=utf-8")
+    if mode == ProfileMode.TIMING:
+        response["Server-Timing"] = profile.server_timing()
+    return response
+
+
+def profile_view(name: str) -> Callable:
+    """
+    视图分析装饰器，按 get_request_profile_mode 判断是否开启
+    """
+
+    def decorator(view_func: Callable) -> Callable:
+        @functools.wraps(view_func)
+        def wrapper(viewset, request, *args, **kwargs):
+            mode = get_request_profile_mode(request)
+            if mode is None:
+                return view_func(viewset, request, *args, **kwargs)
+            with profile_resources(name) as profile:
+                response = view_func(viewset, request, *args, **kwargs)
+            save_profile(profile)
+            return attach_profile(response, profile, mode)
+
+        return wrapper
+
+    return decorator
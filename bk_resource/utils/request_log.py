@@ -17,14 +17,28 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
-import json
+import copy
+import fnmatch
+import random
 from datetime import datetime
+from typing import List, Tuple
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import cached_property
 
 from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.bounded_json import bounded_json_dumps
+from bk_resource.utils.json_backend import json_dumps
+from bk_resource.utils.log_pipeline import get_request_log_pipeline
+from bk_resource.utils.log_spool import get_spool_writer
 from bk_resource.utils.logger import logger
 
 
 class BaseRequestLogHandler:
+    # 调用失败时的异常，由 record_request_log 设置
+    exception = None
+
     def __init__(
         self,
         resource_name: str,
@@ -36,27 +50,97 @@ class BaseRequestLogHandler:
         self.resource_name = resource_name
         self.start_time = start_time
         self.end_time = end_time
-        self.request_data = self.parse_json(request_data)
-        self.response_data = self.parse_json(response_data)
+        # 原始数据，在首次使用时才序列化
+        self.raw_request_data = request_data
+        self.raw_response_data = response_data
+
+    @cached_property
+    def request_data(self) -> str:
+        return self.parse_json(self.raw_request_data)
+
+    @cached_property
+    def response_data(self) -> str:
+        response_data, truncated = self._response_dump
+        return response_data + ("." * 6 if truncated else "")
+
+    @property
+    def response_truncated(self) -> bool:
+        """
+        返回数据是否超出 REQUEST_LOG_SPLIT_LENGTH 被截断
+        """
+        return self._response_dump[1]
+
+    @cached_property
+    def _response_dump(self) -> Tuple[str, bool]:
+        split_length = bk_resource_settings.REQUEST_LOG_SPLIT_LENGTH
+        if not split_length:
+            return self.parse_json(self.raw_response_data), False
+        # 限长序列化，超出长度后停止
+        return bounded_json_dumps(
+            self.raw_response_data, split_length, max_items=bk_resource_settings.REQUEST_LOG_MAX_ITEMS
+        )
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_time - self.start_time).total_seconds() * 1000
+
+    @property
+    def failed(self) -> bool:
+        return self.exception is not None
+
+    def prepare(self) -> None:
+        """
+        在调用线程中获取与线程相关的信息（如当前请求的用户），异步记录时在入队前调用
+        """
+
+    def snapshot(self) -> None:
+        """
+        在调用线程中固定请求及返回数据，避免后台线程序列化时数据已被调用方修改，异步记录时在入队前调用
+        请求数据直接序列化；返回数据限长（REQUEST_LOG_SPLIT_LENGTH）时直接序列化，否则只做浅拷贝
+        """
+        self.request_data  # noqa
         if bk_resource_settings.REQUEST_LOG_SPLIT_LENGTH:
-            log_length = len(self.response_data)
-            self.response_data = self.response_data[: bk_resource_settings.REQUEST_LOG_SPLIT_LENGTH] + (
-                "." * 6 if log_length > bk_resource_settings.REQUEST_LOG_SPLIT_LENGTH else ""
-            )
+            self.response_data  # noqa
+        elif isinstance(self.raw_response_data, (dict, list)):
+            self.raw_response_data = copy.copy(self.raw_response_data)
 
     @abc.abstractmethod
     def record(self):
         ...
 
+    def emit(self) -> None:
+        """
+        输出日志，异步记录时由后台线程调用
+        """
+        self.record()
+
+    @classmethod
+    def emit_batch(cls, handlers: List["BaseRequestLogHandler"]) -> int:
+        """
+        批量输出日志，单条失败不影响其他日志，返回失败的数量，子类可重写以批量写入
+        """
+        failed = 0
+        for handler in handlers:
+            try:
+                handler.emit()
+            except Exception as err:  # pylint: disable=broad-except
+                logger.exception("[RequestLog] emit request log of %s failed: %s", handler.resource_name, err)
+                failed += 1
+        return failed
+
     @classmethod
     def parse_json(cls, data: dict) -> str:
         try:
-            return json.dumps(data, ensure_ascii=False)
+            return json_dumps(data)
         except Exception:
             return str(data)
 
 
 class RequestLogHandler(BaseRequestLogHandler):
+    def prepare(self) -> None:
+        # 在当前线程中获取并缓存用户信息
+        self.app_code, self.username  # noqa
+
     def record(self):
         msg = (
             "[ResourceRequestLog]\n"
@@ -70,8 +154,8 @@ class RequestLogHandler(BaseRequestLogHandler):
         )
         logger.info(
             msg,
-            self.get_app_code(),
-            self.get_username(),
+            self.app_code,
+            self.username,
             self.resource_name,
             self.start_time,
             self.end_time,
@@ -79,6 +163,14 @@ class RequestLogHandler(BaseRequestLogHandler):
             self.response_data,
         )
 
+    @cached_property
+    def username(self) -> str:
+        return self.get_username()
+
+    @cached_property
+    def app_code(self) -> str:
+        return self.get_app_code()
+
     @classmethod
     def get_username(cls) -> str:
         """获取请求用户名"""
@@ -99,3 +191,145 @@ class RequestLogHandler(BaseRequestLogHandler):
             return f"{app.bk_app_code}{'' if app.verified else '(unverified)'}"
         except (IndexError, AttributeError):
             return ""
+
+
+class AsyncRequestLogHandlerMixin:
+    """
+    异步记录请求日志，record 固定请求及返回数据后将记录放入队列，由后台线程批量输出
+    """
+
+    def record(self):
+        self.prepare()
+        self.snapshot()
+        get_request_log_pipeline().put(self)
+
+    def emit(self) -> None:
+        super().record()
+
+
+class AsyncRequestLogHandler(AsyncRequestLogHandlerMixin, RequestLogHandler):
+    """
+    异步的 RequestLogHandler
+    """
+
+
+class StructuredRequestLogHandler(RequestLogHandler):
+    """
+    结构化请求日志，每条记录输出为一行 JSON
+    配置 REQUEST_LOG_SPOOL_PATH 时写入本地轮转文件，否则通过 logger 输出
+    """
+
+    def to_dict(self) -> dict:
+        request_data = self.request_data
+        response_data = self.response_data
+        record = {
+            "resource": self.resource_name,
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "username": self.username,
+            "app_code": self.app_code,
+            "status": "failed" if self.failed else "success",
+            "error": str(self.exception) if self.failed else None,
+            # 日志中数据的长度，返回数据被截断时不代表实际大小
+            "request_log_size": len(request_data),
+            "response_log_size": len(response_data),
+            "response_truncated": self.response_truncated,
+        }
+        if bk_resource_settings.REQUEST_LOG_STRUCTURED_INCLUDE_DATA:
+            record["request_data"] = request_data
+            record["response_data"] = response_data
+        return record
+
+    def to_json(self) -> str:
+        return json_dumps(self.to_dict())
+
+    def record(self):
+        self.emit_batch([self])
+
+    @classmethod
+    def emit_batch(cls, handlers: List["StructuredRequestLogHandler"]) -> int:
+        lines = []
+        failed = 0
+        for handler in handlers:
+            try:
+                lines.append(handler.to_json())
+            except Exception as err:  # pylint: disable=broad-except
+                logger.exception("[RequestLog] serialize request log of %s failed: %s", handler.resource_name, err)
+                failed += 1
+        spool_path = bk_resource_settings.REQUEST_LOG_SPOOL_PATH
+        if not spool_path:
+            for line in lines:
+                logger.info(line)
+            return failed
+        get_spool_writer(
+            spool_path,
+            max_bytes=bk_resource_settings.REQUEST_LOG_SPOOL_MAX_BYTES,
+            backup_count=bk_resource_settings.REQUEST_LOG_SPOOL_BACKUP_COUNT,
+            fsync_interval=bk_resource_settings.REQUEST_LOG_SPOOL_FSYNC_INTERVAL,
+        ).write_lines(lines)
+        return failed
+
+
+class AsyncStructuredRequestLogHandler(AsyncRequestLogHandlerMixin, StructuredRequestLogHandler):
+    """
+    异步的 StructuredRequestLogHandler，后台线程按批次写入
+    """
+
+
+# 各 Resource 的日志采样比例缓存，{resource_name: sample_rate}
+_sample_rates = {}
+
+
+@receiver(setting_changed)
+def reload_sample_rates(setting: str, **kwargs) -> None:
+    if setting == "BK_RESOURCE":
+        _sample_rates.clear()
+
+
+def get_sample_rate(resource_name: str) -> float:
+    """
+    获取 Resource 的日志采样比例，REQUEST_LOG_RESOURCE_SAMPLE_RATES 支持通配符，按配置顺序匹配
+    """
+    sample_rate = _sample_rates.get(resource_name)
+    if sample_rate is None:
+        sample_rate = bk_resource_settings.REQUEST_LOG_SAMPLE_RATE
+        for pattern, rate in (bk_resource_settings.REQUEST_LOG_RESOURCE_SAMPLE_RATES or {}).items():
+            if fnmatch.fnmatchcase(resource_name, pattern):
+                sample_rate = rate
+                break
+        _sample_rates[resource_name] = sample_rate
+    return sample_rate
+
+
+def should_record_request_log(resource_name: str, start_time: datetime, end_time: datetime, failed: bool) -> bool:
+    """
+    判断是否需要记录日志，失败及慢调用不参与采样
+    """
+    slow_threshold = bk_resource_settings.REQUEST_LOG_SLOW_THRESHOLD
+    if failed or (slow_threshold is not None and (end_time - start_time).total_seconds() * 1000 >= slow_threshold):
+        return True
+    if bk_resource_settings.REQUEST_LOG_ONLY_SLOW_OR_FAILED:
+        return False
+    sample_rate = get_sample_rate(resource_name)
+    return sample_rate >= 1 or random.random() < sample_rate
+
+
+def record_request_log(
+    resource_name: str,
+    start_time: datetime,
+    end_time: datetime,
+    request_data: any,
+    response_data: any,
+    exception: Exception = None,
+) -> None:
+    """
+    使用 REQUEST_LOG_HANDLER 记录请求日志，未命中采样时不会创建 Handler
+    """
+    if not should_record_request_log(resource_name, start_time, end_time, exception is not None):
+        return
+    log_handler = bk_resource_settings.REQUEST_LOG_HANDLER(
+        resource_name, start_time, end_time, request_data, response_data
+    )
+    log_handler.exception = exception
+    log_handler.record()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import hashlib
+import time
+from typing import Iterable, Optional, Union
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from bk_resource.utils.common_utils import count_md5
+from bk_resource.utils.json_backend import json_dumps
+
+# 缓存响应时保留的响应头
+CACHED_HEADERS = ("Content-Type", "Content-Encoding", "Content-Language", "Content-Disposition")
+
+
+class ResponseCache:
+    """
+    路由响应缓存，缓存渲染后的响应内容，命中时跳过数据校验、业务逻辑、渲染及请求日志
+    认证、鉴权等 DRF 流程仍会执行，仅缓存 GET 请求状态码为 200 的响应
+
+    >>> ResourceRoute("GET", ListDashboardResource, cache=ResponseCache(timeout=30, vary_query_params=["bk_biz_id"]))
+    """
+
+    key_prefix = "route_cache"
+
+    def __init__(
+        self,
+        timeout: int = 60,
+        vary_user: bool = True,
+        vary_query_params: Optional[Iterable[str]] = None,
+        vary_headers: Iterable[str] = (),
+        vary_language: bool = True,
+        cache_alias: str = "default",
+    ):
+        """
+        :param timeout: 缓存时间，单位：s
+        :param vary_user: 是否按用户区分
+        :param vary_query_params: 区分缓存的查询参数，为 None 时使用全部查询参数
+        :param vary_headers: 区分缓存的请求头，如 ["X-Bk-Tenant-Id"]
+        :param vary_language: 是否按语言区分（来自语言 cookie 或 Accept-Language）
+        :param cache_alias: 使用的 django 缓存
+        """
+        self.timeout = timeout
+        self.vary_user = vary_user
+        self.vary_query_params = None if vary_query_params is None else tuple(vary_query_params)
+        self.vary_headers = tuple(vary_headers)
+        self.vary_language = vary_language
+        self.cache_alias = cache_alias
+
+    @classmethod
+    def build(cls, cache: Union[int, "ResponseCache", None]) -> Optional["ResponseCache"]:
+        """
+        ResourceRoute 的 cache 参数可以直接传入缓存时间
+        """
+        if cache is None or isinstance(cache, ResponseCache):
+            return cache
+        return cls(timeout=cache)
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def build_key(self, view_name: str, request, kwargs: dict, field_selection=None) -> str:
+        """
+        :param request: DRF Request，需已完成内容协商
+        :param kwargs: url 参数
+        :param field_selection: 返回字段的选择，始终区分缓存，与 vary_query_params 无关
+        :type field_selection: bk_resource.utils.field_selection.FieldSelection
+        """
+        query_params = request.query_params
+        if self.vary_query_params is None:
+            query = sorted((key, query_params.getlist(key)) for key in query_params)
+        else:
+            query = [(key, query_params.getlist(key)) for key in self.vary_query_params]
+        vary = [
+            kwargs,
+            query,
+            getattr(request, "accepted_media_type", ""),
+            [request.META.get("HTTP_" + header.upper().replace("-", "_"), "") for header in self.vary_headers],
+        ]
+        if field_selection:
+            vary.append(repr(field_selection))
+        if self.vary_user:
+            vary.append(getattr(request.user, "username", "") if getattr(request, "user", None) else "")
+        if self.vary_language:
+            vary.append(translation.get_language())
+        return "{}:{}:{}".format(self.key_prefix, view_name, count_md5(vary))
+
+    def get_response(self, request, key: str, etag: str = None) -> Optional[HttpResponse]:
+        """
+        获取缓存的响应，请求带有匹配的 If-None-Match / If-Modified-Since 时返回 304
+        :param etag: Resource.etag 返回的版本标识，与缓存时不一致时视为失效
+        """
+        entry = self.cache.get(key)
+        if not entry or (etag is not None and entry.get("version") != etag):
+            return None
+
+        response = HttpResponse(entry["content"], status=entry["status"])
+        for header, value in entry["headers"].items():
+            response[header] = value
+        response["ETag"] = entry["etag"]
+        response["Last-Modified"] = http_date(entry["last_modified"])
+        return get_conditional_response(
+            request, etag=entry["etag"], last_modified=entry["last_modified"], response=response
+        )
+
+    def set_response(self, key: str, response, etag: str = None, last_modified: float = None) -> None:
+        """
+        缓存已渲染的响应，并为响应设置 ETag 及 Last-Modified
+        :param etag: Resource.etag 返回的版本标识，为空时使用响应内容的摘要
+        :param last_modified: Resource.last_modified 返回的时间戳
+        """
+        if response.status_code != 200 or response.streaming:
+            return
+        content = response.content
+        entry = {
+            "content": content,
+            "status": response.status_code,
+            "headers": {header: response[header] for header in CACHED_HEADERS if response.has_header(header)},
+            "version": etag,
+            "etag": response.get("ETag") or quote_etag(etag or hashlib.md5(content).hexdigest()),
+            "last_modified": int(last_modified or time.time()),
+        }
+        self.cache.set(key, entry, self.timeout)
+        if not response.has_header("ETag"):
+            response["ETag"] = entry["etag"]
+        if not response.has_header("Last-Modified"):
+            response["Last-Modified"] = http_date(entry["last_modified"])
+
+
+def build_data_etag(data: any, media_type: str = "") -> Optional[str]:
+    """
+    根据返回数据生成弱 ETag，无需渲染响应，数据无法序列化时返回 None
+    """
+    try:
+        content = json_dumps(data)
+    except Exception:
+        return None
+    digest = hashlib.md5(media_type.encode())
+    digest.update(content.encode())
+    return 'W/"{}"'.format(digest.hexdigest())
+
+
+def conditional_response(request, response, auto_etag: bool = False):
+    """
+    响应带有 ETag 时处理 If-None-Match 等条件请求，匹配时返回 304
+    :param request: DRF Request
+    :param auto_etag: 没有 ETag 时是否根据返回数据生成
+    """
+    if request.method not in ("GET", "HEAD") or response.status_code != 200:
+        return response
+    etag = response.get("ETag")
+    if etag is None:
+        if not auto_etag or not isinstance(response, Response):
+            return response
+        etag = build_data_etag(response.data, getattr(request, "accepted_media_type", "") or "")
+        if etag is None:
+            return response
+        response["ETag"] = etag
+    return get_conditional_response(getattr(request, "_request", request), etag=etag, response=response)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import codecs
+import json
+from typing import Iterable, Iterator, List, Union
+
+WHITESPACE = " \t\n\r"
+
+
+class JSONStreamParser:
+    """
+    增量 JSON 解析器
+    从分块输入中逐个解析指定路径下数组的元素，内存占用只与单个元素大小相关
+
+    >>> parser = JSONStreamParser([b'{"result": true, "data": [1, ', b'2]}'], path="data")
+    >>> list(parser)
+    [1, 2]
+    >>> parser.envelope
+    {'result': True, 'data': []}
+    """
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]], path: Union[str, List[str]] = "data"):
+        """
+        :param chunks: 分块数据，bytes 按 utf-8 解码
+        :param path: 数组所在路径，多层使用 "." 分隔，如 "data.info"
+        """
+        self.chunks = iter(chunks)
+        self.path = path.split(".") if isinstance(path, str) else list(path)
+        # 除数组元素外的其他字段，数组本身以空列表占位
+        self.envelope = {}
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[any]:
+        self._skip_whitespace()
+        self._expect("{")
+        yield from self._parse_object(self.envelope, self.path)
+        self._skip_whitespace()
+        if self._peek() is not None:
+            self._raise("Extra data")
+
+    def _read(self) -> bool:
+        """
+        读取下一个分块，无数据时返回 False
+        """
+        if self._eof:
+            return False
+        # 丢弃已解析的数据，避免缓冲区无限增长
+        if self._pos:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        for chunk in self.chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._text_decoder.decode(chunk)
+            if chunk:
+                self._buffer += chunk
+                return True
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _peek(self) -> Union[str, None]:
+        while self._pos >= len(self._buffer):
+            if not self._read():
+                return None
+        return self._buffer[self._pos]
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            char = self._peek()
+            if char is None or char not in WHITESPACE:
+                return
+            self._pos += 1
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            self._raise("Expecting '%s'" % char)
+        self._pos += 1
+
+    def _raise(self, msg: str) -> None:
+        raise json.JSONDecodeError(msg, self._buffer, self._pos)
+
+    def _decode_value(self) -> any:
+        """
+        解析一个完整的 JSON 值，数据不完整时继续读取
+        """
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._read():
+                    continue
+                raise
+            # 数字可能被分块截断，需要确认其后仍有数据
+            if end >= len(self._buffer) and not self._eof:
+                self._read()
+                continue
+            self._pos = end
+            return value
+
+    def _parse_object(self, container: dict, path: List[str]) -> Iterator[any]:
+        self._skip_whitespace()
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            self._skip_whitespace()
+            key = self._decode_value()
+            if not isinstance(key, str):
+                self._raise("Expecting property name enclosed in double quotes")
+            self._skip_whitespace()
+            self._expect(":")
+            self._skip_whitespace()
+
+            char = self._peek()
+            if path and key == path[0] and len(path) == 1 and char == "[":
+                self._pos += 1
+                container[key] = []
+                yield from self._parse_array()
+            elif path and key == path[0] and len(path) > 1 and char == "{":
+                self._pos += 1
+                container[key] = {}
+                yield from self._parse_object(container[key], path[1:])
+            else:
+                container[key] = self._decode_value()
+
+            self._skip_whitespace()
+            char = self._peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self._pos -= 1
+                self._raise("Expecting ',' delimiter")
+
+    def _parse_array(self) -> Iterator[any]:
+        self._skip_whitespace()
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            self._skip_whitespace()
+            yield self._decode_value()
+            self._skip_whitespace()
+            char = self._peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                self._raise("Expecting ',' delimiter")
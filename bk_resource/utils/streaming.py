@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import types
+from collections.abc import Iterator
+from typing import Callable, Iterable, Iterator as IteratorType, Optional
+
+from blueapps.utils.request_provider import get_or_create_local_request_id
+from django.db import models
+from django.http import StreamingHttpResponse
+
+from bk_resource.settings import bk_resource_settings
+from bk_resource.utils.json_backend import json_dumps
+from bk_resource.utils.logger import logger
+
+
+class StreamFormat:
+    """
+    流式响应格式
+    JSON: {"data": [...], "result": true, "code": 0, "message": null, "request_id": "..."}
+    NDJSON: 每行一条数据，最后一行为不包含 data 的响应信息，并增加 count 字段
+    """
+
+    JSON = "json"
+    NDJSON = "ndjson"
+    # 根据 Accept 请求头确定
+    AUTO = "auto"
+
+    CONTENT_TYPES = {
+        JSON: "application/json",
+        NDJSON: "application/x-ndjson",
+    }
+
+
+def is_stream_data(data: any) -> bool:
+    """
+    是否为可以流式返回的数据，即生成器及迭代器，不包括 QuerySet 等可重复迭代的对象
+    路由配置了 stream_format 时才会流式返回，否则按列表渲染
+    """
+    if isinstance(data, (str, bytes, dict, models.QuerySet)):
+        return False
+    return isinstance(data, (types.GeneratorType, Iterator))
+
+
+def get_stream_format(request, default: str = None) -> str:
+    """
+    确定流式响应格式，default 为 auto 或未指定时根据 Accept 请求头确定
+    """
+    if default and default != StreamFormat.AUTO:
+        return default
+    accept = request.META.get("HTTP_ACCEPT", "")
+    if StreamFormat.CONTENT_TYPES[StreamFormat.NDJSON] in accept:
+        return StreamFormat.NDJSON
+    return StreamFormat.JSON
+
+
+def iter_stream_content(
+    items: Iterable,
+    stream_format: str = StreamFormat.JSON,
+    chunk_size: int = None,
+    on_complete: Callable[[int, Optional[Exception]], None] = None,
+) -> IteratorType[bytes]:
+    """
+    逐条序列化数据，每 chunk_size 条合并输出一次
+    响应信息放在数据之后，迭代过程中出现异常时 result 为 false，此时状态码已经发送，无法修改
+    :param on_complete: 迭代结束后的回调，参数为数据条数及异常
+    """
+    chunk_size = max(chunk_size or bk_resource_settings.STREAMING_CHUNK_SIZE or 1, 1)
+    # 响应内容在视图返回后才开始生成，需提前获取请求相关的信息
+    envelope = {"result": True, "code": 0, "message": None, "request_id": get_or_create_local_request_id()}
+    return _iter_stream_content(items, stream_format == StreamFormat.NDJSON, chunk_size, envelope, on_complete)
+
+
+def _iter_stream_content(
+    items: Iterable,
+    is_ndjson: bool,
+    chunk_size: int,
+    envelope: dict,
+    on_complete: Optional[Callable[[int, Optional[Exception]], None]],
+) -> IteratorType[bytes]:
+    count = 0
+    exception = None
+    chunk = []
+
+    def flush() -> bytes:
+        if is_ndjson:
+            return "".join(line + "\n" for line in chunk).encode()
+        # JSON 数组中除第一块外，需要先输出分隔符
+        return (("," if count > len(chunk) else "") + ",".join(chunk)).encode()
+
+    try:
+        if not is_ndjson:
+            yield b'{"data":['
+        try:
+            for item in items:
+                chunk.append(json_dumps(item))
+                count += 1
+                if len(chunk) >= chunk_size:
+                    yield flush()
+                    chunk = []
+        except Exception as err:  # pylint: disable=broad-except
+            logger.exception("[StreamingResponse] iterate data failed: %s", err)
+            exception = err
+            envelope.update({"result": False, "code": 500, "message": str(err)})
+
+        if chunk:
+            yield flush()
+        if is_ndjson:
+            envelope["count"] = count
+            yield (json_dumps(envelope) + "\n").encode()
+        else:
+            yield ("]," + json_dumps(envelope)[1:]).encode()
+    finally:
+        # 客户端断开连接时也会执行
+        if on_complete is not None:
+            on_complete(count, exception)
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    """
+    以 JSON 数组或 NDJSON 流式返回生成器的数据，外层包含统一的 result / code / message
+    """
+
+    def __init__(
+        self,
+        items: Iterable,
+        stream_format: str = StreamFormat.JSON,
+        chunk_size: int = None,
+        on_complete: Callable[[int, Optional[Exception]], None] = None,
+        **kwargs
+    ):
+        kwargs.setdefault("content_type", StreamFormat.CONTENT_TYPES[stream_format])
+        super().__init__(iter_stream_content(items, stream_format, chunk_size, on_complete), **kwargs)
+        # 避免 Nginx 等代理缓冲整个响应
+        self["X-Accel-Buffering"] = "no"
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Union
+from urllib.parse import parse_qsl, urlsplit
+
+
+class LatencyDistribution:
+    """
+    响应延迟分布，参数单位均为 ms
+    """
+
+    # fixed:20
+    FIXED = "fixed"
+    # uniform:10,50
+    UNIFORM = "uniform"
+    # normal:30,5 （均值，标准差）
+    NORMAL = "normal"
+    # exponential:20 （均值）
+    EXPONENTIAL = "exponential"
+
+    CHOICES = (FIXED, UNIFORM, NORMAL, EXPONENTIAL)
+
+
+def build_latency_sampler(spec: Union[str, float, None]) -> Callable[[random.Random], float]:
+    """
+    解析延迟配置，返回延迟采样函数（s）
+    :param spec: 数字表示固定延迟，字符串格式为 "分布:参数1,参数2"，如 "uniform:10,50"
+    """
+    if not spec:
+        return lambda rand: 0
+    if isinstance(spec, (int, float)):
+        distribution, params = LatencyDistribution.FIXED, [float(spec)]
+    else:
+        distribution, _, params = spec.partition(":")
+        if not params:
+            distribution, params = LatencyDistribution.FIXED, distribution
+        params = [float(param) for param in params.split(",")]
+
+    if distribution == LatencyDistribution.FIXED:
+        return lambda rand: params[0] / 1000
+    if distribution == LatencyDistribution.UNIFORM:
+        return lambda rand: rand.uniform(params[0], params[1]) / 1000
+    if distribution == LatencyDistribution.NORMAL:
+        return lambda rand: max(rand.gauss(params[0], params[1]), 0) / 1000
+    if distribution == LatencyDistribution.EXPONENTIAL:
+        return lambda rand: rand.expovariate(1 / params[0]) / 1000 if params[0] else 0
+    raise ValueError("unsupported latency distribution: %s" % distribution)
+
+
+class StubGatewayHandler(BaseHTTPRequestHandler):
+    """
+    返回蓝鲸网关格式 {"result": true, "code": 0, "message": "", "data": {...}} 的请求处理
+    data 为请求路径及参数，按网关配置模拟延迟、HTTP 错误及业务失败
+    """
+
+    # 使用 HTTP/1.1 以支持连接复用
+    protocol_version = "HTTP/1.1"
+    # 响应头与响应体分开发送，需关闭 Nagle 算法，避免与客户端延迟确认叠加产生 40ms 延迟
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.gateway.incr("connections")
+
+    def log_message(self, format, *args):
+        return
+
+    def _read_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        body = self.rfile.read(length)
+        try:
+            return json.loads(body)
+        except ValueError:
+            return {}
+
+    def _handle(self) -> None:
+        gateway = self.server.gateway
+        gateway.incr("requests")
+        url = urlsplit(self.path)
+        params = dict(parse_qsl(url.query)) if self.command == "GET" else self._read_body()
+
+        outcome, latency = gateway.sample()
+        if latency:
+            time.sleep(latency)
+        if outcome == "errors":
+            gateway.incr("errors")
+            self.send_json({"result": False, "code": 500, "message": "stub gateway error", "data": None}, status=500)
+        elif outcome == "failures":
+            gateway.incr("failures")
+            self.send_json({"result": False, "code": 1, "message": "stub gateway failure", "data": None})
+        else:
+            self.send_json({"result": True, "code": 0, "message": "", "data": {"path": url.path, "params": params}})
+
+    def send_json(self, data: dict, status: int = 200) -> None:
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class StubGateway:
+    """
+    本地的网关模拟服务，用于基准测试及压测，不依赖外部服务
+
+    >>> with StubGateway(latency="uniform:10,50", error_rate=0.01) as gateway:
+    ...     requests.get(gateway.url + "/api/")
+    ...     gateway.stats()
+    """
+
+    handler_class = StubGatewayHandler
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Union[str, float, Callable[[random.Random], float]] = None,
+        error_rate: float = 0,
+        failure_rate: float = 0,
+        seed: int = None,
+    ):
+        """
+        :param port: 监听端口，为 0 时随机分配
+        :param latency: 响应延迟，见 build_latency_sampler，也可以传入采样函数
+        :param error_rate: 返回 HTTP 500 的比例
+        :param failure_rate: 返回 result 为 false 的比例
+        :param seed: 随机数种子
+        """
+        self.latency = latency if callable(latency) else build_latency_sampler(latency)
+        self.error_rate = error_rate
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "connections": 0, "errors": 0, "failures": 0}
+
+        self.server = ThreadingHTTPServer((host, port), self.handler_class)
+        self.server.daemon_threads = True
+        self.server.gateway = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def incr(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def sample(self) -> (str, float):
+        """
+        采样单次请求的结果类型及延迟（s）
+        """
+        with self._lock:
+            value = self._random.random()
+            latency = self.latency(self._random)
+        if value < self.error_rate:
+            return "errors", latency
+        if value < self.error_rate + self.failure_rate:
+            return "failures", latency
+        return "success", latency
+
+    def stats(self) -> dict:
+        """
+        请求数、连接数、HTTP 错误数及业务失败数
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def start(self) -> "StubGateway":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="StubGateway", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "StubGateway":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -16,23 +16,45 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from typing import List
+import functools
+from typing import Dict, List
 
 import arrow
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.http.response import HttpResponseBase
+from django.http import QueryDict
+from django.http.response import HttpResponse, HttpResponseBase, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext
 from django.views.decorators.cache import cache_control
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
+from rest_framework.views import APIView
 from rest_framework_condition import condition
 
 from bk_resource.base import Resource
+from bk_resource.pagination import Page, PaginatedResourceMixin, PaginationMode
+from bk_resource.serializers import BatchRequestSerializer, TaskProgressRequestSerializer
 from bk_resource.settings import bk_resource_settings
+from bk_resource.tasks import iter_task_progress_events, wait_task_progress
+from bk_resource.tools import get_processes
+from bk_resource.utils.field_selection import FieldSelection
+from bk_resource.utils.inspectors import LazySwaggerOverrides
+from bk_resource.utils.json_backend import json_dumps, json_loads
+from bk_resource.utils.logger import logger
+from bk_resource.utils.openapi_schema import OpenAPISchemaFormat, encode_schema, generate_schema, load_prebuilt_schema
+from bk_resource.utils.profiler import profile_scope, profile_view
+from bk_resource.utils.request_log import record_request_log
+from bk_resource.utils.response_cache import ResponseCache, conditional_response
+from bk_resource.utils.streaming import StreamFormat, StreamingJSONResponse, get_stream_format, is_stream_data
+from bk_resource.utils.thread_backend import ThreadPool
 
 
 class ResourceRoute(object):
@@ -49,6 +71,10 @@ class ResourceRoute(object):
         enable_paginate=False,
         content_encoding=None,
         decorators=None,
+        cache=None,
+        auto_etag=None,
+        stream_format=None,
+        enable_field_selection=False,
     ):
         """
         :param method: 请求方法，目前支持GET, POST, PUT, PATCH, DELETE
@@ -58,11 +84,18 @@ class ResourceRoute(object):
         :param enable_paginate: 是否对结果进行分页
         :param content_encoding: 返回数据内容编码类型
         :params decorators: 给view_func添加的装饰器列表
+        :param cache: 响应缓存，可以为 ResponseCache 或缓存时间（s），仅对 GET 请求生效
+        :param auto_etag: 是否根据返回数据自动生成 ETag，为 None 时使用 AUTO_ETAG 配置
+        :param stream_format: Resource 返回生成器时的流式响应格式，json、ndjson 或 auto（根据 Accept 请求头确定），
+            为 None 时不使用流式响应，生成器按列表渲染
+        :param enable_field_selection: 是否支持通过 fields / exclude 查询参数选择返回字段，开启后这两个参数不再传入 Resource
         """
 
         self.method = method.upper()
 
+        self._resource = None
         if isinstance(resource_class, Resource):
+            self._resource = resource_class
             resource_class = resource_class.__class__
         if not issubclass(resource_class, Resource):
             raise ValueError(gettext("resource_class参数必须提供Resource的子类, 当前类型: %s") % resource_class)
@@ -79,6 +112,36 @@ class ResourceRoute(object):
 
         self.decorators = decorators if isinstance(decorators, list) else None
 
+        self.cache = ResponseCache.build(cache) if self.method == "GET" else None
+
+        self._auto_etag = auto_etag
+
+        self.stream_format = stream_format
+
+        self.enable_field_selection = enable_field_selection
+
+    @property
+    def resource(self) -> Resource:
+        """
+        路由使用的 Resource 实例，开启实例复用时首次使用时创建，之后在请求间复用，否则每次请求创建新的实例
+        """
+        if not self.resource_class.is_reusable():
+            return self.resource_class()
+        if self._resource is None:
+            self._resource = self.resource_class()
+        return self._resource
+
+    @property
+    def auto_etag(self) -> bool:
+        if self._auto_etag is None:
+            return bool(bk_resource_settings.AUTO_ETAG)
+        return self._auto_etag
+
+
+class EmptySerializer(Serializer):
+    class Meta:
+        ref_name = None
+
 
 class ResourceViewSet(viewsets.GenericViewSet):
     EMPTY_ENDPOINT_METHODS = {
@@ -97,24 +160,49 @@ class ResourceViewSet(viewsets.GenericViewSet):
     if bk_resource_settings.DEFAULT_SWAGGER_SCHEMA_CLASS is not None:
         swagger_schema = bk_resource_settings.DEFAULT_SWAGGER_SCHEMA_CLASS
 
+    # action 与路由的映射由 generate_endpoint 生成，请求序列化器在首次获取时生成
+    _action_routes: Dict[str, ResourceRoute] = {}
+    _action_serializers: Dict[str, type] = {}
+
     def get_serializer_class(self):
         """
         获取序列化器
         """
-        serializer_class = None
-        for route in self.resource_routes:
-            if self.action == route.endpoint:
-                serializer_class = route.resource_class.RequestSerializer
-                break
-
-        if not serializer_class:
-            serializer_class = Serializer
+        serializer_class = self._action_serializers.get(self.action)
+        if serializer_class is not None:
+            return serializer_class
+        resource_route = self._action_routes.get(self.action)
+        if resource_route is None or not resource_route.resource_class.RequestSerializer:
+            return EmptySerializer
+        # 仅在生成文档等场景使用，首次获取时生成
+        serializer_class = self._build_swagger_serializer_class(resource_route.resource_class.RequestSerializer)
+        self._action_serializers[self.action] = serializer_class
+        return serializer_class
 
-        class Meta:
-            ref_name = None
+    @staticmethod
+    def _build_swagger_serializer_class(serializer_class: type) -> type:
+        """
+        生成 ref_name 为 None 的子类，避免 swagger 中的序列化器名称冲突，不修改原有的序列化器
+        """
+        meta = type("Meta", (getattr(serializer_class, "Meta", object),), {"ref_name": None})
+        return type(
+            serializer_class.__name__,
+            (serializer_class,),
+            {"Meta": meta, "__module__": serializer_class.__module__, "__doc__": serializer_class.__doc__},
+        )
 
-        serializer_class.Meta = Meta
-        return serializer_class
+    @classmethod
+    def get_route_action(cls, resource_route: ResourceRoute) -> str:
+        """
+        路由对应的 action 名称
+        """
+        if resource_route.endpoint:
+            return resource_route.endpoint
+        if resource_route.method == "GET" and not resource_route.pk_field:
+            return "list"
+        if resource_route.method == "GET":
+            return "retrieve"
+        return cls.EMPTY_ENDPOINT_METHODS.get(resource_route.method, "")
 
     def get_queryset(self):
         """
@@ -122,57 +210,100 @@ class ResourceViewSet(viewsets.GenericViewSet):
         """
         return
 
-    @classmethod
-    def generate_endpoint(cls):
-        for resource_route in cls.resource_routes:
-            # 生成方法模版
-            function = cls._generate_function_template(resource_route)
-
-            # 请求序列化
-            request_serializer_class = resource_route.resource_class.RequestSerializer or Serializer
-            request_serializer = request_serializer_class(many=resource_route.resource_class.many_request_data)
+    def perform_content_negotiation(self, request, force=False):
+        """
+        NDJSON 由流式响应处理，没有对应的 Renderer，非流式响应时使用默认的 Renderer
+        """
+        if StreamFormat.CONTENT_TYPES[StreamFormat.NDJSON] in request.META.get("HTTP_ACCEPT", ""):
+            force = True
+        return super().perform_content_negotiation(request, force=force)
 
-            # 响应序列化
-            response_serializer_class = (
-                resource_route.resource_class.ResponseSerializer
-                or resource_route.resource_class.serializer_class
-                or Serializer
-            )
-            # 支持使用 Field 作为 data 内容
-            try:
-                response_serializer = response_serializer_class(many=resource_route.resource_class.many_response_data)
-            except TypeError:
-                response_serializer = response_serializer_class()
-
-            # 启用分页
-            if resource_route.enable_paginate:
+    @classmethod
+    def build_swagger_overrides(cls, resource_route: ResourceRoute) -> dict:
+        """
+        生成路由的 swagger_auto_schema 参数，仅在生成文档时调用
+        """
+        resource_class = resource_route.resource_class
+
+        # 请求序列化
+        request_serializer_class = resource_class.RequestSerializer or Serializer
+        request_serializer = request_serializer_class(many=resource_class.many_request_data)
+
+        # 响应序列化
+        response_serializer_class = resource_class.ResponseSerializer or resource_class.serializer_class or Serializer
+        # 支持使用 Field 作为 data 内容
+        try:
+            response_serializer = response_serializer_class(many=resource_class.many_response_data)
+        except TypeError:
+            response_serializer = response_serializer_class()
+
+        # Resource 自身分页
+        is_resource_paginated = issubclass(resource_class, PaginatedResourceMixin)
+        manual_parameters = None
+        if is_resource_paginated:
+            if resource_class.pagination_mode == PaginationMode.CURSOR:
+                paginator_response_builder = bk_resource_settings.DEFAULT_CURSOR_PAGINATOR_RESPONSE_BUILDER
+            else:
                 paginator_response_builder = bk_resource_settings.DEFAULT_PAGINATOR_RESPONSE_BUILDER
-                response_serializer = paginator_response_builder(
-                    resource_class=resource_route.resource_class,
-                    data_serializer=response_serializer,
-                ).serializer
-
-            # 统一响应格式
-            standard_response_builder = bk_resource_settings.DEFAULT_STANDARD_RESPONSE_BUILDER
-            response_serializer = standard_response_builder(
-                resource_class=resource_route.resource_class,
+            response_serializer = paginator_response_builder(
+                resource_class=resource_class,
+                data_serializer=response_serializer,
+            ).serializer
+            if resource_route.method == "GET":
+                manual_parameters = resource_class.get_page_parameters()
+        # 启用分页
+        elif resource_route.enable_paginate:
+            paginator_response_builder = bk_resource_settings.DEFAULT_PAGINATOR_RESPONSE_BUILDER
+            response_serializer = paginator_response_builder(
+                resource_class=resource_class,
                 data_serializer=response_serializer,
             ).serializer
 
-            decorator_function = swagger_auto_schema(
-                responses={
-                    200: response_serializer,
-                    500: bk_resource_settings.DEFAULT_ERROR_RESPONSE_SERIALIZER,
-                },
-                operation_description=resource_route.resource_class.__doc__,
-                request_body=request_serializer
-                if resource_route.method in ["POST", "PUT", "PATCH", "DELETE"]
-                else None,
-                query_serializer=request_serializer if resource_route.method == "GET" else None,
-                operation_summary=getattr(resource_route.resource_class, "name", None),
-                tags=getattr(resource_route.resource_class, "tags", None),
-                enable_paginator=resource_route.enable_paginate,
-            )
+        # 统一响应格式
+        standard_response_builder = bk_resource_settings.DEFAULT_STANDARD_RESPONSE_BUILDER
+        response_serializer = standard_response_builder(
+            resource_class=resource_class,
+            data_serializer=response_serializer,
+        ).serializer
+
+        tags = getattr(resource_class, "tags", None)
+        overrides = {
+            "responses": {
+                200: response_serializer,
+                500: bk_resource_settings.DEFAULT_ERROR_RESPONSE_SERIALIZER,
+            },
+            "operation_description": resource_class.__doc__,
+            "request_body": request_serializer if resource_route.method in ["POST", "PUT", "PATCH", "DELETE"] else None,
+            "query_serializer": request_serializer if resource_route.method == "GET" else None,
+            "operation_summary": getattr(resource_class, "name", None),
+            "tags": list(tags) if tags else None,
+            "manual_parameters": manual_parameters,
+        }
+        # 与 swagger_auto_schema 一致，移除空值
+        overrides = {key: value for key, value in overrides.items() if value is not None}
+        overrides["enable_paginator"] = resource_route.enable_paginate and not is_resource_paginated
+        return overrides
+
+    @classmethod
+    def _set_swagger_overrides(cls, resource_route: ResourceRoute, function):
+        """
+        设置延迟生成的 swagger 参数，action 需按请求方法设置
+        """
+        overrides = LazySwaggerOverrides(functools.partial(cls.build_swagger_overrides, resource_route))
+        if resource_route.endpoint:
+            overrides = {resource_route.method.lower(): overrides}
+        function._swagger_auto_schema = overrides
+        return function
+
+    @classmethod
+    def generate_endpoint(cls):
+        cls._action_routes = {}
+        cls._action_serializers = {}
+        for resource_route in cls.resource_routes:
+            cls._action_routes[cls.get_route_action(resource_route)] = resource_route
+
+            # 生成方法模版
+            function = cls._generate_function_template(resource_route)
 
             # 添加装饰器
             if resource_route.decorators:
@@ -181,7 +312,8 @@ class ResourceViewSet(viewsets.GenericViewSet):
 
             # 为Viewset设置方法
             if not resource_route.endpoint:
-                function = decorator_function(function)
+                function = cls._wrap_conditional(resource_route, function)
+                function = cls._set_swagger_overrides(resource_route, function)
                 # 默认方法无需加装饰器，否则会报错
                 if resource_route.method == "GET":
                     if resource_route.pk_field:
@@ -209,24 +341,80 @@ class ResourceViewSet(viewsets.GenericViewSet):
                     function = action(methods=[resource_route.method], detail=True)(function)
                 else:
                     function = action(methods=[resource_route.method], detail=False)(function)
-                function = condition(
-                    etag_func=resource_route.resource_class.etag,
-                    last_modified_func=resource_route.resource_class.last_modified,
-                )(function)
-
-                function = decorator_function(function)
+                function = cls._wrap_conditional(resource_route, function)
+                function = cls._set_swagger_overrides(resource_route, function)
                 setattr(cls, resource_route.endpoint, function)
 
+    @classmethod
+    def _wrap_conditional(cls, resource_route: ResourceRoute, function):
+        """
+        条件请求，优先使用 Resource 的 etag / last_modified，开启 auto_etag 时根据返回数据生成 ETag
+        """
+        resource_class = resource_route.resource_class
+        function = condition(
+            etag_func=functools.partial(cls._get_etag, resource_class),
+            last_modified_func=functools.partial(cls._get_last_modified, resource_class),
+        )(function)
+
+        @functools.wraps(function)
+        def wrapper(self, request, *args, **kwargs):
+            response = function(self, request, *args, **kwargs)
+            return conditional_response(request, response, auto_etag=resource_route.auto_etag)
+
+        return wrapper
+
+    @staticmethod
+    def _get_etag(resource_class, request, *args, **kwargs):
+        """
+        获取 Resource 的 etag，结果缓存在 request 上，条件请求与响应缓存共用，每个请求只计算一次
+        """
+        if not hasattr(request, "_bk_resource_etag"):
+            request._bk_resource_etag = resource_class.etag(request, *args, **kwargs)
+        return request._bk_resource_etag
+
+    @staticmethod
+    def _get_last_modified(resource_class, request, *args, **kwargs):
+        """
+        获取 Resource 的 last_modified，结果缓存在 request 上，每个请求只计算一次
+        """
+        if not hasattr(request, "_bk_resource_last_modified"):
+            request._bk_resource_last_modified = resource_class.last_modified(request, *args, **kwargs)
+        return request._bk_resource_last_modified
+
+    @staticmethod
+    def _get_reserved_params(resource: Resource):
+        """
+        RequestSerializer 中声明的参数，与 fields / exclude 同名时不作为字段选择
+        """
+        return getattr(resource.RequestSerializer, "_declared_fields", {})
+
+    @staticmethod
+    def _build_stream_log_callback(resource: Resource, start_time, request_data):
+        """
+        流式响应完成后记录请求日志，响应数据仅记录条数
+        """
+        if not resource.support_data_collect:
+            return None
+        resource_name = "{}.{}".format(resource.__class__.__module__, resource.__class__.__name__)
+
+        def on_complete(count, exception):
+            record_request_log(
+                resource_name, start_time, arrow.now().datetime, request_data, {"count": count}, exception
+            )
+
+        return on_complete
+
     @classmethod
     def _generate_function_template(cls, resource_route: ResourceRoute):
         """
         生成方法模版
         """
 
+        @profile_view("{} {}".format(resource_route.method, resource_route.resource_class.__name__))
         def template(self, request, *args, **kwargs):
             start_time = arrow.now().datetime
 
-            resource = resource_route.resource_class()
+            resource = resource_route.resource
             request_data = request.query_params.copy() if resource_route.method == "GET" else request.data
 
             # 如果是detail route，需要重url参数中获取主键，并塞到请求参数中
@@ -244,19 +432,56 @@ class ResourceViewSet(viewsets.GenericViewSet):
                 params["_request"] = request
 
             is_async_task = "HTTP_X_ASYNC_TASK" in request.META
+
+            field_selection = None
+            if resource_route.enable_field_selection:
+                reserved = cls._get_reserved_params(resource) if resource_route.method == "GET" else ()
+                field_selection = FieldSelection.from_request(request, reserved)
+                # 字段选择参数由 ViewSet 处理，不传入 Resource
+                if resource_route.method == "GET":
+                    for param in (bk_resource_settings.FIELDS_PARAM, bk_resource_settings.EXCLUDE_PARAM):
+                        if param and param not in reserved:
+                            request_data.pop(param, None)
+
+            # 响应缓存，命中时直接返回渲染后的内容
+            cache_key = cache_etag = None
+            if resource_route.cache is not None and not is_async_task:
+                cache_key = resource_route.cache.build_key(
+                    "{}.{}.{}".format(cls.__module__, cls.__name__, self.action), request, kwargs, field_selection
+                )
+                cache_etag = cls._get_etag(resource_route.resource_class, request._request, *args, **kwargs)
+                cached_response = resource_route.cache.get_response(request._request, cache_key, cache_etag)
+                if cached_response is not None:
+                    return cached_response
+
             if is_async_task:
                 # 执行异步任务
                 data = resource.delay(**params)
                 response = Response(data)
             else:
                 try:
-                    data = resource.request(**params)
+                    with resource.call_scope(field_selection=field_selection), profile_scope(resource.__class__):
+                        data = resource.request(**params)
+                    if not resource_route.stream_format and is_stream_data(data):
+                        # 未开启流式响应，生成器按列表渲染
+                        data = list(data)
                     if isinstance(data, Response):
                         response = data
                         data = data.data
                     elif isinstance(data, HttpResponseBase):
                         response = data
                         data = getattr(data, "content", "")
+                    elif isinstance(data, Page):
+                        # Resource 自身分页，无需再对结果分页
+                        data = data.to_dict()
+                        response = Response(data)
+                    elif resource_route.stream_format and is_stream_data(data):
+                        # 生成器逐条渲染并流式返回，请求日志在数据发送完成后记录
+                        response = StreamingJSONResponse(
+                            data,
+                            stream_format=get_stream_format(request, resource_route.stream_format),
+                            on_complete=cls._build_stream_log_callback(resource, start_time, request_data),
+                        )
                     elif resource_route.enable_paginate:
                         page = self.paginate_queryset(data)
                         response = self.get_paginated_response(page)
@@ -269,17 +494,275 @@ class ResourceViewSet(viewsets.GenericViewSet):
             if resource_route.content_encoding:
                 response.content_encoding = resource_route.content_encoding
 
+            if cache_key is not None and not response.streaming:
+                response = self.finalize_response(request, response, *args, **kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+                last_modified = cls._get_last_modified(
+                    resource_route.resource_class, request._request, *args, **kwargs
+                )
+                resource_route.cache.set_response(
+                    cache_key,
+                    response,
+                    etag=cache_etag,
+                    last_modified=last_modified.timestamp() if last_modified else None,
+                )
+
             end_time = arrow.now().datetime
 
             # 不记录日志的直接返回
-            if not resource.support_data_collect:
+            if not resource.support_data_collect or isinstance(response, StreamingJSONResponse):
                 return response
 
             # 记录请求日志
             resource_name = "{}.{}".format(resource.__class__.__module__, resource.__class__.__name__)
-            log_handler = bk_resource_settings.REQUEST_LOG_HANDLER
-            log_handler(resource_name, start_time, end_time, request_data, data).record()
+            record_request_log(resource_name, start_time, end_time, request_data, data)
 
             return response
 
         return template
+
+
+class ResourceBatchView(APIView):
+    """
+    批量接口，在一次请求中并发执行多个 ResourceViewSet 路由，通过 ResourceRouter.register_batch 注册
+    每个子请求复用调用方的用户、会话及请求头，仍会执行路由自身的认证及鉴权，但不会再次经过中间件
+
+    请求：{"requests": [{"id": "hosts", "route": "host/", "method": "GET", "params": {"bk_biz_id": 2}}]}
+    响应：[{"id": "hosts", "route": "/api/host/", "status_code": 200, "result": true, "data": ...}]
+    """
+
+    router = None
+
+    # 不复制到子请求的请求头，包括条件请求（If-*）及改变响应方式的请求头（异步任务、内容协商、性能分析等）
+    EXCLUDED_META_PREFIXES = ("HTTP_IF_", "CONTENT_", "HTTP_CONTENT_", "QUERY_STRING", "REQUEST_METHOD", "PATH_")
+    EXCLUDED_META_KEYS = (
+        "HTTP_X_ASYNC_TASK",
+        "HTTP_ACCEPT",
+        "HTTP_ACCEPT_ENCODING",
+        "HTTP_RANGE",
+        "HTTP_LAST_EVENT_ID",
+        "HTTP_CACHE_CONTROL",
+    )
+
+    def get_route_base(self, request) -> str:
+        """
+        相对路由的基础路径，即批量接口所在的目录
+        """
+        path = request.path_info.rstrip("/")
+        return path[: path.rfind("/") + 1]
+
+    def resolve_route(self, request, route: str):
+        """
+        解析路由，仅允许访问 router 中注册的 ResourceViewSet
+        """
+        path = route if route.startswith("/") else self.get_route_base(request) + route
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return None, path
+        viewset = getattr(match.func, "cls", None)
+        registered = {item[1] for item in self.router.registry} if self.router is not None else set()
+        if viewset is None or viewset not in registered or not issubclass(viewset, ResourceViewSet):
+            return None, path
+        return match, path
+
+    @staticmethod
+    def merge_query_params(params: dict, query_string: str) -> dict:
+        """
+        将路由中的查询参数合并到请求参数中，同名时以 params 为准
+        """
+        if not query_string:
+            return params
+        if not isinstance(params, dict):
+            raise ValidationError(gettext("路由中包含查询参数时 params 必须为对象"))
+        query = QueryDict(query_string)
+        merged = {key: values if len(values) > 1 else values[0] for key, values in query.lists()}
+        merged.update(params)
+        return merged
+
+    def get_excluded_meta_keys(self) -> set:
+        excluded = set(self.EXCLUDED_META_KEYS)
+        profile_header = bk_resource_settings.RESOURCE_PROFILE_HEADER
+        if profile_header:
+            excluded.add("HTTP_" + profile_header.upper().replace("-", "_"))
+        return excluded
+
+    def build_sub_request(self, request, path: str, method: str, params: dict, query_string: str = ""):
+        """
+        构造子请求，复制调用方的请求头、用户及会话
+        :param query_string: 路由中的查询参数，GET 请求合并到 params 中，其他请求保留在路径上
+        """
+        factory = RequestFactory()
+        if method == "GET":
+            sub_request = factory.get(path, data=self.merge_query_params(params, query_string))
+        else:
+            if query_string:
+                path = "{}?{}".format(path, query_string)
+            sub_request = factory.generic(method, path, data=json_dumps(params), content_type="application/json")
+        django_request = request._request
+        excluded_keys = self.get_excluded_meta_keys()
+        for key, value in django_request.META.items():
+            if key.startswith(self.EXCLUDED_META_PREFIXES) or key.startswith("wsgi.") or key in excluded_keys:
+                continue
+            sub_request.META[key] = value
+        sub_request.COOKIES = django_request.COOKIES
+        for attr in ("user", "session"):
+            if hasattr(django_request, attr):
+                setattr(sub_request, attr, getattr(django_request, attr))
+        return sub_request
+
+    def execute(self, request, item: dict) -> dict:
+        """
+        执行单个子请求，异常时返回错误信息
+        """
+        result = {"id": item.get("id"), "route": item["route"]}
+        route, _, query_string = item["route"].partition("?")
+        match, path = self.resolve_route(request, route)
+        result["route"] = path
+        if match is None:
+            result.update({"status_code": 404, "result": False, "message": gettext("路由不存在或不允许批量调用")})
+            return result
+
+        try:
+            sub_request = self.build_sub_request(request, path, item["method"], item["params"], query_string)
+            sub_request.resolver_match = match
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except ValidationError as err:
+            result.update({"status_code": 400, "result": False, "message": str(err.detail)})
+            return result
+        except Exception as err:  # pylint: disable=broad-except
+            logger.exception("[ResourceBatchView] %s %s failed: %s", item["method"], path, err)
+            result.update({"status_code": 500, "result": False, "message": str(err)})
+            return result
+
+        result["status_code"] = response.status_code
+        result["result"] = 200 <= response.status_code < 300
+        if response.streaming:
+            result.update({"result": False, "message": gettext("批量调用不支持流式响应")})
+        elif isinstance(response, Response):
+            result["data"] = response.data
+        elif response.status_code != 304:
+            content = response.content.decode(response.charset or "utf-8")
+            result["data"] = json_loads(content) if "json" in response.get("Content-Type", "") else content
+        return result
+
+    @swagger_auto_schema(request_body=BatchRequestSerializer, operation_summary="批量请求")
+    def post(self, request, *args, **kwargs):
+        serializer = BatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+        max_requests = bk_resource_settings.BATCH_MAX_REQUESTS
+        if max_requests and len(items) > max_requests:
+            raise ValidationError(gettext("单次批量请求数量不能超过 %s") % max_requests)
+
+        if len(items) == 1:
+            return Response([self.execute(request, items[0])])
+
+        processes = min(bk_resource_settings.BATCH_MAX_WORKERS or get_processes(), len(items))
+        with ThreadPool(processes=processes) as pool:
+            futures = [pool.apply_async(self.execute, args=(request, item)) for item in items]
+            results = [future.get() for future in futures]
+        return Response(results)
+
+
+class TaskProgressView(APIView):
+    """
+    异步任务（X-Async-Task）进度，通过 ResourceRouter.register_task_progress 注册
+    长轮询：GET ?task_id=xxx&version=3&timeout=30，进度版本号大于 version 或任务完成时返回，否则等待至超时
+    SSE：请求头 Accept: text/event-stream 时持续推送进度，断开重连时通过 Last-Event-ID 继续
+    """
+
+    EVENT_STREAM = "text/event-stream"
+
+    def perform_content_negotiation(self, request, force=False):
+        """
+        SSE 由 StreamingHttpResponse 返回，没有对应的 Renderer
+        """
+        if self.EVENT_STREAM in request.META.get("HTTP_ACCEPT", ""):
+            force = True
+        return super().perform_content_negotiation(request, force=force)
+
+    @staticmethod
+    def _parse_version(value, default: int) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    @swagger_auto_schema(query_serializer=TaskProgressRequestSerializer, operation_summary="异步任务进度")
+    def get(self, request, *args, **kwargs):
+        serializer = TaskProgressRequestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        if self.EVENT_STREAM in request.META.get("HTTP_ACCEPT", ""):
+            version = self._parse_version(request.META.get("HTTP_LAST_EVENT_ID"), params["version"])
+            response = StreamingHttpResponse(
+                iter_task_progress_events(params["task_id"], version), content_type=self.EVENT_STREAM
+            )
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"
+            return response
+
+        return Response(wait_task_progress(params["task_id"], params["version"], params.get("timeout")))
+
+
+class OpenAPISchemaView(APIView):
+    """
+    OpenAPI 文档，通过 ResourceRouter.register_openapi_schema 注册
+    返回 build_openapi_schema 命令预生成的文件，DEBUG 模式下始终实时生成，即使已存在预生成的文件
+    通过 ?format=yaml 或请求头 Accept: application/yaml 获取 YAML 格式，携带 ?v=<哈希> 时响应可长期缓存
+    权限均为 AllowAny 时响应允许共享缓存（public），否则仅允许客户端缓存（private）
+    """
+
+    swagger_schema = None
+
+    # 携带哈希时的缓存时间
+    IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+    def perform_content_negotiation(self, request, force=False):
+        """
+        文档内容直接返回，不使用 Renderer
+        """
+        return super().perform_content_negotiation(request, force=True)
+
+    @staticmethod
+    def get_schema_format(request) -> str:
+        schema_format = request.query_params.get("format")
+        if schema_format in OpenAPISchemaFormat.CHOICES:
+            return schema_format
+        if OpenAPISchemaFormat.YAML in request.META.get("HTTP_ACCEPT", ""):
+            return OpenAPISchemaFormat.YAML
+        return OpenAPISchemaFormat.JSON
+
+    def get(self, request, *args, **kwargs):
+        schema_format = self.get_schema_format(request)
+        content_type = OpenAPISchemaFormat.CONTENT_TYPES[schema_format]
+
+        if settings.DEBUG:
+            response = HttpResponse(encode_schema(generate_schema(request), schema_format), content_type=content_type)
+            response["Cache-Control"] = "no-cache"
+            return response
+
+        prebuilt = load_prebuilt_schema(schema_format)
+        if prebuilt is None:
+            raise NotFound(gettext("OpenAPI 文档未生成，请先执行 build_openapi_schema 命令"))
+        content, schema_hash = prebuilt
+        response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = '"{}-{}"'.format(schema_hash, schema_format)
+        response["Vary"] = "Accept"
+        cache_scope = "public" if self.is_public() else "private"
+        if request.query_params.get("v") == schema_hash:
+            response["Cache-Control"] = "{}, max-age={}, immutable".format(cache_scope, self.IMMUTABLE_MAX_AGE)
+        else:
+            response["Cache-Control"] = "{}, max-age={}".format(
+                cache_scope, bk_resource_settings.OPENAPI_SCHEMA_MAX_AGE
+            )
+        return conditional_response(request, response)
+
+    def is_public(self) -> bool:
+        """
+        文档是否无需鉴权即可访问，需要鉴权时不能被代理等共享缓存保存
+        """
+        return all(isinstance(permission, AllowAny) for permission in self.get_permissions())
@@ -48,5 +48,10 @@ setup(
         "django-rest-framework-condition>=0.1.1",
         "celery>=4.4.0",
     ],
+    extras_require={
+        "orjson": ["orjson>=3.6.0"],
+        "ujson": ["ujson>=5.0.0"],
+        "zstd": ["zstandard>=0.18.0"],
+    },
     include_package_data=True,
 )
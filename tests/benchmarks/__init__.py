@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+__doc__ = """
+基准测试，覆盖 Resource 调用、数据校验、缓存、批量请求及视图分发等路径
+
+执行全部基准测试并保存为基线 tests/benchmarks/baselines/main.json
+    python -m tests.benchmarks run --save main
+
+修改后执行并与基线对比，耗时增加超过 20% 时返回非 0
+    python -m tests.benchmarks run --compare main --threshold 0.2
+
+对比两个已保存的结果
+    python -m tests.benchmarks compare main feature
+
+基准测试通过 tests.benchmarks.runner.benchmark 注册，被注册的函数为生成器，yield 待测函数
+"""
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import argparse
+import os
+import sys
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+    os.environ.setdefault("BK_APP_CONFIG_PATH", "tests.config")
+
+    import django
+
+    django.setup()
+
+
+def format_result(name: str, result: dict) -> str:
+    if result is None:
+        return "{:<36}skipped".format(name)
+    return "{:<36}{:>12.3f}us {:>12.3f}us {:>12.1f}/s".format(name, result["median"], result["stdev"], result["ops"])
+
+
+def print_comparison(rows: list) -> bool:
+    """
+    输出对比结果，返回是否存在退化
+    """
+    print("{:<36}{:>14}{:>14}{:>10}".format("name", "baseline(us)", "current(us)", "ratio"))
+    for row in rows:
+        print(
+            "{:<36}{:>14}{:>14}{:>10}{}".format(
+                row["name"],
+                "-" if row["baseline"] is None else "{:.3f}".format(row["baseline"]),
+                "{:.3f}".format(row["current"]),
+                "-" if row["ratio"] is None else "{:.3f}".format(row["ratio"]),
+                "  REGRESSION" if row["regression"] else "",
+            )
+        )
+    return any(row["regression"] for row in rows)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks", description="bk_resource benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="执行基准测试")
+    run_parser.add_argument("patterns", nargs="*", help="名称匹配规则，支持通配符，如 cache.*")
+    run_parser.add_argument("--rounds", type=int, default=5, help="重复轮数")
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="每轮最短耗时（s）")
+    run_parser.add_argument("--save", help="保存结果的基线名称或文件路径")
+    run_parser.add_argument("--compare", help="对比的基线名称或文件路径")
+    run_parser.add_argument("--threshold", type=float, default=0.2, help="耗时增加超过该比例视为退化")
+
+    compare_parser = subparsers.add_parser("compare", help="对比两次结果")
+    compare_parser.add_argument("baseline", help="基线名称或文件路径")
+    compare_parser.add_argument("current", help="当前结果名称或文件路径")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="耗时增加超过该比例视为退化")
+
+    args = parser.parse_args(argv)
+    setup_django()
+
+    from tests.benchmarks.runner import (
+        compare_results,
+        load_baseline,
+        run_benchmarks,
+        save_baseline,
+    )
+
+    if args.command == "compare":
+        rows = compare_results(load_baseline(args.baseline), load_baseline(args.current), args.threshold)
+        return 1 if print_comparison(rows) else 0
+
+    print("{:<36}{:>14} {:>14} {:>14}".format("name", "median", "stdev", "ops"))
+    current = run_benchmarks(
+        args.patterns,
+        report=lambda name, result: print(format_result(name, result), flush=True),
+        rounds=args.rounds,
+        min_time=args.min_time,
+    )
+    if args.save:
+        print("saved to {}".format(save_baseline(current, args.save)))
+    if args.compare:
+        print()
+        return 1 if print_comparison(compare_results(load_baseline(args.compare), current, args.threshold)) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
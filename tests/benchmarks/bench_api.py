@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from bk_resource.contrib.api import APIResource
+from bk_resource.utils.stub_gateway import StubGateway
+from bk_resource.utils.thread_backend import ThreadPool
+from tests.benchmarks.runner import benchmark
+
+BULK_SIZE = 20
+
+
+class StubAPIResource(APIResource):
+    module_name = "stub"
+    base_url = ""
+    method = "GET"
+    action = "/api/stub/"
+
+
+def stub_api(gateway: StubGateway) -> APIResource:
+    resource = StubAPIResource()
+    resource.base_url = gateway.url
+    return resource
+
+
+@benchmark("api.request")
+def bench_api_request():
+    with StubGateway() as gateway:
+        resource = stub_api(gateway)
+        yield lambda: resource(id=1)
+
+
+@benchmark("api.bulk_request")
+def bench_api_bulk_request():
+    with StubGateway() as gateway:
+        resource = stub_api(gateway)
+        request_data = [{"id": index} for index in range(BULK_SIZE)]
+        yield lambda: resource.bulk_request(request_data)
+
+
+@benchmark("thread_pool.apply_async")
+def bench_thread_pool():
+    def run():
+        with ThreadPool(processes=4) as pool:
+            futures = [pool.apply_async(abs, args=(index,)) for index in range(BULK_SIZE)]
+            return [future.get() for future in futures]
+
+    yield run
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import itertools
+from contextlib import nullcontext
+from unittest import mock
+
+from bk_resource.utils import cache as cache_module
+from bk_resource.utils.cache import CacheTypeItem, using_cache
+from tests.benchmarks.runner import SkipBenchmark, benchmark
+
+CACHE_TYPE = CacheTypeItem("benchmark", 60, user_related=False)
+CACHE_DATA = {"results": [{"id": index, "name": "item-%d" % index} for index in range(100)]}
+
+
+def get_redis_cache():
+    """
+    基于 fakeredis 的 django_redis 缓存，依赖未安装时跳过
+    """
+    try:
+        import fakeredis
+        from django_redis.cache import RedisCache
+    except ImportError:
+        raise SkipBenchmark("django_redis and fakeredis are required")
+    return RedisCache(
+        "redis://127.0.0.1:6379/0",
+        {"OPTIONS": {"CONNECTION_POOL_KWARGS": {"connection_class": fakeredis.FakeConnection}}},
+    )
+
+
+def cache_backend(backend=None):
+    """
+    替换 UsingCache 使用的缓存，为空时使用默认配置
+    """
+    if backend is None:
+        return nullcontext()
+    return mock.patch.multiple(cache_module, cache=backend, mem_cache=backend)
+
+
+def cached_func():
+    @using_cache(cache_type=CACHE_TYPE)
+    def get_data(index):
+        return CACHE_DATA
+
+    return get_data
+
+
+def bench_hit(backend=None):
+    with cache_backend(backend):
+        get_data = cached_func()
+        get_data(0)
+        yield lambda: get_data(0)
+
+
+def bench_miss(backend=None):
+    with cache_backend(backend):
+        get_data = cached_func()
+        counter = itertools.count()
+        yield lambda: get_data(next(counter))
+
+
+@benchmark("cache.locmem.hit")
+def bench_locmem_hit():
+    yield from bench_hit()
+
+
+@benchmark("cache.locmem.miss")
+def bench_locmem_miss():
+    yield from bench_miss()
+
+
+@benchmark("cache.redis.hit")
+def bench_redis_hit():
+    yield from bench_hit(get_redis_cache())
+
+
+@benchmark("cache.redis.miss")
+def bench_redis_miss():
+    yield from bench_miss(get_redis_cache())
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.test import Client
+from rest_framework import serializers
+
+from bk_resource import Resource
+from bk_resource.utils.common_utils import count_md5
+from tests.benchmarks.runner import benchmark
+from tests.mock.base import DirectResource
+
+
+class ItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    tags = serializers.ListField(child=serializers.CharField())
+
+
+class LargePayloadRequestSerializer(serializers.Serializer):
+    items = ItemSerializer(many=True)
+
+
+class LargePayloadResource(Resource):
+    RequestSerializer = LargePayloadRequestSerializer
+
+    def perform_request(self, validated_request_data):
+        return len(validated_request_data["items"])
+
+
+@benchmark("resource.call")
+def bench_resource_call():
+    resource = DirectResource()
+    yield resource
+
+
+@benchmark("resource.validate_large_payload")
+def bench_validate_large_payload():
+    resource = LargePayloadResource()
+    items = [{"id": index, "name": "item-%d" % index, "tags": ["a", "b", "c"]} for index in range(1000)]
+    yield lambda: resource(items=items)
+
+
+@benchmark("utils.count_md5")
+def bench_count_md5():
+    data = {"bk_biz_id": 2, "fields": ["bk_host_id", "bk_host_innerip"], "page": {"start": 0, "limit": 500}}
+    yield lambda: count_md5(((), data))
+
+
+@benchmark("viewset.dispatch")
+def bench_viewset_dispatch():
+    client = Client()
+    yield lambda: client.get("/mock/")
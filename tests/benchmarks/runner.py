@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# 对比时使用的统计值
+COMPARE_METRIC = "median"
+
+
+class SkipBenchmark(Exception):
+    """
+    依赖未安装等原因跳过基准测试
+    """
+
+
+class Benchmark:
+    def __init__(self, name: str, setup: Callable[[], Iterator[Callable]]):
+        """
+        :param setup: 生成器函数，yield 待测函数，yield 之后的代码用于清理
+        """
+        self.name = name
+        self.setup = setup
+
+    def run(self, rounds: int = 5, min_time: float = 0.05, number: int = None) -> dict:
+        """
+        执行基准测试，返回单次调用耗时（us）的统计
+        :param rounds: 重复轮数
+        :param min_time: 每轮的最短耗时（s），用于自动确定每轮调用次数
+        :param number: 每轮调用次数，为空时自动确定
+        """
+        fixture = self.setup()
+        target = next(fixture)
+        try:
+            # 预热
+            target()
+            if number is None:
+                number = self._calibrate(target, min_time)
+            timings = [self._time(target, number) / number * 1e6 for _ in range(rounds)]
+        finally:
+            fixture.close()
+        median = statistics.median(timings)
+        return {
+            "rounds": rounds,
+            "number": number,
+            "min": round(min(timings), 3),
+            "median": round(median, 3),
+            "mean": round(statistics.mean(timings), 3),
+            "stdev": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0,
+            "ops": round(1e6 / median, 1) if median else 0,
+        }
+
+    @staticmethod
+    def _time(target: Callable, number: int) -> float:
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                target()
+            return time.perf_counter() - start
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _calibrate(self, target: Callable, min_time: float) -> int:
+        """
+        参考 timeit.Timer.autorange，增加调用次数直到单轮耗时不小于 min_time
+        """
+        number = 1
+        while True:
+            elapsed = self._time(target, number)
+            if elapsed >= min_time or number >= 1000000:
+                return number
+            number *= 10 if elapsed < min_time / 10 else 2
+
+
+BENCHMARKS: Dict[str, Benchmark] = OrderedDict()
+
+
+def benchmark(name: str = None):
+    """
+    注册基准测试
+
+    >>> @benchmark("resource.call")
+    ... def bench_resource_call():
+    ...     yield DirectResource()
+    """
+
+    def decorator(setup):
+        benchmark_name = name or setup.__name__
+        BENCHMARKS[benchmark_name] = Benchmark(benchmark_name, setup)
+        return setup
+
+    return decorator
+
+
+def load_benchmarks() -> Dict[str, Benchmark]:
+    # 导入各模块以注册基准测试
+    from tests.benchmarks import bench_api, bench_cache, bench_resource  # noqa
+
+    return BENCHMARKS
+
+
+def get_environment() -> dict:
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, universal_newlines=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def run_benchmarks(patterns: List[str] = None, report: Callable[[str, dict], None] = None, **kwargs) -> dict:
+    """
+    执行匹配的基准测试
+    :param patterns: 名称匹配规则，支持通配符，为空时执行全部
+    :param report: 每项完成时的回调，参数为名称及结果，跳过时结果为 None
+    """
+    results = OrderedDict()
+    skipped = []
+    for name, item in load_benchmarks().items():
+        if patterns and not any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            continue
+        try:
+            results[name] = item.run(**kwargs)
+        except SkipBenchmark:
+            skipped.append(name)
+        if report is not None:
+            report(name, results.get(name))
+    return {"environment": get_environment(), "results": results, "skipped": skipped}
+
+
+def get_baseline_path(name: str) -> str:
+    """
+    基线名称转换为 baselines 目录下的文件路径，名称本身为路径时直接使用
+    """
+    if os.sep in name or name.endswith(".json"):
+        return name
+    return os.path.join(BASELINE_DIR, "{}.json".format(name))
+
+
+def save_baseline(data: dict, name: str) -> str:
+    path = get_baseline_path(name)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+    return path
+
+
+def load_baseline(name: str) -> dict:
+    with open(get_baseline_path(name), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.2) -> List[dict]:
+    """
+    对比两次结果，耗时增加超过 threshold 比例视为退化
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        row = {"name": name, "current": result[COMPARE_METRIC], "baseline": None, "ratio": None, "regression": False}
+        if base and base[COMPARE_METRIC]:
+            row["baseline"] = base[COMPARE_METRIC]
+            row["ratio"] = round(result[COMPARE_METRIC] / base[COMPARE_METRIC], 3)
+            row["regression"] = row["ratio"] > 1 + threshold
+        rows.append(row)
+    return rows
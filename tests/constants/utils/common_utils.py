@@ -24,6 +24,8 @@ BK_RESOURCE_PACKAGES = [
     "contrib",
     "exceptions",
     "management",
+    "pagination",
+    "renderers",
     "routers",
     "serializers",
     "settings",
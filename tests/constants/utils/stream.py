@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+
+STANDARD_STREAM_DATA = {
+    "result": True,
+    "code": 0,
+    "message": "成功",
+    "data": [{"id": 1, "name": "蓝鲸"}, {"id": 22, "value": 1.5e3}, None, [1, [2]], "text"],
+}
+
+NESTED_STREAM_DATA = {
+    "result": True,
+    "data": {"count": 2, "info": [{"bk_host_id": 1}, {"bk_host_id": 2}]},
+}
@@ -70,3 +70,33 @@ class UserResource(Resource):
 class RequestResource(Resource):
     def perform_request(self, validated_request_data):
         return validated_request_data["_request"]
+
+
+class DepthSerializer(serializers.Serializer):
+    depth = serializers.IntegerField()
+
+
+class RecursiveResource(Resource):
+    RequestSerializer = DepthSerializer
+
+    def perform_request(self, validated_request_data):
+        depth = validated_request_data["depth"]
+        if depth:
+            self(depth=depth - 1)
+        return self.request_serializer.validated_data["depth"]
+
+
+class ProgressResource(Resource):
+    RequestSerializer = DepthSerializer
+
+    def perform_request(self, validated_request_data):
+        self.update_state("PROGRESS", data=validated_request_data["depth"])
+        return validated_request_data["depth"]
+
+
+class ReusableResource(DirectResource):
+    reuse_instance = True
+
+
+class NonReusableResource(DirectResource):
+    reuse_instance = False
@@ -17,6 +17,7 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
+import io
 from unittest.mock import MagicMock
 
 from requests import Request, Response
@@ -82,3 +83,72 @@ class MockErrorSession(MockSession):
     request = Request()
     request.url = "/"
     response.request = request
+
+
+class MockStreamGetAPI(MockAPIResource):
+    action = "/stream_api/"
+    method = "GET"
+    stream = True
+
+
+class MockStreamRawAPI(MockStreamGetAPI):
+    IS_STANDARD_FORMAT = False
+
+
+class MockStreamResponse(Response):
+    def __init__(self, content: bytes, status_code: int = 200):
+        super().__init__()
+        self.status_code = status_code
+        self.raw = io.BytesIO(content)
+        request = Request()
+        request.url = "/"
+        self.request = request
+
+
+class MockStreamSession(MagicMock):
+    content = b'{"result": true, "code": 0, "data": [{"id": 1}, {"id": 2}, {"id": 3}]}'
+
+    def get(self, *args, **kwargs):
+        return MockStreamResponse(self.content)
+
+
+class MockStreamErrorSession(MockStreamSession):
+    content = b'{"result": false, "code": 500, "message": "error", "data": []}'
+
+
+class MockStreamTrailingErrorSession(MockStreamSession):
+    content = b'{"data": [{"id": 1}], "result": false, "code": 500, "message": "error"}'
+
+
+class MockStreamUploadAPI(MockPostAPI):
+    stream_upload = True
+
+
+class MockUserAPI(MockAPIResource):
+    action = "/get_user/"
+    method = "GET"
+    batch_action = "/list_users/"
+    batch_method = "POST"
+    batch_key = "username"
+    batch_param = "usernames"
+    batch_window = 0.5
+    calls = []
+
+    def perform_request(self, validated_request_data):
+        self.calls.append((self.action, self.method, validated_request_data))
+        if "usernames" not in validated_request_data:
+            username = validated_request_data["username"]
+            if username == "missing":
+                raise ValueError(username)
+            return {"username": username, "display_name": username.upper()}
+        return [
+            {"username": username, "display_name": username.upper()}
+            for username in validated_request_data["usernames"]
+            if username != "missing"
+        ]
+
+
+class MockCompressAPI(MockPostAPI):
+    request_compress = "gzip"
+    request_compress_min_size = 100
+    accept_encoding = "gzip, zstd, br"
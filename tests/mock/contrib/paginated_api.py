@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+
+from rest_framework import serializers
+
+from bk_resource.contrib.paginated_api import PaginatedAPIResource, PaginationType
+
+TOTAL_RECORDS = [{"id": i} for i in range(23)]
+
+
+class MockPageAPI(PaginatedAPIResource):
+    base_url = "https://bk.tencent.com/"
+    action = "/page_api/"
+    method = "POST"
+    page_size = 5
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requested = []
+
+    def perform_request(self, validated_request_data):
+        page, page_size = validated_request_data["page"], validated_request_data["page_size"]
+        self.requested.append(page)
+        start = (page - 1) * page_size
+        return {"count": len(TOTAL_RECORDS), "results": TOTAL_RECORDS[start : start + page_size]}
+
+
+class MockOffsetAPI(MockPageAPI):
+    pagination_type = PaginationType.OFFSET
+    page_params_key = "page"
+    results_key = "info"
+
+    def perform_request(self, validated_request_data):
+        start, limit = validated_request_data["page"]["start"], validated_request_data["page"]["limit"]
+        self.requested.append(start)
+        return {"count": len(TOTAL_RECORDS), "info": TOTAL_RECORDS[start : start + limit]}
+
+
+class MockNoTotalAPI(MockPageAPI):
+    results_key = None
+
+    def perform_request(self, validated_request_data):
+        return super().perform_request(validated_request_data)["results"]
+
+
+class MockSerializerPageAPI(MockPageAPI):
+    class RequestSerializer(serializers.Serializer):
+        bk_biz_id = serializers.IntegerField()
+
+    def perform_request(self, validated_request_data):
+        assert validated_request_data["bk_biz_id"] == 2
+        return super().perform_request(validated_request_data)
@@ -16,9 +16,99 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from bk_resource import Resource
+from django.contrib.auth.models import Group
+from rest_framework import serializers
+
+from bk_resource import Resource, pagination
 
 
 class TestResource(Resource):
     def perform_request(self, validated_request_data):
         return None
+
+
+class CountResource(Resource):
+    """
+    记录调用次数，version 为 etag 返回的版本标识
+    """
+
+    count = 0
+    version = None
+
+    def perform_request(self, validated_request_data):
+        CountResource.count += 1
+        return {"count": CountResource.count}
+
+    @classmethod
+    def etag(cls, request, *args, **kwargs):
+        return cls.version
+
+
+class EchoResource(Resource):
+    """
+    返回请求参数，结构为 {"params": ..., "count": ...}
+    """
+
+    def perform_request(self, validated_request_data):
+        params = {key: validated_request_data[key] for key in validated_request_data}
+        return {"params": params, "count": len(params)}
+
+
+class StreamResource(Resource):
+    """
+    逐条返回 count 条数据，fail_at 不为空时在该位置抛出异常
+    """
+
+    class RequestSerializer(serializers.Serializer):
+        count = serializers.IntegerField(default=0)
+        fail_at = serializers.IntegerField(default=None, allow_null=True)
+
+    class ResponseSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+
+    def perform_request(self, validated_request_data):
+        for index in range(validated_request_data["count"]):
+            if index == validated_request_data["fail_at"]:
+                raise ValueError("stream failed")
+            yield {"id": index}
+
+
+class GroupSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class CursorGroupResource(pagination.PaginatedResource):
+    """
+    按 name、id 游标分页
+    """
+
+    ResponseSerializer = GroupSerializer
+    many_response_data = True
+    cursor_ordering = ("name", "id")
+    page_size = 2
+
+    def perform_request(self, validated_request_data):
+        return self.paginate_queryset(Group.objects.all(), validated_request_data["_page"])
+
+
+class PageGroupResource(CursorGroupResource):
+    """
+    按页码分页
+    """
+
+    pagination_mode = pagination.PaginationMode.PAGE
+
+    def perform_request(self, validated_request_data):
+        return self.paginate_queryset(Group.objects.order_by("id"), validated_request_data["_page"])
+
+
+class ValuesGroupResource(CursorGroupResource):
+    """
+    使用默认的 pk 排序，返回字典
+    """
+
+    cursor_ordering = ("pk",)
+
+    def perform_request(self, validated_request_data):
+        return self.paginate_queryset(Group.objects.values("id", "name"), validated_request_data["_page"])
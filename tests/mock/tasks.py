@@ -46,6 +46,12 @@ class AsyncResultMock(mock.MagicMock):
         return self.data
 
 
+class AsyncResultSuccessMock(AsyncResultMock):
+    @property
+    def state(self):
+        return "SUCCESS"
+
+
 class AsyncResultResultFailedMock(AsyncResultMock):
     @property
     def info(self):
@@ -21,5 +21,8 @@ from tests.mock import views
 
 router = ResourceRouter()
 router.register_module(views)
+router.register_batch()
+router.register_task_progress()
+router.register_openapi_schema()
 
 urlpatterns = router.urls
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from bk_resource import Resource
+from bk_resource.contrib.cache import CacheResource
+from bk_resource.utils.cache import CacheTypeItem
+from bk_resource.utils.thread_backend import ThreadPool
+from tests.mock.contrib.api import MockGetAPI
+
+
+class ProfileCacheResource(CacheResource):
+    cache_type = CacheTypeItem("profile", 60, user_related=False)
+
+    def perform_request(self, validated_request_data):
+        return 1
+
+
+class ProfileLeafResource(Resource):
+    def perform_request(self, validated_request_data):
+        return validated_request_data
+
+
+class ProfileParentResource(Resource):
+    def perform_request(self, validated_request_data):
+        ProfileCacheResource()()
+        ProfileCacheResource()()
+        MockGetAPI()()
+        leaf = ProfileLeafResource()
+        with ThreadPool(processes=2) as pool:
+            results = [pool.apply_async(leaf, kwds={"index": index}) for index in range(2)]
+            return [result.get() for result in results]
@@ -17,6 +17,7 @@ to the current version of the project delivered to anyone in the future.
 """
 
 from bk_resource import resource
+from bk_resource.utils.response_cache import ResponseCache
 from bk_resource.viewsets import ResourceRoute, ResourceViewSet
 
 
@@ -24,3 +25,38 @@ class MockViewSet(ResourceViewSet):
     resource_routes = [
         ResourceRoute("GET", resource.mock.test),
     ]
+
+
+class MockCacheViewSet(ResourceViewSet):
+    resource_routes = [
+        ResourceRoute("GET", resource.mock.count, cache=60),
+        ResourceRoute(
+            "GET",
+            resource.mock.count,
+            endpoint="query",
+            cache=ResponseCache(vary_query_params=["id"]),
+            enable_field_selection=True,
+        ),
+    ]
+
+
+class MockStreamViewSet(ResourceViewSet):
+    resource_routes = [
+        ResourceRoute("GET", resource.mock.stream, stream_format="auto", enable_field_selection=True),
+        ResourceRoute("GET", resource.mock.stream, endpoint="rows"),
+        ResourceRoute("GET", resource.mock.stream, endpoint="ndjson", stream_format="ndjson"),
+    ]
+
+
+class MockPageViewSet(ResourceViewSet):
+    resource_routes = [
+        ResourceRoute("GET", resource.mock.cursor_group, enable_paginate=True, enable_field_selection=True),
+        ResourceRoute("GET", resource.mock.page_group, endpoint="page", enable_paginate=True),
+    ]
+
+
+class MockEchoViewSet(ResourceViewSet):
+    resource_routes = [
+        ResourceRoute("GET", resource.mock.echo),
+        ResourceRoute("GET", resource.mock.echo, endpoint="selected", enable_field_selection=True),
+    ]
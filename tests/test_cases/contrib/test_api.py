@@ -16,12 +16,22 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import gzip
+import io
+import json
+import threading
+import time
+import types
 from unittest import mock
 
 from django.test import TestCase
+from rest_framework import serializers
 
-from bk_resource.exceptions import APIRequestError
+from bk_resource.exceptions import APIRequestError, ValidateException
+from bk_resource.utils.multipart import MultipartEncoder
+from bk_resource.utils.profiler import profile_resources
 from tests.mock.contrib.api import (
+    MockCompressAPI,
     MockErrorSession,
     MockGetAPI,
     MockGetError,
@@ -29,6 +39,13 @@ from tests.mock.contrib.api import (
     MockGetTypeError,
     MockPostAPI,
     MockSession,
+    MockStreamErrorSession,
+    MockStreamGetAPI,
+    MockStreamRawAPI,
+    MockStreamSession,
+    MockStreamTrailingErrorSession,
+    MockStreamUploadAPI,
+    MockUserAPI,
 )
 
 
@@ -41,6 +58,16 @@ class TestAPIResource(TestCase):
     def test_post_request(self):
         MockPostAPI().request(username="admin")
 
+    def test_stream_upload(self):
+        session = MockSession()
+        with mock.patch("bk_resource.contrib.api.requests.session", return_value=session):
+            with mock.patch.object(session, "request", wraps=session.request) as request:
+                MockStreamUploadAPI().request(username="admin", file=io.BytesIO(b"content"))
+        kwargs = request.call_args.kwargs
+        self.assertIsInstance(kwargs["data"], MultipartEncoder)
+        self.assertNotIn("files", kwargs)
+        self.assertEqual(kwargs["headers"]["Content-Type"], kwargs["data"].content_type)
+
     @mock.patch("bk_resource.contrib.api.requests.session", MockErrorSession)
     def test_http_error(self):
         with self.assertRaises(APIRequestError):
@@ -57,3 +84,203 @@ class TestAPIResource(TestCase):
     def test_result_false(self):
         with self.assertRaises(APIRequestError):
             MockGetResultFalse().request()
+
+
+class TestStreamAPIResource(TestCase):
+    @mock.patch("bk_resource.contrib.api.requests.session", MockStreamSession)
+    def test_stream_items(self):
+        result = MockStreamGetAPI().request()
+        self.assertIsInstance(result, types.GeneratorType)
+        self.assertEqual(list(result), [{"id": 1}, {"id": 2}, {"id": 3}])
+
+    @mock.patch("bk_resource.contrib.api.requests.session", MockStreamSession)
+    def test_stream_raw(self):
+        result = MockStreamRawAPI().request()
+        self.assertEqual(b"".join(result), MockStreamSession.content)
+
+    @mock.patch("bk_resource.contrib.api.requests.session", MockStreamErrorSession)
+    def test_stream_result_false(self):
+        with self.assertRaises(APIRequestError):
+            list(MockStreamGetAPI().request())
+
+    @mock.patch("bk_resource.contrib.api.requests.session", MockStreamTrailingErrorSession)
+    def test_stream_trailing_result_false(self):
+        with self.assertRaises(APIRequestError):
+            list(MockStreamGetAPI().request())
+
+    @mock.patch("bk_resource.contrib.api.requests.session", MockStreamSession)
+    def test_stream_validate_items(self):
+        class ItemSerializer(serializers.Serializer):
+            id = serializers.IntegerField(max_value=2)
+
+        class StreamAPI(MockStreamGetAPI):
+            ResponseSerializer = ItemSerializer
+
+        result = StreamAPI().request()
+        self.assertEqual(next(result), {"id": 1})
+        self.assertEqual(next(result), {"id": 2})
+        with self.assertRaises(ValidateException):
+            next(result)
+
+
+class TestBatchAPIResource(TestCase):
+    def setUp(self) -> None:
+        MockUserAPI.calls = []
+
+    def test_load_many(self):
+        result = MockUserAPI().load_many([{"username": "a"}, {"username": "b"}, {"username": "a"}])
+        self.assertEqual([item["display_name"] for item in result], ["A", "B", "A"])
+        self.assertEqual(MockUserAPI.calls, [("/list_users/", "POST", {"usernames": ["a", "b"]})])
+
+    def test_bulk_request(self):
+        result = MockUserAPI().bulk_request([{"username": "a"}, {"username": "missing"}])
+        self.assertEqual(result, [{"username": "a", "display_name": "A"}, None])
+        self.assertEqual(len(MockUserAPI.calls), 1)
+
+    def test_bulk_request_fallback(self):
+        # 公共参数不一致时逐个请求
+        result = MockUserAPI().bulk_request([{"username": "a", "x": 1}, {"username": "b", "x": 2}])
+        self.assertEqual([item["display_name"] for item in result], ["A", "B"])
+        self.assertEqual({call[0] for call in MockUserAPI.calls}, {"/get_user/"})
+
+        result = MockUserAPI().bulk_request(
+            [{"username": "a", "x": 1}, {"username": "missing", "x": 2}], ignore_exceptions=True
+        )
+        self.assertEqual(result[1], None)
+        with self.assertRaises(ValueError):
+            MockUserAPI().bulk_request([{"username": "a", "x": 1}, {"username": "missing", "x": 2}])
+
+    def test_bulk_request_ignore_exceptions(self):
+        class UserAPI(MockUserAPI):
+            class ResponseSerializer(serializers.Serializer):
+                username = serializers.CharField()
+
+        with self.assertRaises(ValidateException):
+            UserAPI().bulk_request([{"username": "a"}, {"username": "missing"}])
+        result = UserAPI().bulk_request([{"username": "a"}, {"username": "missing"}], ignore_exceptions=True)
+        self.assertEqual(result, [{"username": "a"}, None])
+
+    def test_bulk_request_log(self):
+        # bulk_request 及合并后的批量请求各记录一次
+        with mock.patch("bk_resource.base.record_request_log") as record_request_log:
+            MockUserAPI().bulk_request([{"username": "a"}, {"username": "b"}])
+        self.assertEqual(
+            [call[0][0] for call in record_request_log.call_args_list],
+            ["tests.mock.contrib.api.MockUserAPIBatch", "tests.mock.contrib.api.MockUserAPI"],
+        )
+
+    def test_load_instrumented(self):
+        with mock.patch("bk_resource.base.record_request_log") as record_request_log:
+            with profile_resources("test") as profile:
+                MockUserAPI().load(username="a")
+        self.assertEqual(record_request_log.call_count, 1)
+        self.assertEqual(record_request_log.call_args[0][3]["args"][0]["usernames"], ["a"])
+        self.assertEqual(
+            [child["name"] for child in profile.to_dict()["children"]], ["tests.mock.contrib.api.MockUserAPIBatch"]
+        )
+
+    def test_split_batch_response(self):
+        self.assertEqual(
+            MockUserAPI.split_batch_response([1, 2], {"1": {"id": 1}, "3": {"id": 3}}), {1: {"id": 1}, 2: None}
+        )
+
+        class PathUserAPI(MockUserAPI):
+            batch_results_path = "data.info"
+
+        response_data = {"data": {"info": [{"username": "a"}], "count": 1}}
+        self.assertEqual(PathUserAPI.split_batch_response(["a"], response_data), {"a": {"username": "a"}})
+
+    def test_collect(self):
+        resource = MockUserAPI()
+        with resource.collect() as collector:
+            futures = [collector.load(username=name) for name in "abc"]
+            self.assertFalse(MockUserAPI.calls)
+        self.assertEqual([future.result()["display_name"] for future in futures], ["A", "B", "C"])
+        self.assertEqual(MockUserAPI.calls, [("/list_users/", "POST", {"usernames": ["a", "b", "c"]})])
+
+    def test_load_without_concurrent_calls(self):
+        start = time.perf_counter()
+        MockUserAPI().load(username="a")
+        self.assertLess(time.perf_counter() - start, MockUserAPI.batch_window)
+
+    def test_load_many_chunks(self):
+        class ChunkUserAPI(MockUserAPI):
+            batch_max_size = 2
+
+        ChunkUserAPI().load_many([{"username": name} for name in "abc"])
+        self.assertEqual([call[2]["usernames"] for call in MockUserAPI.calls], [["a", "b"], ["c"]])
+
+    def test_load_many_params_conflict(self):
+        with self.assertRaises(ValueError):
+            MockUserAPI().load_many([{"username": "a", "x": 1}, {"username": "b", "x": 2}])
+
+    def test_load_concurrent(self):
+        entered, release = threading.Event(), threading.Event()
+
+        class BlockingUserAPI(MockUserAPI):
+            def perform_request(self, validated_request_data):
+                if validated_request_data.get("usernames") == ["blocker"]:
+                    entered.set()
+                    release.wait(5)
+                return super().perform_request(validated_request_data)
+
+        resource = BlockingUserAPI()
+        results = {}
+
+        def load(username):
+            results[username] = resource.load(username=username)
+
+        # 占用批量加载器，模拟存在其他并发调用
+        blocker = threading.Thread(target=load, args=("blocker",))
+        blocker.start()
+        entered.wait(5)
+
+        threads = [threading.Thread(target=load, args=(name,)) for name in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        release.set()
+        blocker.join()
+
+        usernames = sorted(sorted(call[2]["usernames"]) for call in MockUserAPI.calls)
+        self.assertEqual(usernames, [["a", "b", "c", "d"], ["blocker"]])
+        self.assertEqual({name: results[name]["display_name"] for name in "abcd"}, dict(zip("abcd", "ABCD")))
+
+    def test_not_declared(self):
+        with self.assertRaises(NotImplementedError):
+            MockGetAPI().load(username="a")
+
+
+class TestCompressAPIResource(TestCase):
+    def request(self, resource_class, **kwargs):
+        session = MockSession()
+        with mock.patch("bk_resource.contrib.api.requests.session", return_value=session):
+            with mock.patch.object(session, "request", wraps=session.request) as request:
+                resource_class().request(**kwargs)
+        return request.call_args.kwargs
+
+    def test_compress(self):
+        data = {"ids": list(range(100))}
+        kwargs = self.request(MockCompressAPI, **data)
+        self.assertNotIn("json", kwargs)
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(kwargs["data"])), data)
+
+    def test_below_min_size(self):
+        kwargs = self.request(MockCompressAPI, id=1)
+        self.assertEqual(kwargs["json"], {"id": 1})
+        self.assertNotIn("Content-Encoding", kwargs["headers"])
+
+    @mock.patch("bk_resource.utils.compress.zstandard", None)
+    def test_unsupported(self):
+        class ZstdAPI(MockCompressAPI):
+            request_compress = "zstd"
+
+        kwargs = self.request(ZstdAPI, ids=list(range(100)))
+        self.assertIn("json", kwargs)
+
+    def test_accept_encoding(self):
+        kwargs = self.request(MockCompressAPI, id=1)
+        # 当前环境无法解压的编码会被移除
+        self.assertTrue(kwargs["headers"]["Accept-Encoding"].startswith("gzip"))
@@ -78,8 +78,61 @@ class TestBkApiResource(TestCase):
                     "blueking-language": "zh-Hans",
                     "cookie": "username=admin",
                     "x-bkapi-authorization": (
-                        f'{{"bk_app_code": "{settings.APP_CODE}", "bk_app_secret": "{settings.SECRET_KEY}"}}'
+                        f'{{"bk_app_code":"{settings.APP_CODE}","bk_app_secret":"{settings.SECRET_KEY}"}}'
                     ),
                 }
             },
         )
+
+
+class TestAuthorizationHeaderCache(TestCase):
+    def setUp(self):
+        MockApiResource.clear_authorization_header_cache()
+
+    @mock.patch("bk_resource.contrib.bk_api.is_backend", mock.Mock(return_value=True))
+    def test_backend(self):
+        resource = MockApiResource()
+        with mock.patch.object(
+            MockApiResource, "add_esb_info_before_request", wraps=resource.add_esb_info_before_request
+        ) as add_esb_info:
+            header = resource.build_authorization_header()
+            self.assertEqual(MockApiResource().build_authorization_header(), header)
+            self.assertEqual(add_esb_info.call_count, 1)
+
+    @mock.patch("bk_resource.contrib.bk_api.is_backend", mock.Mock(return_value=True))
+    def test_settings_changed(self):
+        header = MockPlatformAuth().build_authorization_header()
+        with override_settings(
+            BK_RESOURCE={"PLATFORM_AUTH_ENABLED": True, "PLATFORM_AUTH_ACCESS_USERNAME": "admin"}
+        ):
+            platform_header = MockPlatformAuth().build_authorization_header()
+            self.assertIn('"bk_username":"admin"', platform_header)
+        self.assertNotEqual(header, platform_header)
+        self.assertEqual(MockPlatformAuth().build_authorization_header(), header)
+
+    @mock.patch("bk_resource.contrib.bk_api.is_backend", mock.Mock(return_value=False))
+    def test_request(self):
+        request = MockRequest()
+        resource = MockApiResource()
+        with mock.patch.object(
+            MockApiResource, "add_esb_info_before_request", wraps=resource.add_esb_info_before_request
+        ) as add_esb_info:
+            header = resource.build_authorization_header(request)
+            self.assertEqual(resource.build_authorization_header(request), header)
+            self.assertEqual(add_esb_info.call_count, 1)
+            resource.build_authorization_header(MockRequest())
+            self.assertEqual(add_esb_info.call_count, 2)
+        self.assertIn('"bk_username":"admin"', header)
+
+    @mock.patch("bk_resource.contrib.bk_api.is_backend", mock.Mock(return_value=True))
+    def test_disabled(self):
+        class NoCacheResource(MockApiResource):
+            cache_authorization_header = False
+
+        resource = NoCacheResource()
+        with mock.patch.object(
+            NoCacheResource, "add_esb_info_before_request", wraps=resource.add_esb_info_before_request
+        ) as add_esb_info:
+            resource.build_authorization_header()
+            resource.build_authorization_header()
+            self.assertEqual(add_esb_info.call_count, 2)
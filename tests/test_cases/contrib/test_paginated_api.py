@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+
+from unittest import mock
+
+from django.test import TestCase
+
+from bk_resource.utils.profiler import profile_resources
+
+from tests.mock.contrib.paginated_api import (
+    TOTAL_RECORDS,
+    MockNoTotalAPI,
+    MockOffsetAPI,
+    MockPageAPI,
+    MockSerializerPageAPI,
+)
+
+
+class TestPaginatedAPIResource(TestCase):
+    def test_iter_records(self):
+        resource = MockPageAPI()
+        records = resource.iter_records(bk_biz_id=2)
+        self.assertEqual(next(records), TOTAL_RECORDS[0])
+        # 惰性请求，仅请求了首页
+        self.assertEqual(resource.requested, [1])
+        self.assertEqual(list(records), TOTAL_RECORDS[1:])
+        self.assertEqual(resource.requested, [1, 2, 3, 4, 5])
+
+    def test_request_all_concurrent(self):
+        resource = MockPageAPI()
+        resource.max_workers = 2
+        self.assertEqual(resource.request_all({"bk_biz_id": 2}), TOTAL_RECORDS)
+        self.assertEqual(sorted(resource.requested), [1, 2, 3, 4, 5])
+
+    def test_offset(self):
+        resource = MockOffsetAPI()
+        self.assertEqual(resource.request_all(), TOTAL_RECORDS)
+        self.assertEqual(sorted(resource.requested), [0, 5, 10, 15, 20])
+
+    def test_without_total(self):
+        resource = MockNoTotalAPI()
+        self.assertEqual(resource.request_all(concurrent=True), TOTAL_RECORDS)
+        self.assertEqual(resource.requested, [1, 2, 3, 4, 5])
+
+    def test_pages(self):
+        pages = list(MockPageAPI().iter_pages())
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+
+    def test_request_serializer(self):
+        # 分页参数未在 RequestSerializer 中声明
+        resource = MockSerializerPageAPI()
+        self.assertEqual(resource.request_all({"bk_biz_id": 2}), TOTAL_RECORDS)
+        self.assertEqual(sorted(resource.requested), [1, 2, 3, 4, 5])
+
+    def test_instrumented(self):
+        # 每页记录调用分析节点及请求日志
+        with mock.patch("bk_resource.base.record_request_log") as record_request_log:
+            with profile_resources("test") as profile:
+                MockPageAPI().request_all({"bk_biz_id": 2}, concurrent=False)
+        self.assertEqual(record_request_log.call_count, 5)
+        self.assertEqual(record_request_log.call_args[0][0], "tests.mock.contrib.paginated_api.MockPageAPI")
+        self.assertEqual(record_request_log.call_args[0][3]["args"][0]["bk_biz_id"], 2)
+        children = profile.to_dict()["children"]
+        self.assertEqual([child["name"] for child in children], ["tests.mock.contrib.paginated_api.MockPageAPI"] * 5)
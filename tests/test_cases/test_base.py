@@ -16,17 +16,24 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from django.test import TestCase
+from unittest import mock
+
+from django.test import TestCase, override_settings
 from rest_framework import serializers
 
 from bk_resource import Resource
 from bk_resource.exceptions import ValidateException
+from bk_resource.utils.field_selection import FieldSelection
 from tests.mock import base
 from tests.mock.base import (
     DirectResource,
     ErrorResource,
     NonCollectorResource,
+    NonReusableResource,
+    ProgressResource,
+    RecursiveResource,
     RequestResource,
+    ReusableResource,
     UserResource,
 )
 from tests.mock.models import User
@@ -37,6 +44,50 @@ class ResourceTest(TestCase):
         result = DirectResource()()
         self.assertEqual(result, None)
 
+    def test_call_instantiation(self):
+        _resource = DirectResource()
+        with mock.patch.object(DirectResource, "__init__", autospec=True, side_effect=Resource.__init__) as init:
+            _resource()
+            init.assert_called_once_with(mock.ANY, context=None)
+
+    @override_settings(BK_RESOURCE={"RESOURCE_REUSE_INSTANCE": True})
+    def test_call_without_instantiation(self):
+        _resource = DirectResource()
+        with mock.patch.object(DirectResource, "__init__") as init:
+            _resource()
+            init.assert_not_called()
+
+    def test_reuse_instance_attribute(self):
+        _resource = ReusableResource()
+        with mock.patch.object(ReusableResource, "__init__") as init:
+            _resource()
+            init.assert_not_called()
+        with override_settings(BK_RESOURCE={"RESOURCE_REUSE_INSTANCE": True}):
+            self.assertFalse(NonReusableResource.is_reusable())
+
+    @override_settings(BK_RESOURCE={"RESOURCE_REUSE_INSTANCE": True})
+    def test_call_context(self):
+        _resource = RecursiveResource()
+        # 嵌套调用不影响外层调用的状态
+        self.assertEqual(_resource(depth=2), 2)
+        # 多线程共享实例
+        self.assertEqual(_resource.bulk_request([{"depth": 1}, {"depth": 3}, {"depth": 0}]), [1, 3, 0])
+
+    def test_bulk_request_call_context(self):
+        # 工作线程继承字段选择
+        _resource = UserResource()
+        with _resource.call_scope(field_selection=FieldSelection(fields=["username"])):
+            result = _resource.bulk_request([{"username": "a", "resp_type": "dict"}, {"username": "b"}])
+        self.assertEqual(result, [{"username": "a"}, {"username": "b"}])
+
+        # 工作线程继承异步任务
+        _resource = ProgressResource()
+        task_manager = mock.MagicMock()
+        task_manager.request.id = None
+        with _resource.call_scope(task_manager=task_manager):
+            self.assertEqual(_resource.bulk_request([{"depth": 1}, {"depth": 2}]), [1, 2])
+        self.assertEqual(task_manager.update_state.call_count, 2)
+
     def test_none_support_data_collect(self):
         result = NonCollectorResource()()
         self.assertEqual(result, None)
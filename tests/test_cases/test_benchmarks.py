@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import os
+import tempfile
+
+from django.test import TestCase
+
+from tests.benchmarks.runner import (
+    compare_results,
+    load_baseline,
+    load_benchmarks,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+class TestBenchmarks(TestCase):
+    def test_run(self):
+        # 单元测试中仅执行一项耗时较短的基准测试
+        data = run_benchmarks(["utils.count_md5"], rounds=1, number=1)
+        self.assertEqual(list(data["results"]), ["utils.count_md5"])
+        self.assertEqual(data["results"]["utils.count_md5"]["number"], 1)
+        self.assertTrue(data["results"]["utils.count_md5"]["median"] > 0)
+
+    def test_default_baseline(self):
+        # 提交的基线应覆盖全部基准测试
+        baseline = load_baseline("default")
+        self.assertEqual(set(baseline["results"]), set(load_benchmarks()))
+
+    def test_compare(self):
+        baseline = {"results": {"a": {"median": 10}, "b": {"median": 10}}}
+        current = {"results": {"a": {"median": 11}, "b": {"median": 13}, "c": {"median": 1}}}
+        rows = {row["name"]: row for row in compare_results(baseline, current, threshold=0.2)}
+        self.assertFalse(rows["a"]["regression"])
+        self.assertTrue(rows["b"]["regression"])
+        self.assertEqual(rows["b"]["ratio"], 1.3)
+        self.assertIsNone(rows["c"]["baseline"])
+
+    def test_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            data = {"results": {"a": {"median": 10}}}
+            self.assertEqual(save_baseline(data, path), path)
+            self.assertEqual(load_baseline(path), data)
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+
+from django.contrib.auth.models import Group, User
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+
+from bk_resource import resource
+from bk_resource.exceptions import ValidateException
+from bk_resource.pagination import Page, PageRequest, PaginationMode, decode_cursor, encode_cursor
+
+# resource 自动发现时以 mock.resources 导入，需使用同一个类
+CursorGroupResource = resource.mock.cursor_group.__class__
+PageGroupResource = resource.mock.page_group.__class__
+
+GROUP_NAMES = ["b", "a", "c", "a2", "b2"]
+
+
+class TestCursor(TestCase):
+    def test_encode(self):
+        values = {"name": "测试", "id": 1}
+        self.assertEqual(decode_cursor(encode_cursor(values)), values)
+
+    def test_encode_datetime(self):
+        values = {
+            "created_at": datetime.datetime(2023, 1, 1, 8, 0, 0, 123456, tzinfo=datetime.timezone.utc),
+            "date": datetime.date(2023, 1, 1),
+            "id": 1,
+        }
+        # 保留微秒及时区
+        self.assertEqual(decode_cursor(encode_cursor(values)), values)
+
+    def test_invalid(self):
+        for cursor in ["invalid", encode_cursor([1])[:-1], "W10"]:
+            with self.assertRaises(ValidateException):
+                decode_cursor(cursor)
+
+
+class TestPage(TestCase):
+    def test_page_dict(self):
+        page = Page([1, 2], PageRequest(PaginationMode.PAGE, page=2, page_size=2), total=5)
+        self.assertEqual(page.to_dict(), {"page": 2, "num_pages": 3, "total": 5, "results": [1, 2]})
+        self.assertTrue(page.has_next)
+
+    def test_cursor_dict(self):
+        page = Page([1], PageRequest(), next_cursor="next")
+        self.assertEqual(
+            page.to_dict(),
+            {"next_cursor": "next", "has_next": True, "total": None, "total_is_estimated": False, "results": [1]},
+        )
+
+
+class TestPaginatedResource(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.bulk_create([Group(name=name) for name in GROUP_NAMES])
+
+    def test_build_page_request(self):
+        page_request = CursorGroupResource().build_page_request({"page_size": "5000", "with_total": "true"})
+        self.assertEqual(page_request.page_size, CursorGroupResource.max_page_size)
+        self.assertTrue(page_request.with_total)
+        page_request = CursorGroupResource().build_page_request({"page_size": "invalid"})
+        self.assertEqual(page_request.page_size, CursorGroupResource.page_size)
+        self.assertFalse(page_request.with_total)
+        # PAGE 模式始终计算总数
+        self.assertTrue(PageGroupResource().build_page_request({}).with_total)
+
+    def test_cursor(self):
+        names = []
+        cursor = None
+        while True:
+            data = resource.mock.cursor_group({"cursor": cursor} if cursor else {})
+            self.assertLessEqual(len(data.results), CursorGroupResource.page_size)
+            names.extend(item["name"] for item in data.results)
+            cursor = data.next_cursor
+            if not data.has_next:
+                break
+        self.assertEqual(names, sorted(GROUP_NAMES))
+
+    def test_cursor_pk(self):
+        data = resource.mock.values_group()
+        self.assertEqual(decode_cursor(data.next_cursor), {"id": data.results[-1]["id"]})
+        data = resource.mock.values_group(cursor=data.next_cursor)
+        self.assertEqual([item["name"] for item in data.results], GROUP_NAMES[2:4])
+
+    def test_cursor_datetime(self):
+        # 同一秒内的多条数据
+        date_joined = timezone.now().replace(microsecond=0)
+        User.objects.bulk_create(
+            [
+                User(username=str(index), date_joined=date_joined + datetime.timedelta(microseconds=index * 1000))
+                for index in range(3)
+            ]
+        )
+        _resource = CursorGroupResource()
+        _resource.cursor_ordering = ("-date_joined", "id")
+        usernames = []
+        cursor = None
+        while True:
+            page = _resource.paginate_queryset(User.objects.all(), PageRequest(page_size=1, cursor=cursor))
+            usernames.extend(user.username for user in page.results)
+            cursor = page.next_cursor
+            if not page.has_next:
+                break
+        self.assertEqual(usernames, ["2", "1", "0"])
+
+    def test_cursor_nullable(self):
+        User.objects.bulk_create([User(username="admin"), User(username="guest")])
+        _resource = CursorGroupResource()
+        # 可为空的模型字段
+        _resource.cursor_ordering = ("last_login", "id")
+        with self.assertRaises(ValueError):
+            _resource.paginate_queryset(User.objects.all(), PageRequest(page_size=1))
+        # 注解等非模型字段在生成游标时检查
+        _resource.cursor_ordering = ("login", "id")
+        with self.assertRaises(ValueError):
+            _resource.paginate_queryset(User.objects.annotate(login=F("last_login")), PageRequest(page_size=1))
+
+    def test_page(self):
+        data = resource.mock.page_group(page=3)
+        self.assertEqual(data.to_dict()["num_pages"], 3)
+        self.assertEqual([item["name"] for item in data.results], GROUP_NAMES[4:])
+        self.assertFalse(data.has_next)
+
+    def test_page_exact_total(self):
+        # PAGE 模式不受 max_count 限制
+        _resource = PageGroupResource()
+        _resource.max_count = 3
+        page = _resource.paginate_queryset(Group.objects.order_by("id"), PageRequest(PaginationMode.PAGE, page_size=2))
+        self.assertEqual(page.total, len(GROUP_NAMES))
+        self.assertEqual(page.to_dict()["num_pages"], 3)
+        self.assertTrue(page.has_next)
+
+    def test_estimated_total(self):
+        _resource = CursorGroupResource()
+        _resource.max_count = 3
+        self.assertEqual(_resource.count_queryset(Group.objects.all()), (3, True))
+        _resource.max_count = None
+        self.assertEqual(_resource.count_queryset(Group.objects.all()), (len(GROUP_NAMES), False))
+
+    def test_view(self):
+        response = self.client.get("/mock_page/", {"with_total": 1})
+        data = response.json()
+        self.assertEqual(len(data["results"]), CursorGroupResource.page_size)
+        self.assertEqual(data["total"], len(GROUP_NAMES))
+        self.assertTrue(data["has_next"])
+
+        response = self.client.get("/mock_page/", {"cursor": data["next_cursor"]})
+        self.assertEqual([item["name"] for item in response.json()["results"]], sorted(GROUP_NAMES)[2:4])
+
+        response = self.client.get("/mock_page/page/", {"page": 2})
+        self.assertEqual(response.json()["page"], 2)
+        self.assertEqual(response.json()["num_pages"], 3)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+import json
+from unittest import mock
+
+from django.test import TestCase
+
+from bk_resource.renderers import BkResourceAPIRenderer, BkResourceJSONRenderer
+
+
+class TestBkResourceJSONRenderer(TestCase):
+    def test_render(self):
+        renderer = BkResourceJSONRenderer()
+        self.assertEqual(renderer.render(None), b"")
+        content = renderer.render({"name": "蓝鲸", "time": datetime.datetime(2023, 1, 1), "text": " "})
+        self.assertEqual(
+            json.loads(content), {"name": "蓝鲸", "time": "2023-01-01T00:00:00", "text": " "}
+        )
+        self.assertIn(b"\\u2028", content)
+
+    def test_render_indent(self):
+        content = BkResourceJSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(content, b'{\n  "a": 1\n}')
+
+    def test_render_compact(self):
+        # 与 DRF 的 COMPACT_JSON 一致
+        self.assertEqual(BkResourceJSONRenderer().render({"a": [1, 2]}), b'{"a":[1,2]}')
+        with mock.patch.object(BkResourceJSONRenderer, "compact", False):
+            self.assertEqual(BkResourceJSONRenderer().render({"a": [1, 2]}), b'{"a": [1, 2]}')
+
+    def test_render_ensure_ascii(self):
+        self.assertEqual(BkResourceJSONRenderer().render({"name": "蓝鲸"}), '{"name":"蓝鲸"}'.encode())
+        # UNICODE_JSON 关闭时转义非 ASCII 字符
+        with mock.patch.object(BkResourceJSONRenderer, "ensure_ascii", True):
+            self.assertEqual(BkResourceJSONRenderer().render({"name": "蓝鲸"}), b'{"name":"\\u84dd\\u9cb8"}')
+
+
+class TestBkResourceAPIRenderer(TestCase):
+    def test_render(self):
+        response = mock.MagicMock(status_code=201)
+        content = BkResourceAPIRenderer().render({"a": [1, 2]}, renderer_context={"response": response})
+        data = json.loads(content)
+        self.assertEqual((data["result"], data["code"], data["data"]), (True, 0, {"a": [1, 2]}))
+        self.assertEqual(response.status_code, 200)
+        # 使用 JSON_BACKEND 紧凑输出
+        self.assertIn(b'"data":{"a":[1,2]}', content)
+
+    def test_render_error(self):
+        response = mock.MagicMock(status_code=400, data={"code": 3001, "message": {"id": "invalid"}, "data": None})
+        data = json.loads(BkResourceAPIRenderer().render({}, renderer_context={"response": response}))
+        self.assertEqual((data["result"], data["code"], data["message"]), (False, 3001, "id: invalid"))
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.test import TestCase
+from django.urls import URLResolver
+from django.urls.resolvers import RegexPattern
+
+from bk_resource import resource
+from bk_resource.routers import ResourceRouter
+from bk_resource.viewsets import ResourceBatchView, ResourceRoute, ResourceViewSet
+
+
+class DetailViewSet(ResourceViewSet):
+    resource_routes = [
+        ResourceRoute("PUT", resource.mock.test, pk_field="id"),
+    ]
+
+
+class TestResourceRouter(TestCase):
+    def test_view_routes_first(self):
+        router = ResourceRouter()
+        # 空前缀的 detail route 为 ^{pk}/$
+        router.register("", DetailViewSet)
+        router.register_batch()
+        resolver = URLResolver(RegexPattern(r"^/"), router.urls)
+        self.assertIs(resolver.resolve("/batch/").func.view_class, ResourceBatchView)
+        self.assertEqual(resolver.resolve("/1/").kwargs, {"pk": "1"})
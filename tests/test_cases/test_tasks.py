@@ -16,11 +16,22 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import json
+import threading
 from unittest import mock
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-from bk_resource.tasks import query_task_result, run_perform_request
+from bk_resource import resource
+from bk_resource.tasks import (
+    get_task_progress,
+    iter_task_progress_events,
+    publish_task_progress,
+    query_task_result,
+    run_perform_request,
+    wait_task_progress,
+)
 from tests.constants.tasks import (
     DEFAULT_PERFORM_REQUEST_DATA,
     DEFAULT_PERFORM_REQUEST_USERNAME,
@@ -35,6 +46,7 @@ from tests.mock.tasks import (
     AsyncResultExceptionMock,
     AsyncResultMock,
     AsyncResultResultFailedMock,
+    AsyncResultSuccessMock,
     StepObj,
 )
 
@@ -83,3 +95,101 @@ class TestStep(TestCase):
 
     def test_none(self):
         StepObj().run_none()
+
+
+@override_settings(BK_RESOURCE={"TASK_PROGRESS_ENABLED": True, "TASK_PROGRESS_POLL_INTERVAL": 0.01})
+class TestTaskProgress(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_publish(self):
+        publish_task_progress("task_id", "PENDING")
+        publish_task_progress("task_id", "RUNNING", message="message", data=1)
+        progress = get_task_progress("task_id")
+        self.assertEqual(progress["version"], 2)
+        self.assertEqual(progress["state"], "RUNNING")
+        self.assertFalse(progress["is_completed"])
+        # 没有任务 ID 时忽略
+        publish_task_progress(None, "RUNNING")
+
+    def test_publish_concurrently(self):
+        threads = [threading.Thread(target=publish_task_progress, args=("task_id", "RUNNING")) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 版本号原子递增，不会重复
+        self.assertEqual(get_task_progress("task_id")["version"], 10)
+
+    def test_disabled(self):
+        with override_settings(BK_RESOURCE={"TASK_PROGRESS_ENABLED": False}):
+            publish_task_progress("task_id", "RUNNING")
+            with mock.patch("bk_resource.base.run_perform_request") as run_perform_request_mock:
+                resource.mock.test.delay(id=1)
+        self.assertIsNone(get_task_progress("task_id"))
+        # 未开启时不生成任务 ID 及初始进度
+        self.assertNotIn("task_id", run_perform_request_mock.apply_async.call_args.kwargs)
+
+    @mock.patch("bk_resource.tasks.AsyncResult", AsyncResultSuccessMock)
+    def test_result_fallback(self):
+        # 进度缓存不在进程间共享时，只能获取到本进程发布的进度
+        publish_task_progress("task_id", "PENDING")
+        progress = wait_task_progress("task_id", 1, timeout=5)
+        self.assertTrue(progress["is_completed"])
+        self.assertEqual(progress["version"], 2)
+
+    def test_wait(self):
+        publish_task_progress("task_id", "PENDING")
+        self.assertEqual(wait_task_progress("task_id", 0)["version"], 1)
+        # 超时后返回当前进度
+        self.assertEqual(wait_task_progress("task_id", 1, timeout=0)["state"], "PENDING")
+
+        timer = threading.Timer(0.05, publish_task_progress, args=("task_id", "RUNNING"))
+        timer.start()
+        progress = wait_task_progress("task_id", 1, timeout=5)
+        timer.join()
+        self.assertEqual((progress["version"], progress["state"]), (2, "RUNNING"))
+
+    @mock.patch("bk_resource.tasks.AsyncResult", AsyncResultMock)
+    def test_completed(self):
+        publish_task_progress("task_id", "SUCCESS", is_completed=True)
+        self.assertEqual(wait_task_progress("task_id", 1), dict(QUERY_COMPLETE_RESULT, version=1))
+        # 没有进度记录时直接查询结果
+        self.assertEqual(wait_task_progress("unknown", 0)["version"], 0)
+
+    @mock.patch("bk_resource.tasks.AsyncResult", AsyncResultMock)
+    def test_events(self):
+        publish_task_progress("task_id", "RUNNING")
+        publish_task_progress("task_id", "SUCCESS", is_completed=True)
+        events = list(iter_task_progress_events("task_id", 0, timeout=5))
+        self.assertEqual(events[0], "retry: 1000\n\n")
+        self.assertTrue(events[1].startswith("id: 2\nevent: complete\n"))
+        self.assertEqual(len(events), 2)
+
+    def test_update_state(self):
+        _resource = resource.mock.test
+        task_manager = mock.MagicMock()
+        task_manager.request.id = "task_id"
+        with _resource.call_scope(task_manager=task_manager):
+            _resource.update_state("RUNNING", message="message", data={"progress": 50})
+        self.assertEqual(get_task_progress("task_id")["data"], {"progress": 50})
+
+    @mock.patch("bk_resource.base.run_perform_request")
+    def test_apply_async(self, run_perform_request_mock):
+        run_perform_request_mock.apply_async.side_effect = lambda args, task_id: mock.MagicMock(id=task_id)
+        task_id = resource.mock.test.delay(id=1)["task_id"]
+        self.assertEqual(get_task_progress(task_id)["state"], "PENDING")
+
+    @mock.patch("bk_resource.tasks.AsyncResult", AsyncResultMock)
+    def test_view(self):
+        publish_task_progress("task_id", "RUNNING")
+        response = self.client.get("/task_progress/", {"task_id": "task_id", "version": 1, "timeout": 0})
+        self.assertEqual(response.json()["state"], "RUNNING")
+
+        publish_task_progress("task_id", "SUCCESS", is_completed=True)
+        response = self.client.get(
+            "/task_progress/", {"task_id": "task_id"}, HTTP_ACCEPT="text/event-stream", HTTP_LAST_EVENT_ID="1"
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = b"".join(response.streaming_content).decode().split("\n\n")
+        self.assertEqual(json.loads(events[1].split("data: ")[1])["version"], 2)
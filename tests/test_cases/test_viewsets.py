@@ -16,11 +16,310 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from unittest import TestCase
+import copy
+import json
+from unittest import TestCase, mock
 
+from django.core.cache import cache
 from django.core.checks.urls import check_url_config
+from django.test import RequestFactory
+from django.test import TestCase as DjangoTestCase
+from django.test import override_settings
+
+from rest_framework import serializers
+
+from bk_resource import Resource, resource
+from bk_resource.utils.inspectors import LazySwaggerOverrides
+from bk_resource.utils.response_cache import build_data_etag
+from bk_resource.viewsets import EmptySerializer, ResourceBatchView, ResourceRoute, ResourceViewSet
+
+# resource 自动发现时以 mock.resources 导入，需使用同一个类
+CountResource = resource.mock.count.__class__
 
 
 class TestViewSet(TestCase):
     def test_url_config(self):
         check_url_config(None)
+
+
+class TestActionMap(TestCase):
+    class RequestSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+
+    def setUp(self):
+        request_serializer = self.RequestSerializer
+
+        class DetailResource(Resource):
+            RequestSerializer = request_serializer
+
+            def perform_request(self, validated_request_data):
+                return validated_request_data
+
+        class ActionViewSet(ResourceViewSet):
+            resource_routes = [
+                ResourceRoute("GET", DetailResource),
+                ResourceRoute("GET", DetailResource, pk_field="id"),
+                ResourceRoute("POST", DetailResource, endpoint="query"),
+                ResourceRoute("DELETE", DetailResource, pk_field="id"),
+            ]
+
+        ActionViewSet.generate_endpoint()
+        self.viewset_class = ActionViewSet
+
+    def test_action_routes(self):
+        routes = self.viewset_class.resource_routes
+        self.assertEqual(
+            self.viewset_class._action_routes,
+            {"list": routes[0], "retrieve": routes[1], "query": routes[2], "destroy": routes[3]},
+        )
+
+    def test_get_serializer_class(self):
+        viewset = self.viewset_class()
+        viewset.action = "query"
+        serializer_class = viewset.get_serializer_class()
+        self.assertTrue(issubclass(serializer_class, self.RequestSerializer))
+        self.assertIsNone(serializer_class.Meta.ref_name)
+        self.assertIs(viewset.get_serializer_class(), serializer_class)
+
+        viewset.action = "unknown"
+        self.assertIs(viewset.get_serializer_class(), EmptySerializer)
+
+    def test_not_mutate_serializer(self):
+        viewset = self.viewset_class()
+        viewset.action = "list"
+        viewset.get_serializer_class()
+        self.assertNotIn("Meta", self.RequestSerializer.__dict__)
+        self.assertNotIn("Meta", serializers.Serializer.__dict__)
+
+    def test_lazy_swagger_overrides(self):
+        overrides = self.viewset_class.list._swagger_auto_schema
+        self.assertIsInstance(overrides, LazySwaggerOverrides)
+        self.assertFalse(overrides.loaded)
+        self.assertFalse(self.viewset_class._action_serializers)
+
+        data = copy.deepcopy(overrides)
+        self.assertTrue(overrides.loaded)
+        self.assertIsInstance(data, dict)
+        self.assertIsInstance(data["query_serializer"], self.RequestSerializer)
+        self.assertNotIn("request_body", data)
+        self.assertIn(200, data["responses"])
+        self.assertFalse(data["enable_paginator"])
+
+    def test_action_swagger_overrides(self):
+        overrides = self.viewset_class.query._swagger_auto_schema
+        self.assertEqual(list(overrides), ["post"])
+        self.assertFalse(overrides["post"].loaded)
+        self.assertIsInstance(overrides["post"]["request_body"], self.RequestSerializer)
+
+
+class TestResponseCache(DjangoTestCase):
+    def setUp(self):
+        cache.clear()
+        CountResource.count = 0
+        CountResource.version = None
+
+    def test_cache(self):
+        response = self.client.get("/mock_cache/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertEqual(CountResource.count, 1)
+
+        cached = self.client.get("/mock_cache/")
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["Content-Type"], response["Content-Type"])
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(CountResource.count, 1)
+
+        # 查询参数不同时不命中
+        self.client.get("/mock_cache/", {"id": 1})
+        self.assertEqual(CountResource.count, 2)
+
+    def test_not_modified(self):
+        etag = self.client.get("/mock_cache/")["ETag"]
+        response = self.client.get("/mock_cache/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(CountResource.count, 1)
+
+    def test_vary_query_params(self):
+        self.client.get("/mock_cache/query/", {"id": 1, "ts": 1})
+        self.client.get("/mock_cache/query/", {"id": 1, "ts": 2})
+        self.assertEqual(CountResource.count, 1)
+        self.client.get("/mock_cache/query/", {"id": 2})
+        self.assertEqual(CountResource.count, 2)
+
+    def test_field_selection(self):
+        # 字段选择不在 vary_query_params 中，仍需区分缓存
+        trimmed = self.client.get("/mock_cache/query/", {"id": 1, "fields": "id"}).json()
+        self.assertEqual(trimmed, {})
+        full = self.client.get("/mock_cache/query/", {"id": 1}).json()
+        self.assertEqual(full, {"count": 2})
+        self.client.get("/mock_cache/query/", {"id": 1, "fields": "id"})
+        self.client.get("/mock_cache/query/", {"id": 1})
+        self.assertEqual(CountResource.count, 2)
+
+    def test_version(self):
+        CountResource.version = "v1"
+        response = self.client.get("/mock_cache/")
+        self.assertEqual(response["ETag"], '"v1"')
+        self.client.get("/mock_cache/")
+        self.assertEqual(CountResource.count, 1)
+
+        # etag 返回的版本变化后缓存失效
+        CountResource.version = "v2"
+        response = self.client.get("/mock_cache/")
+        self.assertEqual(response["ETag"], '"v2"')
+        self.assertEqual(CountResource.count, 2)
+
+    def test_etag_once(self):
+        # 条件请求与响应缓存共用同一次 etag 计算结果
+        with mock.patch.object(CountResource, "etag", return_value="v1") as etag:
+            self.client.get("/mock_cache/")
+            self.assertEqual(etag.call_count, 1)
+            self.client.get("/mock_cache/", HTTP_IF_NONE_MATCH='"v1"')
+            self.assertEqual(etag.call_count, 2)
+
+
+class TestAutoETag(DjangoTestCase):
+    def setUp(self):
+        CountResource.count = 0
+        CountResource.version = None
+
+    def test_disabled(self):
+        response = self.client.get("/mock/")
+        self.assertFalse(response.has_header("ETag"))
+
+    @override_settings(BK_RESOURCE={"AUTO_ETAG": True})
+    def test_auto_etag(self):
+        response = self.client.get("/mock/")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(self.client.get("/mock/")["ETag"], etag)
+
+        response = self.client.get("/mock/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_build_data_etag(self):
+        etag = build_data_etag({"count": 1}, "application/json")
+        self.assertEqual(build_data_etag({"count": 1}, "application/json"), etag)
+        self.assertNotEqual(build_data_etag({"count": 2}, "application/json"), etag)
+        self.assertNotEqual(build_data_etag({"count": 1}, "text/html"), etag)
+        self.assertIsNone(build_data_etag(object()))
+
+    def test_version_etag(self):
+        # 默认路由同样使用 Resource.etag，匹配时不执行 Resource
+        CountResource.version = "v1"
+        response = self.client.get("/mock_cache/", HTTP_IF_NONE_MATCH='"v1"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(CountResource.count, 0)
+
+
+class TestStreamingResponse(DjangoTestCase):
+    def test_stream(self):
+        response = self.client.get("/mock_stream/", {"count": 5})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(data["data"], [{"id": index} for index in range(5)])
+        self.assertTrue(data["result"])
+
+    def test_ndjson(self):
+        response = self.client.get("/mock_stream/ndjson/", {"count": 2})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 3)
+
+        # 根据 Accept 请求头确定格式
+        response = self.client.get("/mock_stream/", {"count": 2}, HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+    def test_not_stream(self):
+        # 未配置 stream_format 时按列表渲染
+        response = self.client.get("/mock_stream/rows/", {"count": 2}, HTTP_ACCEPT="application/x-ndjson")
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.json(), [{"id": 0}, {"id": 1}])
+
+    def test_error(self):
+        response = self.client.get("/mock_stream/", {"count": 5, "fail_at": 2})
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(data["data"]), 2)
+        self.assertFalse(data["result"])
+
+    def test_request_log(self):
+        with mock.patch("bk_resource.viewsets.record_request_log") as record_request_log:
+            response = self.client.get("/mock_stream/", {"count": 3})
+            record_request_log.assert_not_called()
+            b"".join(response.streaming_content)
+        self.assertEqual(record_request_log.call_args[0][4], {"count": 3})
+
+
+class TestBatch(DjangoTestCase):
+    def setUp(self):
+        cache.clear()
+        CountResource.count = 0
+
+    def batch(self, requests, **extra):
+        return self.client.post("/batch/", {"requests": requests}, content_type="application/json", **extra)
+
+    def test_batch(self):
+        response = self.batch(
+            [
+                {"id": "count", "route": "mock_cache/query/", "params": {"id": 1}},
+                {"id": "stream", "route": "/mock_stream/ndjson/", "params": {"count": 1}},
+                {"id": "missing", "route": "missing/"},
+                {"id": "nested", "route": "batch/"},
+            ]
+        )
+        self.assertEqual(response.status_code, 200)
+        results = {item["id"]: item for item in response.json()}
+        self.assertEqual(results["count"]["route"], "/mock_cache/query/")
+        self.assertEqual(results["count"]["status_code"], 200)
+        self.assertEqual(results["count"]["data"], {"count": 1})
+        self.assertFalse(results["stream"]["result"])
+        # 未注册的路由及批量接口自身不允许调用
+        self.assertEqual(results["missing"]["status_code"], 404)
+        self.assertEqual(results["nested"]["status_code"], 404)
+
+    def test_headers(self):
+        response = self.batch([{"route": "mock_cache/"}, {"route": "mock_cache/"}], HTTP_IF_NONE_MATCH="*")
+        # 条件请求头不会传递给子请求
+        self.assertEqual([item["status_code"] for item in response.json()], [200, 200])
+
+    def test_async_task_header(self):
+        response = self.batch([{"route": "mock_echo/"}, {"route": "mock_echo/"}], HTTP_X_ASYNC_TASK="1")
+        # 子请求不会作为异步任务执行
+        self.assertEqual([item["data"] for item in response.json()], [{"params": {}, "count": 0}] * 2)
+
+    def test_query_string(self):
+        response = self.batch(
+            [
+                {"id": "get", "route": "mock_echo/?id=2&tag=a&tag=b", "params": {"x": 1}},
+                {"id": "override", "route": "/mock_echo/?id=2", "params": {"id": 3}},
+                {"id": "invalid", "route": "mock_echo/?id=2", "params": [1]},
+            ]
+        )
+        results = {item["id"]: item for item in response.json()}
+        self.assertEqual(results["get"]["route"], "/mock_echo/")
+        self.assertEqual(results["get"]["data"]["params"], {"id": "2", "tag": "b", "x": "1"})
+        # 同名参数以 params 为准
+        self.assertEqual(results["override"]["data"]["params"], {"id": "3"})
+        self.assertEqual(results["invalid"]["status_code"], 400)
+
+    def test_sub_request(self):
+        request = mock.MagicMock()
+        request._request = RequestFactory().post(
+            "/batch/", HTTP_X_TOKEN="token", HTTP_ACCEPT="text/event-stream", HTTP_X_BK_RESOURCE_PROFILE="json"
+        )
+        sub_request = ResourceBatchView().build_sub_request(request, "/mock/", "POST", {"id": 1}, "id=2")
+        self.assertEqual(sub_request.method, "POST")
+        self.assertEqual(sub_request.META["HTTP_X_TOKEN"], "token")
+        self.assertNotIn("HTTP_ACCEPT", sub_request.META)
+        self.assertNotIn("HTTP_X_BK_RESOURCE_PROFILE", sub_request.META)
+        self.assertEqual(json.loads(sub_request.body), {"id": 1})
+        # 非 GET 请求的查询参数保留在路径上
+        self.assertEqual(sub_request.GET["id"], "2")
+
+    @override_settings(BK_RESOURCE={"BATCH_MAX_REQUESTS": 1})
+    def test_max_requests(self):
+        response = self.batch([{"route": "mock/"}, {"route": "mock/"}])
+        self.assertEqual(response.status_code, 400)
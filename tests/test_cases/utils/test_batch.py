@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+
+import threading
+import time
+
+from django.test import TestCase
+
+from bk_resource.utils.batch import BatchLoader
+
+
+class TestBatchLoader(TestCase):
+    def setUp(self) -> None:
+        self.calls = []
+
+    def batch_func(self, group_params, keys):
+        self.calls.append((group_params, keys))
+        return {key: key * 2 for key in keys}
+
+    def run_threads(self, loader, keys, groups):
+        results = {}
+
+        def load(key, group):
+            results[key] = loader.load(key, group=group, group_params={"group": group})
+
+        threads = [threading.Thread(target=load, args=args) for args in zip(keys, groups)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def start_blocker(self, loader):
+        """
+        占用加载器的调用，模拟存在其他并发调用
+        """
+        entered, release = threading.Event(), threading.Event()
+        batch_func = loader.batch_func
+
+        def blocking_batch_func(group_params, keys):
+            if group_params.get("group") == "blocker":
+                entered.set()
+                release.wait(5)
+            return batch_func(group_params, keys)
+
+        loader.batch_func = blocking_batch_func
+        thread = threading.Thread(target=loader.load, args=(0,), kwargs={"group_params": {"group": "blocker"}})
+        thread.start()
+        entered.wait(5)
+        return thread, release
+
+    def test_group(self):
+        loader = BatchLoader(self.batch_func, window=0.5)
+        blocker, release = self.start_blocker(loader)
+        results = self.run_threads(loader, [1, 2, 3, 4], ["a", "b", "a", "b"])
+        release.set()
+        blocker.join()
+        self.assertEqual(results, {1: 2, 2: 4, 3: 6, 4: 8})
+        calls = sorted((params["group"], sorted(keys)) for params, keys in self.calls if params["group"] != "blocker")
+        self.assertEqual(calls, [("a", [1, 3]), ("b", [2, 4])])
+
+    def test_without_concurrent_calls(self):
+        loader = BatchLoader(self.batch_func, window=5)
+        start = time.perf_counter()
+        self.assertEqual([loader.load(key) for key in (1, 2)], [2, 4])
+        # 没有其他并发调用时立即执行
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual([keys for _, keys in self.calls], [[1], [2]])
+
+    def test_collect(self):
+        loader = BatchLoader(self.batch_func, max_batch_size=2)
+        with loader.collect() as collector:
+            futures = [collector.load(key, group=key % 2, group_params={"group": key % 2}) for key in range(1, 6)]
+            # 达到最大数量的分组立即执行
+            self.assertEqual(sorted(keys for _, keys in self.calls), [[1, 3], [2, 4]])
+        self.assertEqual([future.result() for future in futures], [2, 4, 6, 8, 10])
+        self.assertEqual(sorted(keys for _, keys in self.calls), [[1, 3], [2, 4], [5]])
+
+    def test_collect_exception(self):
+        loader = BatchLoader(self.batch_func)
+        with self.assertRaises(KeyError):
+            with loader.collect() as collector:
+                future = collector.load(1)
+                raise KeyError()
+        self.assertTrue(future.cancelled())
+        self.assertFalse(self.calls)
+
+    def test_max_batch_size(self):
+        loader = BatchLoader(self.batch_func, max_batch_size=2, window=5)
+        blocker, release = self.start_blocker(loader)
+        results = self.run_threads(loader, [1, 2], [None, None])
+        release.set()
+        blocker.join()
+        # 达到最大数量时立即执行，无需等待时间窗口
+        self.assertEqual(results, {1: 2, 2: 4})
+        self.assertEqual([keys for params, keys in self.calls if params.get("group") != "blocker"], [[1, 2]])
+
+    def test_exception(self):
+        def batch_func(group_params, keys):
+            raise TypeError()
+
+        with self.assertRaises(TypeError):
+            BatchLoader(batch_func, window=0).load(1)
+
+    def test_load_many(self):
+        loader = BatchLoader(self.batch_func, max_batch_size=2)
+        self.assertEqual(loader.load_many([1, 2, 1, 3]), [2, 4, 2, 6])
+        self.assertEqual([keys for _, keys in self.calls], [[1, 2], [3]])
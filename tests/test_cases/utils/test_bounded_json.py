@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+import json
+
+from django.test import TestCase
+
+from bk_resource.utils.bounded_json import BoundedJSONEncoder, bounded_json_dumps
+
+
+class TestBoundedJSONEncoder(TestCase):
+    def test_small_data(self):
+        data = {"name": "蓝鲸", "items": [1, 2.5, None, True], "nested": {"a": ("b",)}}
+        self.assertEqual(bounded_json_dumps(data, 1024), (json.dumps(data, ensure_ascii=False), False))
+
+    def test_truncate(self):
+        data = {"items": [{"id": index} for index in range(100000)]}
+        encoder = BoundedJSONEncoder(50, max_items=1000000)
+        # 超出长度后停止序列化，不会遍历全部元素
+        text, truncated = encoder.encode(data)
+        self.assertTrue(truncated)
+        self.assertEqual(text, json.dumps(data)[:50])
+
+    def test_long_string(self):
+        text, truncated = bounded_json_dumps("a" * 10000000, 10)
+        self.assertEqual(text, '"aaaaaaaaa')
+        self.assertTrue(truncated)
+
+    def test_summary(self):
+        data = {"list": list(range(5)), "dict": {str(index): index for index in range(5)}}
+        text, truncated = bounded_json_dumps(data, 1024, max_items=2)
+        self.assertFalse(truncated)
+        self.assertEqual(
+            json.loads(text), {"list": [0, 1, "... list[5]"], "dict": {"0": 0, "1": 1, "...": "dict[5]"}}
+        )
+
+    def test_default(self):
+        data = {"time": datetime.date(2023, 1, 1), "set": {1}, 1: object, "generator": (i for i in range(1))}
+        result = json.loads(bounded_json_dumps(data, 1024)[0])
+        self.assertEqual(result["time"], "2023-01-01")
+        self.assertEqual(result["set"], [1])
+        self.assertEqual(result["1"], str(object))
+        self.assertTrue(result["generator"].startswith("<generator"))
+
+    def test_depth(self):
+        data = []
+        data.append(data)
+        text, truncated = BoundedJSONEncoder(1024, max_depth=2).encode(data)
+        self.assertEqual(text, '[["list[1]"]]')
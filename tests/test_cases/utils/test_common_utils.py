@@ -52,6 +52,7 @@ from bk_resource.utils.common_utils import (
     uniqid,
     uniqid4,
 )
+from bk_resource.utils.process import clear_process_role_cache
 from tests.constants.utils.common_utils import (
     BK_RESOURCE,
     BK_RESOURCE_PACKAGES,
@@ -304,6 +305,12 @@ class TestReplaceSpecialVal(TestCase):
 
 
 class TestIsBackend(TestCase):
+    def setUp(self):
+        clear_process_role_cache()
+
+    def tearDown(self):
+        clear_process_role_cache()
+
     def test(self):
         self.assertTrue(is_backend())
 
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import gzip
+import zlib
+from unittest import mock
+
+from django.test import TestCase
+
+from bk_resource.utils.compress import (
+    ContentEncoding,
+    build_accept_encoding,
+    compress,
+    is_compress_supported,
+)
+
+
+class TestCompress(TestCase):
+    def test_compress(self):
+        data = b"bk_resource" * 100
+        self.assertEqual(gzip.decompress(compress(data, ContentEncoding.GZIP)), data)
+        self.assertEqual(zlib.decompress(compress(data, ContentEncoding.DEFLATE)), data)
+        with self.assertRaises(ValueError):
+            compress(data, "unknown")
+
+    @mock.patch("bk_resource.utils.compress.zstandard", None)
+    def test_zstd_not_installed(self):
+        self.assertFalse(is_compress_supported(ContentEncoding.ZSTD))
+        with self.assertRaises(ValueError):
+            compress(b"", ContentEncoding.ZSTD)
+
+    def test_build_accept_encoding(self):
+        self.assertEqual(build_accept_encoding("gzip, deflate;q=0.5"), "gzip, deflate;q=0.5")
+        self.assertEqual(build_accept_encoding("unknown"), "identity")
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.contrib.auth.models import Group
+from django.test import RequestFactory, TestCase
+from rest_framework import serializers
+
+from bk_resource import resource
+from bk_resource.utils.field_selection import FieldSelection, parse_field_names
+
+# resource 自动发现时以 mock.resources 导入，需使用同一个类
+CursorGroupResource = resource.mock.cursor_group.__class__
+
+
+class ItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    desc = serializers.CharField()
+
+
+class TestFieldSelection(TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_field_names("id, name,,"), ["id", "name"])
+        self.assertEqual(parse_field_names(["id,name", "desc"]), ["id", "name", "desc"])
+        self.assertEqual(parse_field_names(None), [])
+
+    def test_from_request(self):
+        request = RequestFactory().get("/", {"fields": "id,name", "exclude": "name"})
+        selection = FieldSelection.from_request(request)
+        self.assertEqual(selection.filter_names(["id", "name", "desc"]), ["id"])
+        # 与 Resource 自身参数同名时忽略
+        self.assertIsNone(FieldSelection.from_request(request, reserved=["fields", "exclude"]))
+        self.assertIsNone(FieldSelection.from_request(RequestFactory().get("/")))
+
+    def test_apply(self):
+        data = {"id": 1, "name": "a", "desc": ""}
+        self.assertEqual(FieldSelection("id").apply(data), {"id": 1})
+        self.assertEqual(FieldSelection(exclude="desc").apply([data]), [{"id": 1, "name": "a"}])
+        self.assertEqual(list(FieldSelection("name").apply(iter([data]))), [{"name": "a"}])
+
+    def test_prune_serializer(self):
+        serializer = FieldSelection("id,name", exclude="name").prune_serializer(ItemSerializer(many=True))
+        self.assertEqual(list(serializer.child.fields.keys()), ["id"])
+        # 不影响序列化器类
+        self.assertEqual(list(ItemSerializer().fields.keys()), ["id", "name", "desc"])
+
+    def test_apply_queryset(self):
+        queryset = FieldSelection("name").apply_queryset(Group.objects.all())
+        self.assertEqual(queryset.query.deferred_loading, ({"id", "name"}, False))
+        queryset = FieldSelection(exclude="name").apply_queryset(Group.objects.all())
+        self.assertEqual(queryset.query.deferred_loading, ({"name"}, True))
+
+
+class TestResourceFieldSelection(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Group.objects.bulk_create([Group(name=name) for name in ["a", "b", "c"]])
+
+    def test_call_scope(self):
+        _resource = CursorGroupResource()
+        with _resource.call_scope(field_selection=FieldSelection("name")):
+            page = _resource.request({})
+        self.assertEqual(page.results, [{"name": "a"}, {"name": "b"}])
+        self.assertIsNone(_resource.field_selection)
+
+    def test_view(self):
+        response = self.client.get("/mock_page/", {"fields": "name"})
+        self.assertEqual(response.json()["results"], [{"name": "a"}, {"name": "b"}])
+
+        response = self.client.get("/mock_stream/", {"count": 2, "exclude": "id"})
+        self.assertIn(b'"data":[{},{}]', b"".join(response.streaming_content))
+
+    def test_view_opt_in(self):
+        # 未开启时参数原样传入 Resource，返回数据不变
+        response = self.client.get("/mock_echo/", {"fields": "count", "id": 1})
+        self.assertEqual(response.json(), {"params": {"fields": "count", "id": "1"}, "count": 2})
+
+        response = self.client.get("/mock_echo/selected/", {"fields": "count", "id": 1})
+        self.assertEqual(response.json(), {"count": 1})
+        # 字段选择参数不传入 Resource
+        response = self.client.get("/mock_echo/selected/", {"exclude": "count", "id": 1})
+        self.assertEqual(response.json(), {"params": {"id": "1"}})
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+import decimal
+import json
+from unittest import mock, skipIf
+
+from django.test import TestCase, override_settings
+
+from bk_resource.utils import json_backend
+from bk_resource.utils.common_utils import DatetimeEncoder
+from bk_resource.utils.json_backend import (
+    OrjsonJSONBackend,
+    StdlibJSONBackend,
+    UjsonJSONBackend,
+    get_json_backend,
+    json_dumps,
+    json_loads,
+)
+
+DATA = {
+    "name": "蓝鲸",
+    "time": datetime.datetime(2023, 1, 1, 12, 0, 0),
+    "date": datetime.date(2023, 1, 1),
+    "decimal": decimal.Decimal("1.5"),
+    "set": {1},
+    "bytes": b"content",
+}
+
+
+class TestJSONBackend(TestCase):
+    def assert_backend(self, backend, data=None):
+        data = data or DATA
+        expected = json.loads(json.dumps(data, cls=DatetimeEncoder))
+        self.assertEqual(json.loads(backend.dumps(data)), expected)
+        self.assertIn("蓝鲸", backend.dumps(DATA))
+        self.assertEqual(backend.loads(b'{"a": [1, "b"]}'), {"a": [1, "b"]})
+        # 超出范围的整数
+        self.assertEqual(backend.loads(backend.dumps({"a": 2**70})), {"a": 2**70})
+        with self.assertRaises(TypeError):
+            backend.dumps({"object": object()})
+        with self.assertRaises(ValueError):
+            backend.loads("{")
+
+    def test_stdlib(self):
+        self.assert_backend(StdlibJSONBackend)
+
+    @skipIf(json_backend.orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        self.assert_backend(OrjsonJSONBackend)
+
+    @skipIf(json_backend.ujson is None, "ujson is not installed")
+    def test_ujson(self):
+        # ujson 原生支持 Decimal，序列化为数字
+        self.assert_backend(UjsonJSONBackend, {key: val for key, val in DATA.items() if key != "decimal"})
+
+    def test_default_backend(self):
+        self.assertIs(get_json_backend(), StdlibJSONBackend)
+        self.assertEqual(json_loads(json_dumps({"a": 1})), {"a": 1})
+
+    @override_settings(BK_RESOURCE={"JSON_BACKEND": "bk_resource.utils.json_backend.OrjsonJSONBackend"})
+    @mock.patch("bk_resource.utils.json_backend.orjson", None)
+    def test_backend_not_installed(self):
+        self.assertIs(get_json_backend(), StdlibJSONBackend)
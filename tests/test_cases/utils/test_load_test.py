@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+import random
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from bk_resource.utils.load_test import LoadTestMode, LoadTestRunner, bind_base_url
+from bk_resource.utils.stub_gateway import StubGateway, build_latency_sampler
+from tests.mock.utils.load_test import StubGatewayAPI
+
+
+class TestLatencySampler(TestCase):
+    def test_parse(self):
+        rand = random.Random(0)
+        self.assertEqual(build_latency_sampler(None)(rand), 0)
+        self.assertEqual(build_latency_sampler(20)(rand), 0.02)
+        self.assertEqual(build_latency_sampler("20")(rand), 0.02)
+        self.assertEqual(build_latency_sampler("fixed:20")(rand), 0.02)
+        self.assertTrue(0.01 <= build_latency_sampler("uniform:10,50")(rand) <= 0.05)
+        self.assertTrue(build_latency_sampler("normal:30,5")(rand) >= 0)
+        self.assertTrue(build_latency_sampler("exponential:20")(rand) >= 0)
+        with self.assertRaises(ValueError):
+            build_latency_sampler("unknown:1")
+
+
+class TestLoadTestRunner(TestCase):
+    def test_sync(self):
+        with StubGateway() as gateway:
+            resource = bind_base_url(StubGatewayAPI, gateway.url)()
+            result = LoadTestRunner(resource, {"id": 1}, concurrency=4, total=40, gateway=gateway).run()
+        self.assertEqual(result["requests"], 40)
+        self.assertEqual(result["errors"], 0)
+        self.assertTrue(result["throughput"] > 0)
+        self.assertTrue(result["latency"]["p50"] <= result["latency"]["p99"] <= result["latency"]["max"])
+        # 每个线程复用各自的连接
+        self.assertEqual(result["connections"]["gateway_requests"], 40)
+        self.assertTrue(result["connections"]["connections"] <= 4)
+
+    def test_bulk_with_errors(self):
+        with StubGateway(failure_rate=1) as gateway:
+            resource = bind_base_url(StubGatewayAPI, gateway.url)()
+            runner = LoadTestRunner(resource, mode=LoadTestMode.BULK, concurrency=2, total=20, bulk_size=5)
+            result = runner.run()
+            self.assertEqual(gateway.stats()["failures"], 20)
+        self.assertEqual(result["requests"], 20)
+        self.assertEqual(result["errors"], 20)
+        self.assertIsNone(result["connections"])
+
+    def test_duration(self):
+        with StubGateway() as gateway:
+            resource = bind_base_url(StubGatewayAPI, gateway.url)()
+            result = LoadTestRunner(resource, concurrency=2, duration=0.1).run()
+        self.assertTrue(result["requests"] > 0)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command(
+            "resource_load_test",
+            "tests.mock.utils.load_test.StubGatewayAPI",
+            "--requests=10",
+            "--concurrency=2",
+            "--latency=1",
+            stdout=stdout,
+        )
+        result = json.loads(stdout.getvalue())
+        self.assertEqual(result["requests"], 10)
+        self.assertEqual(result["connections"]["gateway_requests"], 10)
+
+        with self.assertRaises(CommandError):
+            call_command("resource_load_test", "tests.mock.utils.load_test.NotExist")
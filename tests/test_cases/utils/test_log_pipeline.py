@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import threading
+from unittest import mock
+
+from django.test import TestCase
+
+from bk_resource.utils.log_pipeline import OverflowPolicy, RequestLogPipeline
+
+
+class Record:
+    batches = []
+
+    @classmethod
+    def emit_batch(cls, records):
+        cls.batches.append(len(records))
+
+
+class BlockingRecord:
+    started = threading.Event()
+    release = threading.Event()
+
+    @classmethod
+    def emit_batch(cls, records):
+        cls.started.set()
+        cls.release.wait(5)
+
+
+class ErrorRecord:
+    @classmethod
+    def emit_batch(cls, records):
+        raise ValueError()
+
+
+class PartialErrorRecord:
+    @classmethod
+    def emit_batch(cls, records):
+        # 第一条失败，其余成功
+        return 1
+
+
+class TestRequestLogPipeline(TestCase):
+    def setUp(self):
+        Record.batches = []
+        BlockingRecord.started.clear()
+        BlockingRecord.release.clear()
+
+    def test_batch(self):
+        pipeline = RequestLogPipeline(batch_size=10, flush_interval=0.2)
+        for _ in range(25):
+            self.assertTrue(pipeline.put(Record()))
+        self.assertTrue(pipeline.flush(timeout=5))
+        self.assertEqual(sum(Record.batches), 25)
+        self.assertLessEqual(max(Record.batches), 10)
+        metrics = pipeline.metrics()
+        self.assertEqual(metrics["enqueued"], 25)
+        self.assertEqual(metrics["processed"], 25)
+        self.assertEqual(metrics["queue_size"], 0)
+        pipeline.stop(timeout=5)
+
+    def test_drop(self):
+        pipeline = RequestLogPipeline(max_size=2, flush_interval=0)
+        pipeline.put(BlockingRecord())
+        BlockingRecord.started.wait(5)
+        self.assertTrue(pipeline.put(Record()))
+        self.assertTrue(pipeline.put(Record()))
+        self.assertFalse(pipeline.put(Record()))
+        BlockingRecord.release.set()
+        self.assertTrue(pipeline.flush(timeout=5))
+        self.assertEqual(pipeline.metrics()["dropped"], 1)
+        pipeline.stop(timeout=5)
+
+    @mock.patch("bk_resource.utils.log_pipeline.random.random", mock.Mock(return_value=0.5))
+    def test_sample(self):
+        pipeline = RequestLogPipeline(
+            max_size=4, flush_interval=0, overflow_policy=OverflowPolicy.SAMPLE, sample_rate=0.1, sample_threshold=0.5
+        )
+        pipeline.put(BlockingRecord())
+        BlockingRecord.started.wait(5)
+        self.assertTrue(pipeline.put(Record()))
+        self.assertTrue(pipeline.put(Record()))
+        # 积压达到阈值后开始采样
+        self.assertFalse(pipeline.put(Record()))
+        BlockingRecord.release.set()
+        pipeline.flush(timeout=5)
+        self.assertEqual(pipeline.metrics()["sampled_out"], 1)
+        pipeline.stop(timeout=5)
+
+    def test_failed(self):
+        pipeline = RequestLogPipeline(flush_interval=0)
+        pipeline.put(ErrorRecord())
+        pipeline.put(Record())
+        pipeline.flush(timeout=5)
+        metrics = pipeline.metrics()
+        self.assertEqual(metrics["failed"], 1)
+        self.assertEqual(metrics["processed"], 1)
+        pipeline.stop(timeout=5)
+
+    def test_partial_failed(self):
+        pipeline = RequestLogPipeline(batch_size=3, flush_interval=1)
+        for _ in range(3):
+            pipeline.put(PartialErrorRecord())
+        pipeline.flush(timeout=5)
+        metrics = pipeline.metrics()
+        self.assertEqual((metrics["processed"], metrics["failed"]), (2, 1))
+        pipeline.stop(timeout=5)
+
+    def test_stop(self):
+        pipeline = RequestLogPipeline(flush_interval=1)
+        pipeline.put(Record())
+        pipeline.stop(timeout=5)
+        self.assertEqual(Record.batches, [1])
+        self.assertFalse(pipeline._thread.is_alive())
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from bk_resource.utils.log_spool import (
+    RotatingSpoolWriter,
+    iter_spool_records,
+    list_spool_files,
+    summarize_request_logs,
+)
+
+
+class TestRotatingSpoolWriter(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "spool", "request.log")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_write(self):
+        writer = RotatingSpoolWriter(self.path, fsync_interval=60)
+        with mock.patch("bk_resource.utils.log_spool.os.fsync") as fsync:
+            writer.write_lines(['{"a": 1}', '{"a": 2}'])
+            writer.write_lines(['{"a": 3}'])
+            # 间隔内只 fsync 一次
+            self.assertEqual(fsync.call_count, 1)
+        writer.close()
+        self.assertEqual([record["a"] for record in iter_spool_records(self.path)], [1, 2, 3])
+
+    def test_fsync_disabled(self):
+        writer = RotatingSpoolWriter(self.path, max_bytes=20)
+        with mock.patch("bk_resource.utils.log_spool.os.fsync") as fsync:
+            for index in range(3):
+                writer.write_lines([json.dumps({"index": index, "data": "x"})])
+            writer.close()
+        # 默认不 fsync，包括轮转及关闭时
+        fsync.assert_not_called()
+
+    def test_rotate_shared_path(self):
+        # 模拟多个进程写入同一路径
+        writers = [RotatingSpoolWriter(self.path, max_bytes=50, backup_count=10) for _ in range(2)]
+        for index in range(10):
+            writers[index % 2].write_lines([json.dumps({"index": index, "data": "x"})])
+        for writer in writers:
+            writer.close()
+        # 轮转后其他写入器重新打开文件，记录既不丢失也不乱序
+        self.assertEqual([record["index"] for record in iter_spool_records(self.path)], list(range(10)))
+        for file_path in list_spool_files(self.path):
+            self.assertLessEqual(os.path.getsize(file_path), 50)
+
+    def test_rotate(self):
+        writer = RotatingSpoolWriter(self.path, max_bytes=20, backup_count=2, fsync_interval=0)
+        for index in range(5):
+            writer.write_lines([json.dumps({"index": index, "data": "x"})])
+        writer.close()
+        files = list_spool_files(self.path)
+        self.assertEqual(files, [self.path + ".2", self.path + ".1", self.path])
+        # 超出保留数量的历史文件被删除，其余按时间顺序读取
+        self.assertEqual([record["index"] for record in iter_spool_records(self.path)], [2, 3, 4])
+        self.assertEqual([record["index"] for record in iter_spool_records(self.path, include_rotated=False)], [4])
+
+    def test_invalid_line(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write('{"a": 1}\n[1]\n{"a": 2')
+        self.assertEqual(list(iter_spool_records(self.path)), [{"a": 1}])
+
+
+class TestSummarizeRequestLogs(TestCase):
+    RECORDS = [
+        {"resource": "a", "duration_ms": duration, "status": "failed" if duration == 100 else "success"}
+        for duration in range(1, 101)
+    ] + [{"resource": "b", "duration_ms": 5, "status": "success"}]
+
+    def test_summarize(self):
+        summary = summarize_request_logs(self.RECORDS)
+        self.assertEqual(
+            summary["a"], {"count": 100, "failed": 1, "avg": 50.5, "p50": 50, "p95": 95, "p99": 99, "max": 100}
+        )
+        self.assertEqual(summary["b"]["count"], 1)
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "request.log")
+            RotatingSpoolWriter(path).write_lines([json.dumps(record) for record in self.RECORDS])
+            stdout = StringIO()
+            call_command("summarize_request_log", path, "--top", "1", stdout=stdout)
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith("a\t100\t1\t"))
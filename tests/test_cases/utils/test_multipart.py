@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+
+import io
+from email.parser import BytesParser
+
+import requests
+from django.test import TestCase
+
+from bk_resource.utils.multipart import MultipartEncoder
+
+
+class UnsizedFile:
+    """无法获取长度的文件对象"""
+
+    name = "unsized.bin"
+
+    def __init__(self, content: bytes):
+        self._file = io.BytesIO(content)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+
+def parse_multipart(encoder: MultipartEncoder, body: bytes) -> dict:
+    message = BytesParser().parsebytes(b"Content-Type: " + encoder.content_type.encode() + b"\r\n\r\n" + body)
+    return {
+        part.get_param("name", header="content-disposition"): (part.get_filename(), part.get_payload(decode=True))
+        for part in message.get_payload()
+    }
+
+
+class TestMultipartEncoder(TestCase):
+    def test_encode(self):
+        file = io.BytesIO(b"x" * 1000)
+        file.name = "/tmp/package.tar.gz"
+        encoder = MultipartEncoder({"bk_biz_id": 2, "tags": ["a", "b"], "empty": None}, {"file": file}, chunk_size=7)
+        body = encoder.read()
+        self.assertEqual(len(body), encoder.len)
+        parts = parse_multipart(encoder, body)
+        self.assertEqual(parts["bk_biz_id"], (None, b"2"))
+        self.assertEqual(parts["file"], ("package.tar.gz", b"x" * 1000))
+        self.assertNotIn("empty", parts)
+        self.assertEqual(body.count(b'name="tags"'), 2)
+
+    def test_escape_filename(self):
+        file = io.BytesIO(b"1")
+        file.name = 'a"; name="b\r\nX-Injected: 1.txt'
+        encoder = MultipartEncoder({}, {"file": file})
+        body = encoder.read()
+        self.assertIn(b'filename="a%22; name=%22b%0D%0AX-Injected: 1.txt"', body)
+        self.assertNotIn(b"\r\nX-Injected", body)
+        self.assertEqual(len(body), encoder.len)
+        self.assertEqual(list(parse_multipart(encoder, body)), ["file"])
+
+    def test_read_in_chunks(self):
+        progress = []
+        encoder = MultipartEncoder(
+            {}, {"file": io.BytesIO(b"y" * 100)}, callback=lambda read, total: progress.append((read, total))
+        )
+        body = b"".join(encoder)
+        self.assertEqual(len(body), encoder.len)
+        self.assertEqual(progress[-1], (encoder.len, encoder.len))
+        self.assertEqual(encoder.read(), b"")
+
+    def test_unsized_file(self):
+        encoder = MultipartEncoder({}, {"file": UnsizedFile(b"z" * 10)})
+        self.assertIsNone(encoder.len)
+        self.assertEqual(parse_multipart(encoder, encoder.read())["file"], ("unsized.bin", b"z" * 10))
+
+    def test_requests_prepare(self):
+        sized = MultipartEncoder({"a": "b"}, {"file": io.BytesIO(b"1")})
+        prepared = requests.Request("POST", "http://127.0.0.1/", data=sized).prepare()
+        self.assertEqual(prepared.headers["Content-Length"], str(sized.len))
+        self.assertIs(prepared.body, sized)
+
+        unsized = MultipartEncoder({}, {"file": UnsizedFile(b"1")})
+        prepared = requests.Request("POST", "http://127.0.0.1/", data=unsized).prepare()
+        self.assertEqual(prepared.headers["Transfer-Encoding"], "chunked")
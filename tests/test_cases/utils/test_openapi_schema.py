@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+
+from bk_resource.utils.openapi_schema import MANIFEST_FILENAME, build_schema_files, load_prebuilt_schema
+from bk_resource.viewsets import OpenAPISchemaView
+
+
+class TestOpenAPISchema(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_build_schema_files(self):
+        manifest = build_schema_files(self.directory)
+        self.assertEqual(set(manifest["files"]), {"json", "yaml"})
+        for filename in manifest["files"].values():
+            self.assertIn(manifest["hash"], filename)
+            self.assertTrue(os.path.exists(os.path.join(self.directory, filename)))
+        with open(os.path.join(self.directory, manifest["files"]["json"]), encoding="utf-8") as file:
+            schema = json.load(file)
+        self.assertIn("/mock_page/", schema["paths"])
+        self.assertNotIn("/openapi/", schema["paths"])
+
+        # 内容不变时哈希不变
+        self.assertEqual(build_schema_files(self.directory)["hash"], manifest["hash"])
+
+    def test_load_prebuilt_schema(self):
+        self.assertIsNone(load_prebuilt_schema("json", self.directory))
+        self.assertIsNone(load_prebuilt_schema("json", None))
+
+        manifest = build_schema_files(self.directory)
+        content, schema_hash = load_prebuilt_schema("yaml", self.directory)
+        self.assertEqual(schema_hash, manifest["hash"])
+        self.assertTrue(content.startswith(b"swagger:"))
+
+        # 清单更新后重新读取
+        with open(os.path.join(self.directory, MANIFEST_FILENAME), "w", encoding="utf-8") as file:
+            json.dump({"hash": "changed", "files": manifest["files"]}, file)
+        os.utime(os.path.join(self.directory, MANIFEST_FILENAME), (0, 0))
+        self.assertEqual(load_prebuilt_schema("yaml", self.directory)[1], "changed")
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command("build_openapi_schema", "--output", self.directory, stdout=stdout)
+        self.assertIn("hash:", stdout.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.directory, MANIFEST_FILENAME)))
+
+        with self.assertRaises(CommandError):
+            call_command("build_openapi_schema")
+
+    def test_view(self):
+        manifest = build_schema_files(self.directory)
+        with override_settings(DEBUG=False, BK_RESOURCE={"OPENAPI_SCHEMA_DIR": self.directory}):
+            response = self.client.get("/openapi/")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "application/json")
+            self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+            self.assertIn("/mock_page/", json.loads(response.content)["paths"])
+
+            # 携带哈希时长期缓存
+            response = self.client.get("/openapi/", {"v": manifest["hash"]})
+            self.assertIn("immutable", response["Cache-Control"])
+
+            response = self.client.get("/openapi/", HTTP_IF_NONE_MATCH=response["ETag"])
+            self.assertEqual(response.status_code, 304)
+
+            response = self.client.get("/openapi/", {"format": "yaml"})
+            self.assertEqual(response["Content-Type"], "application/yaml")
+            response = self.client.get("/openapi/", HTTP_ACCEPT="application/yaml")
+            self.assertEqual(response["Content-Type"], "application/yaml")
+
+        with override_settings(DEBUG=False):
+            self.assertEqual(self.client.get("/openapi/").status_code, 404)
+
+    def test_view_private(self):
+        build_schema_files(self.directory)
+        with override_settings(DEBUG=False, BK_RESOURCE={"OPENAPI_SCHEMA_DIR": self.directory}), mock.patch.object(
+            OpenAPISchemaView, "permission_classes", [IsAuthenticatedOrReadOnly]
+        ):
+            response = self.client.get("/openapi/")
+        # 需要鉴权时不允许共享缓存
+        self.assertEqual(response["Cache-Control"], "private, max-age=3600")
+
+    def test_view_debug(self):
+        # DEBUG 模式下忽略预生成的文件
+        with open(os.path.join(self.directory, MANIFEST_FILENAME), "w", encoding="utf-8") as file:
+            json.dump({"hash": "prebuilt", "files": {}}, file)
+        with override_settings(DEBUG=True, BK_RESOURCE={"OPENAPI_SCHEMA_DIR": self.directory}):
+            response = self.client.get("/openapi/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertIn("/mock_page/", json.loads(response.content)["paths"])
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import os
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from bk_resource.tools import get_processes
+from bk_resource.utils.process import (
+    PROCESS_ROLE_ENV,
+    ProcessRole,
+    clear_process_role_cache,
+    detect_process_role,
+    get_process_role,
+)
+
+
+class TestDetectProcessRole(TestCase):
+    def test_detect(self):
+        self.assertEqual(detect_process_role(["manage.py", "runserver"]), ProcessRole.WEB)
+        self.assertEqual(detect_process_role(["/usr/bin/gunicorn", "wsgi"]), ProcessRole.WEB)
+        self.assertEqual(detect_process_role(["/usr/bin/celery", "-A", "app", "worker"]), ProcessRole.CELERY)
+        self.assertEqual(detect_process_role(["manage.py", "celery", "worker"]), ProcessRole.CELERY)
+        self.assertEqual(detect_process_role(["manage.py", "test"]), ProcessRole.TEST)
+        self.assertEqual(detect_process_role(["/usr/bin/pytest"]), ProcessRole.TEST)
+        self.assertEqual(detect_process_role(["manage.py", "shell"]), ProcessRole.MANAGEMENT)
+        self.assertEqual(detect_process_role(["bin/migrate.py", "migrate"]), ProcessRole.MANAGEMENT)
+        self.assertEqual(detect_process_role([]), ProcessRole.WEB)
+
+
+class TestGetProcessRole(TestCase):
+    def setUp(self):
+        clear_process_role_cache()
+
+    def tearDown(self):
+        clear_process_role_cache()
+
+    def test_cache(self):
+        self.assertEqual(get_process_role(), ProcessRole.TEST)
+        with mock.patch("bk_resource.utils.process.detect_process_role") as detect:
+            self.assertEqual(get_process_role(), ProcessRole.TEST)
+            detect.assert_not_called()
+
+    @override_settings(BK_RESOURCE={"PROCESS_ROLE": ProcessRole.WEB})
+    def test_settings(self):
+        self.assertEqual(get_process_role(), ProcessRole.WEB)
+
+    @override_settings(BK_RESOURCE={"PROCESS_ROLE": ProcessRole.WEB})
+    @mock.patch.dict(os.environ, {PROCESS_ROLE_ENV: ProcessRole.CELERY})
+    def test_env(self):
+        self.assertEqual(get_process_role(), ProcessRole.CELERY)
+
+    @mock.patch.dict(os.environ, {PROCESS_ROLE_ENV: "unknown"})
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            get_process_role()
+
+    @override_settings(BK_RESOURCE={"RESOURCE_BULK_REQUEST_PROCESSES": {ProcessRole.TEST: 3}})
+    def test_processes(self):
+        self.assertEqual(get_processes(), 3)
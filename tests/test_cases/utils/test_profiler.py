@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from bk_resource.utils.profiler import (
+    ProfileCategory,
+    ProfileMode,
+    get_current_profile,
+    profile_resources,
+    profile_scope,
+    save_profile,
+)
+from tests.mock.contrib.api import MockSession
+from tests.mock.utils.profiler import ProfileParentResource
+
+
+class TestResourceProfile(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def run_profile(self):
+        with mock.patch("bk_resource.contrib.api.requests.session", MockSession):
+            with profile_resources("test") as profile:
+                ProfileParentResource()()
+        return profile
+
+    def test_call_tree(self):
+        profile = self.run_profile()
+        tree = profile.to_dict()
+        self.assertEqual(tree["name"], "test")
+        self.assertEqual(len(tree["children"]), 1)
+
+        parent = tree["children"][0]
+        self.assertEqual(parent["name"], "tests.mock.utils.profiler.ProfileParentResource")
+        children = parent["children"]
+        self.assertEqual([child["tags"].get("cache") for child in children[:2]], ["miss", "hit"])
+        # HTTP 请求为 APIResource 的子节点
+        http_node = children[2]["children"][0]
+        self.assertEqual(http_node["category"], ProfileCategory.HTTP)
+        self.assertEqual(http_node["name"], "HTTP GET /get_api/")
+        self.assertEqual(http_node["tags"], {"status_code": 200})
+        # 线程池中的调用记录在父节点下
+        leaf_names = [child["name"] for child in children[3:]]
+        self.assertEqual(leaf_names, ["tests.mock.utils.profiler.ProfileLeafResource"] * 2)
+        self.assertIsNone(get_current_profile())
+
+    def test_export(self):
+        profile = self.run_profile()
+
+        collapsed = profile.to_collapsed().splitlines()
+        self.assertTrue(collapsed)
+        for line in collapsed:
+            stack, weight = line.rsplit(" ", 1)
+            self.assertEqual(stack.split(";")[0], "test")
+            self.assertTrue(int(weight) > 0)
+        self.assertTrue(any("[cache hit]" in line for line in collapsed))
+
+        speedscope = profile.to_speedscope()
+        frames = [frame["name"] for frame in speedscope["shared"]["frames"]]
+        sampled = speedscope["profiles"][0]
+        self.assertEqual(frames[0], "test")
+        self.assertEqual(len(sampled["samples"]), len(sampled["weights"]))
+        for sample in sampled["samples"]:
+            self.assertEqual(sample[0], 0)
+            self.assertTrue(all(index < len(frames) for index in sample))
+
+        self.assertTrue(profile.server_timing().startswith("total;dur="))
+
+    def test_disabled(self):
+        with profile_scope("disabled") as node:
+            self.assertIsNone(node)
+        self.assertIsNone(get_current_profile())
+
+    def test_nested(self):
+        with profile_resources("outer") as outer:
+            with profile_resources("inner") as inner:
+                self.assertIs(inner, outer)
+        self.assertEqual(outer.to_dict()["children"][0]["name"], "inner")
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(BK_RESOURCE={"RESOURCE_PROFILE_DIR": directory}):
+                path = save_profile(self.run_profile())
+            self.assertEqual(os.path.dirname(path), directory)
+            with open(path) as file:
+                self.assertEqual(json.load(file)["profiles"][0]["type"], "sampled")
+
+        with override_settings(BK_RESOURCE={"RESOURCE_PROFILE_MIN_DURATION": 60 * 1000}):
+            self.assertIsNone(save_profile(self.run_profile()))
+
+
+class TestProfileView(TestCase):
+    @override_settings(DEBUG=True)
+    def test_header(self):
+        response = self.client.get("/mock/", HTTP_X_BK_RESOURCE_PROFILE="1")
+        self.assertTrue(response["Server-Timing"].startswith("total;dur="))
+        self.assertIn('desc="mock.resources.TestResource"', response["Server-Timing"])
+
+        response = self.client.get("/mock/", HTTP_X_BK_RESOURCE_PROFILE=ProfileMode.SPEEDSCOPE)
+        self.assertEqual(response.json()["shared"]["frames"][0]["name"], "GET TestResource")
+
+        response = self.client.get("/mock/", HTTP_X_BK_RESOURCE_PROFILE=ProfileMode.COLLAPSED)
+        self.assertTrue(response.content.decode().startswith("GET TestResource"))
+
+    @override_settings(DEBUG=False)
+    def test_header_without_debug(self):
+        response = self.client.get("/mock/", HTTP_X_BK_RESOURCE_PROFILE="1")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    @override_settings(DEBUG=False, BK_RESOURCE={"RESOURCE_PROFILE_SAMPLE_RATE": 1})
+    def test_sample(self):
+        with mock.patch("bk_resource.utils.profiler.save_profile") as save:
+            response = self.client.get("/mock/")
+        self.assertEqual(save.call_count, 1)
+        self.assertFalse(response.has_header("Server-Timing"))
@@ -16,9 +16,24 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from django.test import TestCase
+import datetime
+import json
+import os
+import tempfile
+from unittest import mock
 
-from bk_resource.utils.request_log import BaseRequestLogHandler, RequestLogHandler
+from django.test import TestCase, override_settings
+
+from bk_resource.utils.log_pipeline import get_request_log_pipeline
+from bk_resource.utils.log_spool import iter_spool_records
+from bk_resource.utils.request_log import (
+    AsyncRequestLogHandler,
+    BaseRequestLogHandler,
+    RequestLogHandler,
+    StructuredRequestLogHandler,
+    get_sample_rate,
+    record_request_log,
+)
 from tests.constants.utils.request_log import DEFAULT_REQUEST_LOG_KWARGS
 
 
@@ -30,3 +45,134 @@ class TestBaseRequestLogHandler(TestCase):
 class TestRequestLogHandler(TestCase):
     def test_record(self):
         RequestLogHandler(**DEFAULT_REQUEST_LOG_KWARGS).record()
+
+    @override_settings(BK_RESOURCE={"REQUEST_LOG_SPLIT_LENGTH": 10, "REQUEST_LOG_MAX_ITEMS": 2})
+    def test_split_length(self):
+        kwargs = dict(DEFAULT_REQUEST_LOG_KWARGS, response_data={"data": list(range(10000))})
+        self.assertEqual(RequestLogHandler(**kwargs).response_data, '{"data": [......')
+        kwargs = dict(DEFAULT_REQUEST_LOG_KWARGS, response_data=[1])
+        self.assertEqual(RequestLogHandler(**kwargs).response_data, "[1]")
+
+
+class TestRecordRequestLog(TestCase):
+    def record(self, duration=0, exception=None):
+        start_time = datetime.datetime.now()
+        end_time = start_time + datetime.timedelta(milliseconds=duration)
+        with mock.patch.object(RequestLogHandler, "record") as record:
+            record_request_log("app.resources.TestResource", start_time, end_time, {}, {}, exception)
+        return record.called
+
+    def test_record(self):
+        self.assertTrue(self.record())
+
+    @override_settings(
+        BK_RESOURCE={"REQUEST_LOG_SAMPLE_RATE": 1, "REQUEST_LOG_RESOURCE_SAMPLE_RATES": {"app.resources.*": 0}}
+    )
+    def test_sample(self):
+        self.assertEqual(get_sample_rate("app.resources.TestResource"), 0)
+        self.assertEqual(get_sample_rate("other.resources.TestResource"), 1)
+        self.assertFalse(self.record())
+        # 失败的调用不参与采样
+        self.assertTrue(self.record(exception=ValueError()))
+
+    @override_settings(BK_RESOURCE={"REQUEST_LOG_ONLY_SLOW_OR_FAILED": True, "REQUEST_LOG_SLOW_THRESHOLD": 100})
+    def test_only_slow_or_failed(self):
+        self.assertFalse(self.record(duration=10))
+        self.assertTrue(self.record(duration=100))
+        self.assertTrue(self.record(exception=ValueError()))
+
+
+class TestAsyncRequestLogHandler(TestCase):
+    @mock.patch("blueapps.utils.request_provider.get_local_request", mock.Mock(return_value=None))
+    def test_record(self):
+        handler = AsyncRequestLogHandler(**DEFAULT_REQUEST_LOG_KWARGS)
+        with mock.patch("bk_resource.utils.request_log.logger") as logger:
+            handler.record()
+            # 用户信息在调用线程中获取，序列化在后台线程中进行
+            self.assertIn("username", handler.__dict__)
+            self.assertTrue(get_request_log_pipeline().flush(timeout=5))
+        logger.info.assert_called_once()
+        self.assertIn("response_data", handler.__dict__)
+
+    @mock.patch("blueapps.utils.request_provider.get_local_request", mock.Mock(return_value=None))
+    def test_snapshot(self):
+        request_data = {"id": 1}
+        response_data = {"items": [1]}
+        handler = AsyncRequestLogHandler(
+            **dict(DEFAULT_REQUEST_LOG_KWARGS, request_data=request_data, response_data=response_data)
+        )
+        with mock.patch("bk_resource.utils.request_log.logger") as logger:
+            handler.record()
+            # 入队后调用方修改数据不影响日志
+            request_data["id"] = 2
+            response_data["items"] = [2]
+            self.assertTrue(get_request_log_pipeline().flush(timeout=5))
+        args = logger.info.call_args.args
+        self.assertIn('{"id":1}', args)
+        self.assertIn('{"items":[1]}', args)
+
+    def test_emit_batch(self):
+        handlers = [RequestLogHandler(**DEFAULT_REQUEST_LOG_KWARGS) for _ in range(3)]
+        handlers[0].emit = mock.Mock(side_effect=ValueError("error"))
+        handlers[2].emit = mock.Mock()
+        # 单条失败不影响其他日志
+        self.assertEqual(RequestLogHandler.emit_batch(handlers), 1)
+        handlers[2].emit.assert_called_once()
+
+
+class TestStructuredRequestLogHandler(TestCase):
+    def build_handler(self):
+        start_time = datetime.datetime(2023, 1, 1)
+        handler = StructuredRequestLogHandler(
+            "resource_name", start_time, start_time + datetime.timedelta(milliseconds=20), {"id": 1}, [1, 2]
+        )
+        handler.username = "admin"
+        handler.app_code = "bk_resource"
+        return handler
+
+    def test_to_dict(self):
+        handler = self.build_handler()
+        handler.exception = ValueError("error")
+        self.assertEqual(
+            handler.to_dict(),
+            {
+                "resource": "resource_name",
+                "start_time": "2023-01-01T00:00:00",
+                "end_time": "2023-01-01T00:00:00.020000",
+                "duration_ms": 20.0,
+                "username": "admin",
+                "app_code": "bk_resource",
+                "status": "failed",
+                "error": "error",
+                "request_log_size": 8,
+                "response_log_size": 5,
+                "response_truncated": False,
+                "request_data": '{"id":1}',
+                "response_data": "[1,2]",
+            },
+        )
+
+    @override_settings(BK_RESOURCE={"REQUEST_LOG_SPLIT_LENGTH": 10})
+    def test_truncated(self):
+        start_time = datetime.datetime(2023, 1, 1)
+        handler = StructuredRequestLogHandler(
+            "resource_name", start_time, start_time, {"id": 1}, {"data": list(range(10000))}
+        )
+        handler.username = handler.app_code = ""
+        record = handler.to_dict()
+        self.assertTrue(record["response_truncated"])
+        self.assertEqual(record["response_log_size"], len(record["response_data"]))
+
+    def test_logger(self):
+        with mock.patch("bk_resource.utils.request_log.logger") as logger:
+            self.build_handler().record()
+        self.assertEqual(json.loads(logger.info.call_args.args[0])["status"], "success")
+
+    def test_spool(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "request-{pid}.log")
+            with override_settings(BK_RESOURCE={"REQUEST_LOG_SPOOL_PATH": path}):
+                StructuredRequestLogHandler.emit_batch([self.build_handler(), self.build_handler()])
+            records = list(iter_spool_records(path.format(pid=os.getpid())))
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["resource"], "resource_name")
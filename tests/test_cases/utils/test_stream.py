@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+
+from django.test import TestCase
+
+from bk_resource.utils.stream import JSONStreamParser
+from tests.constants.utils.stream import NESTED_STREAM_DATA, STANDARD_STREAM_DATA
+
+
+def split_chunks(content: bytes, size: int):
+    return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+class TestJSONStreamParser(TestCase):
+    def test_items(self):
+        content = json.dumps(STANDARD_STREAM_DATA, ensure_ascii=False).encode()
+        # 逐字节分块，覆盖数字、字符串及多字节字符被截断的场景
+        for size in [1, 3, len(content)]:
+            parser = JSONStreamParser(split_chunks(content, size))
+            self.assertEqual(list(parser), STANDARD_STREAM_DATA["data"])
+            self.assertEqual(parser.envelope["message"], STANDARD_STREAM_DATA["message"])
+            self.assertEqual(parser.envelope["data"], [])
+
+    def test_nested_path(self):
+        content = json.dumps(NESTED_STREAM_DATA).encode()
+        parser = JSONStreamParser(split_chunks(content, 2), path="data.info")
+        self.assertEqual(list(parser), NESTED_STREAM_DATA["data"]["info"])
+        self.assertEqual(parser.envelope["data"]["count"], NESTED_STREAM_DATA["data"]["count"])
+
+    def test_not_array(self):
+        parser = JSONStreamParser([b'{"data": {"id": 1}}'])
+        self.assertEqual(list(parser), [])
+        self.assertEqual(parser.envelope, {"data": {"id": 1}})
+
+    def test_empty(self):
+        self.assertEqual(list(JSONStreamParser([b'{"data": []}'])), [])
+        self.assertEqual(list(JSONStreamParser([b"{}"])), [])
+
+    def test_invalid(self):
+        for content in [b'{"data": [1, 2', b'{"data": [1 2]}', b"[1, 2]", b'{"data": []} 1']:
+            with self.assertRaises(json.JSONDecodeError):
+                list(JSONStreamParser([content]))
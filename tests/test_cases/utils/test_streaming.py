@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+
+from django.test import TestCase
+
+from bk_resource.utils.stream import JSONStreamParser
+from bk_resource.utils.streaming import StreamFormat, StreamingJSONResponse, is_stream_data, iter_stream_content
+
+
+def iter_items(count: int, fail_at: int = None):
+    for index in range(count):
+        if index == fail_at:
+            raise ValueError("failed")
+        yield {"id": index}
+
+
+class TestStreaming(TestCase):
+    def test_is_stream_data(self):
+        self.assertTrue(is_stream_data(iter_items(1)))
+        self.assertTrue(is_stream_data(iter([1])))
+        for data in [[1], (1,), {"id": 1}, "data", None]:
+            self.assertFalse(is_stream_data(data))
+
+    def test_json(self):
+        for count, chunk_size in [(0, 2), (1, 2), (5, 2), (6, 2), (5, 100)]:
+            content = b"".join(iter_stream_content(iter_items(count), chunk_size=chunk_size))
+            data = json.loads(content)
+            self.assertEqual(data["data"], [{"id": index} for index in range(count)])
+            self.assertTrue(data["result"])
+            self.assertEqual(data["code"], 0)
+
+    def test_chunks(self):
+        chunks = list(iter_stream_content(iter_items(5), chunk_size=2))
+        # 起始、3 个数据块及响应信息
+        self.assertEqual(len(chunks), 5)
+        # 可以被客户端流式解析
+        self.assertEqual(list(JSONStreamParser(chunks)), [{"id": index} for index in range(5)])
+
+    def test_ndjson(self):
+        content = b"".join(iter_stream_content(iter_items(3), StreamFormat.NDJSON, chunk_size=2))
+        lines = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(lines[:-1], [{"id": index} for index in range(3)])
+        self.assertEqual(lines[-1]["count"], 3)
+        self.assertTrue(lines[-1]["result"])
+
+    def test_error(self):
+        completed = []
+        content = b"".join(
+            iter_stream_content(
+                iter_items(5, fail_at=3), chunk_size=2, on_complete=lambda *args: completed.append(args)
+            )
+        )
+        data = json.loads(content)
+        self.assertEqual(len(data["data"]), 3)
+        self.assertFalse(data["result"])
+        self.assertEqual(data["message"], "failed")
+        self.assertEqual(completed[0][0], 3)
+        self.assertIsInstance(completed[0][1], ValueError)
+
+    def test_response(self):
+        response = StreamingJSONResponse(iter_items(2), StreamFormat.NDJSON)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 3)
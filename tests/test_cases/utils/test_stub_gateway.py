@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - Resource SDK (BlueKing - Resource SDK) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at https://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import requests
+from django.test import TestCase
+
+from bk_resource.utils.stub_gateway import StubGateway
+
+
+class TestStubGateway(TestCase):
+    def test_request(self):
+        with StubGateway() as gateway:
+            response = requests.get(gateway.url + "/api/test/", params={"id": 1})
+            self.assertEqual(
+                response.json(),
+                {"result": True, "code": 0, "message": "", "data": {"path": "/api/test/", "params": {"id": "1"}}},
+            )
+            response = requests.post(gateway.url + "/api/test/", json={"id": 1})
+            self.assertEqual(response.json()["data"]["params"], {"id": 1})
+
+    def test_errors(self):
+        with StubGateway(error_rate=0.5, failure_rate=0.5, seed=1) as gateway:
+            session = requests.session()
+            status_codes = [session.get(gateway.url + "/api/test/").status_code for _ in range(10)]
+            stats = gateway.stats()
+        self.assertEqual(stats["requests"], 10)
+        self.assertEqual(stats["connections"], 1)
+        self.assertEqual(stats["errors"] + stats["failures"], 10)
+        self.assertEqual(status_codes.count(500), stats["errors"])